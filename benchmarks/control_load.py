@@ -0,0 +1,96 @@
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from gamify_core import GamifyModel, JournalStorage
+from gamify_core.control import ControlClient, ControlServer
+
+
+def ui_loop(server, stop, drains, interval=0.02):
+    # Stands in for the Tk thread: drains the control queue every `interval`
+    # seconds and records how long each drain kept it busy
+    while not stop.is_set():
+        start = time.perf_counter()
+        count, _ = server.drain()
+        if count:
+            drains.append(time.perf_counter() - start)
+        time.sleep(interval)
+
+
+def client(path, port, activity_ids, requests, batch, latencies, worker):
+    conn = ControlClient(path, port)
+    now = time.time()
+    for r in range(requests):
+        commands = []
+        for b in range(batch):
+            activity_id = activity_ids[(worker + r + b) % len(activity_ids)]
+            kind = b % 4
+            if kind == 0:
+                start = now - (r * batch + b + 1) * 60 - worker * 1e6
+                commands.append({"op": "log_session", "activity": activity_id, "start": start, "end": start + 30})
+            elif kind == 1:
+                commands.append({"op": "start", "activity": activity_id})
+            elif kind == 2:
+                commands.append({"op": "stop", "activity": activity_id})
+            else:
+                commands.append({"op": "add_task", "task": f"Task {worker}-{r}-{b}"})
+        sent = time.perf_counter()
+        response = conn.send(*commands)
+        latencies.append(time.perf_counter() - sent)
+        assert len(response["results"]) == batch, response
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the local control API against a headless model")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--batch", type=int, default=20, help="commands per request")
+    parser.add_argument("--activities", type=int, default=50)
+    parser.add_argument("--tcp", action="store_true", help="use TCP on 127.0.0.1 instead of a Unix socket")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        storage = JournalStorage(os.path.join(directory, "timer_data.json"), os.path.join(directory, "timer_data.journal"))
+        model = GamifyModel(storage, settings={})
+        model.load()
+        category = model.add_category("Load")
+        activity_ids = [model.add_activity(category.id, f"activity_{a:03d}").id for a in range(args.activities)]
+
+        path = None if args.tcp else os.path.join(directory, "control.sock")
+        server = ControlServer(model, path)
+        server.start()
+        stop = threading.Event()
+        drains = []
+        ui = threading.Thread(target=ui_loop, args=(server, stop, drains))
+        ui.start()
+
+        latencies = []
+        started = time.perf_counter()
+        workers = [
+            threading.Thread(target=client, args=(path, server.port, activity_ids, args.requests, args.batch, latencies, w))
+            for w in range(args.clients)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+        stop.set()
+        ui.join()
+        server.close()
+        model.close()
+
+    events = args.clients * args.requests * args.batch
+    drains_ms = sorted(d * 1000 for d in drains)
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    print(f"{events:,} events in {elapsed:.2f}s: {events / elapsed:,.0f} events/s")
+    print(f"request latency    median {statistics.median(latencies_ms):7.2f} ms   p95 {latencies_ms[int(len(latencies_ms) * 0.95)]:7.2f} ms")
+    print(f"UI thread per poll median {statistics.median(drains_ms):7.2f} ms   p95 {drains_ms[int(len(drains_ms) * 0.95)]:7.2f} ms   max {drains_ms[-1]:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
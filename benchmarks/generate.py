@@ -0,0 +1,127 @@
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import time
+
+from gamify_core import STORAGE_BACKENDS, apply_event
+
+
+def generate_events(categories=10, activities=20, sessions=200, tasks=5000, goals=2000, images=300, image_dir="images", seed=0, now=None):
+    # The event stream a user would have produced: `activities` activities in
+    # each of `categories` categories, `sessions` timed sessions per activity
+    # spread over the last two years, plus tasks, goals and vision board items.
+    rng = random.Random(seed)
+    now = now if now is not None else time.time()
+    ids = itertools.count(1)
+    stops = []
+    for c in range(categories):
+        category_id = next(ids)
+        yield {"op": "add_category", "id": category_id, "name": f"Category {c:03d}"}
+        for a in range(activities):
+            activity_id = next(ids)
+            yield {"op": "add_activity", "id": activity_id, "category": category_id, "name": f"activity_{c:03d}_{a:03d}"}
+            yield {"op": "set_goal", "activity": activity_id, "seconds": rng.choice([1, 5, 10, 50, 100]) * 3600}
+            for _ in range(sessions):
+                start = now - rng.uniform(0, 2 * 365 * 24 * 3600)
+                stops.append((start, activity_id, rng.uniform(5 * 60, 3 * 3600)))
+    stops.sort()
+    for start, activity_id, duration in stops:
+        yield {"op": "start", "activity": activity_id}
+        yield {"op": "stop", "activity": activity_id, "start": start, "end": start + duration}
+    for t in range(tasks):
+        task_id = next(ids)
+        yield {"op": "add_task", "id": task_id, "task": f"Task {t}"}
+        if rng.random() < 0.5:
+            yield {"op": "complete_task", "id": task_id}
+    for g in range(goals):
+        goal_id = next(ids)
+        yield {"op": "add_goal", "id": goal_id, "goal": f"Goal {g}"}
+        yield {"op": "set_goal_progress", "id": goal_id, "progress": rng.randint(0, 100)}
+    for i in range(images):
+        yield {"op": "add_vision_item", "image_path": os.path.join(image_dir, f"vision_{i:04d}.jpg"), "description": f"Vision {i}"}
+
+
+def write_images(image_dir, count, seed=0):
+    # Real JPEGs so the dataset can also be opened in the app; skipped when
+    # Pillow isn't installed.
+    try:
+        from PIL import Image
+    except ImportError:
+        return False
+    rng = random.Random(seed)
+    os.makedirs(image_dir, exist_ok=True)
+    for i in range(count):
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        Image.new("RGB", (1600, 1200), color).save(os.path.join(image_dir, f"vision_{i:04d}.jpg"), quality=85)
+    return True
+
+
+def write_dataset(directory, backend, image_files=True, **params):
+    # Writes the dataset into `directory` in the layout `backend` expects and
+    # returns the keyword arguments that open it again.
+    os.makedirs(directory, exist_ok=True)
+    image_dir = os.path.join(directory, "images")
+    events = generate_events(image_dir=image_dir, **params)
+    if backend == "sqlite":
+        paths = {"path": os.path.join(directory, "timer_data.db"), "json_path": None}
+        storage = STORAGE_BACKENDS[backend](**paths)
+        # Durability doesn't matter while generating; the benchmarks reopen the file
+        storage.conn.execute("PRAGMA synchronous = OFF")
+        for event in events:
+            storage.record(event)
+        storage.close()
+        with sqlite3.connect(paths["path"]) as conn:
+            conn.execute("PRAGMA optimize")
+    else:
+        data = {}
+        for event in events:
+            apply_event(data, event)
+        paths = {"path": os.path.join(directory, "timer_data.json")}
+        if backend == "sharded":
+            paths = {"directory": directory, "json_path": None}
+        elif backend == "journal":
+            paths["journal_path"] = os.path.join(directory, "timer_data.journal")
+        storage = STORAGE_BACKENDS[backend](**paths)
+        storage.save(data)
+        storage.close()
+    if image_files and params.get("images", 300):
+        write_images(image_dir, params.get("images", 300), params.get("seed", 0))
+    return paths
+
+
+def add_dataset_arguments(parser):
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--activities", type=int, default=20, help="activities per category")
+    parser.add_argument("--sessions", type=int, default=200, help="sessions per activity")
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--goals", type=int, default=2000)
+    parser.add_argument("--images", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def dataset_params(args):
+    return {
+        "categories": args.categories,
+        "activities": args.activities,
+        "sessions": args.sessions,
+        "tasks": args.tasks,
+        "goals": args.goals,
+        "images": args.images,
+        "seed": args.seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic Gamify Your Life dataset")
+    parser.add_argument("directory")
+    parser.add_argument("--storage", choices=sorted(STORAGE_BACKENDS), default="journal")
+    add_dataset_arguments(parser)
+    args = parser.parse_args()
+    paths = write_dataset(args.directory, args.storage, **dataset_params(args))
+    print(f"Wrote {args.storage} dataset to {paths.get('path', args.directory)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")  # Headless: never touch a display
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
+
+from benchmarks.generate import add_dataset_arguments, dataset_params, write_dataset
+from gamify_core import STORAGE_BACKENDS, GamifyModel, render_dashboard
+from gamify_core.charts import DashboardCharts, build_heatmap_figure
+
+
+def timed(func, repeat, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def summarize(times):
+    times_ms = sorted(t * 1000 for t in times)
+    return {
+        "runs": len(times_ms),
+        "min_ms": times_ms[0],
+        "median_ms": statistics.median(times_ms),
+        "mean_ms": statistics.fmean(times_ms),
+        "p95_ms": float(np.percentile(times_ms, 95)),
+        "max_ms": times_ms[-1],
+    }
+
+
+def open_model(backend, paths):
+    model = GamifyModel(STORAGE_BACKENDS[backend](**paths), settings={"storage": backend})
+    model.load()
+    return model
+
+
+def bench_storage(backend, paths, repeat):
+    results = {}
+
+    def load():
+        open_model(backend, paths).close()
+    results["load_data"] = timed(load, repeat)
+
+    model = open_model(backend, paths)
+    if model.storage.lazy_areas:
+        # What opening the Tasks view adds to a fresh start
+        lazy_models = []
+        results["load_tasks"] = timed(lambda: lazy_models[-1].ensure_loaded("tasks"), repeat, setup=lambda: lazy_models.append(open_model(backend, paths)))
+        for lazy_model in lazy_models:
+            lazy_model.close()
+    stats_engine = model.tracker.stats
+
+    def stats():
+        stats_engine.stale = True
+        stats = model.get_stats()
+        stats.averages()
+        stats.goal_progress()
+        stats.tier_indices()
+        stats.category_sums(stats.totals)
+        stats.radar_values()
+    results["statistics"] = timed(stats, repeat)
+
+    rollups = model.tracker.rollups
+    results["rollup_series"] = timed(lambda: [rollups.series(level) for level in ("day", "week", "month", "year")], repeat)
+
+    if model.storage.session_history:
+        week_start = time.time() - 7 * 24 * 3600
+        results["week_totals"] = timed(lambda: model.activity_totals(since=week_start), repeat)
+
+    results["save_data"] = timed(model.save, repeat)
+
+    activity_ids = list(model.tracker.activities)
+    running = []
+
+    def start():
+        activity_id = activity_ids[len(running) % len(activity_ids)]
+        model.start_activity(activity_id)
+        model.tracker.activities[activity_id].start_time -= 1800  # A half-hour session
+        running.append(activity_id)
+
+    results["stop_activity"] = timed(lambda: model.stop_activity(running[-1]), repeat, setup=start)
+
+    # A bulk delete of 10k tasks is one event, like deleting a single task
+    model.ensure_loaded("tasks")
+    task_ids = []
+
+    def add_tasks():
+        with model.transaction():
+            task_ids[:] = [model.tasks.items[model.add_task(f"bulk task {i}")].id for i in range(10000)]
+    results["delete_task"] = timed(lambda: model.delete_task(task_ids.pop()), repeat, setup=add_tasks)
+    model.delete_tasks(task_ids)
+    results["delete_tasks_10k"] = timed(lambda: model.delete_tasks(task_ids), repeat, setup=add_tasks)
+    model.close()
+    return results
+
+
+def draw(figure):
+    FigureCanvasAgg(figure).draw()
+
+
+def bench_charts(backend, paths, repeat):
+    model = open_model(backend, paths)
+    stats = model.get_stats()
+    categories = stats.category_names
+    totals = (stats.category_sums(stats.totals) / 3600).tolist()
+    radar = stats.radar_values()
+    results = {}
+
+    def first_draw():
+        charts = DashboardCharts()
+        charts.update(categories, totals, radar)
+        for figure in charts.figures.values():
+            draw(figure)
+        charts.close()
+    results["dashboard_first_draw"] = timed(first_draw, repeat)
+
+    # After a stop only the numbers change: artists are updated in place
+    charts = DashboardCharts()
+    charts.update(categories, totals, radar)
+    for figure in charts.figures.values():
+        draw(figure)
+    updates = []
+
+    def redraw():
+        updates.append(1)
+        charts.update(categories, [t + len(updates) for t in totals], [v + len(updates) for v in radar])
+        for name in charts.dirty:
+            draw(charts.figures[name])
+        charts.dirty.clear()
+    results["dashboard_update_draw"] = timed(redraw, repeat)
+    charts.close()
+
+    results["heatmap_draw"] = timed(lambda: draw(build_heatmap_figure(model.tracker.rollups)), repeat)
+    # Taken on exit and shown while the next start loads the data
+    results["dashboard_snapshot"] = timed(lambda: render_dashboard(model, 1080, 720), repeat)
+    model.close()
+    return results
+
+
+def bench_sync(backend, paths, directory, repeat):
+    # Device A has the dataset, device B starts empty; after the first sync,
+    # what a sync costs should follow what changed, not the history
+    shared = os.path.join(directory, "shared")
+    empty = {name: os.path.join(directory, "b", os.path.basename(path)) if path else path for name, path in paths.items()}
+    os.makedirs(os.path.join(directory, "b"), exist_ok=True)
+
+    devices = []
+
+    def first_sync(device_paths):
+        # Includes the load, where a device that never synced lists what it has
+        model = GamifyModel(STORAGE_BACKENDS[backend](**device_paths), settings={"storage": backend, "sync_dir": shared})
+        model.load()
+        model.sync.sync()
+        devices.append(model)
+
+    results = {}
+    results["first_sync_send"] = timed(lambda: first_sync(paths), 1)
+    results["first_sync_receive"] = timed(lambda: first_sync(empty), 1)
+    device_a, device_b = devices
+    activity_ids = list(device_a.tracker.activities)
+
+    def ten_sessions():
+        for activity_id in activity_ids[:10]:
+            device_a.start_activity(activity_id)
+            device_a.tracker.activities[activity_id].start_time -= 1800
+            device_a.stop_activity(activity_id)
+        device_a.sync.push()
+    results["sync_10_sessions"] = timed(device_b.sync.sync, repeat, setup=ten_sessions)
+    results["sync_nothing_new"] = timed(device_b.sync.sync, repeat)
+    device_a.close()
+    device_b.close()
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, params, baseline_path, threshold):
+    with open(baseline_path, "r") as file:
+        report = json.load(file)
+    baseline = report["results"]
+    regressions = 0
+    print(f"\nCompared with {baseline_path} (median):")
+    if report["meta"]["dataset"] != params:
+        print("  Warning: the baseline was measured on a different dataset")
+    for name, summary in results.items():
+        if name not in baseline:
+            continue
+        ratio = summary["median_ms"] / baseline[name]["median_ms"] if baseline[name]["median_ms"] else float("inf")
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"  {name:<36} {baseline[name]['median_ms']:10.2f} -> {summary['median_ms']:10.2f} ms  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the Gamify Your Life hot paths against a synthetic dataset")
+    parser.add_argument("--storage", nargs="+", choices=sorted(STORAGE_BACKENDS), default=sorted(STORAGE_BACKENDS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file from an earlier run to compare medians with")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio reported as a regression")
+    parser.add_argument("--no-charts", action="store_true")
+    parser.add_argument("--keep", action="store_true", help="keep the generated datasets")
+    add_dataset_arguments(parser)
+    args = parser.parse_args()
+    params = dataset_params(args)
+
+    workdir = tempfile.mkdtemp(prefix="gamify-bench-")
+    results = {}
+    try:
+        for backend in args.storage:
+            start = time.perf_counter()
+            paths = write_dataset(os.path.join(workdir, backend), backend, image_files=False, **params)
+            print(f"Generated {backend} dataset in {time.perf_counter() - start:.1f}s")
+            for name, times in bench_storage(backend, paths, args.repeat).items():
+                results[f"{backend}.{name}"] = summarize(times)
+        if not args.no_charts:
+            backend = args.storage[0]
+            for name, times in bench_charts(backend, write_dataset(os.path.join(workdir, "charts"), backend, image_files=False, **params), args.repeat).items():
+                results[f"charts.{name}"] = summarize(times)
+        backend = args.storage[0]
+        sync_dir = os.path.join(workdir, "sync")
+        for name, times in bench_sync(backend, write_dataset(os.path.join(sync_dir, "a"), backend, image_files=False, **params), sync_dir, args.repeat).items():
+            results[f"sync.{name}"] = summarize(times)
+    finally:
+        if args.keep:
+            print(f"Datasets kept in {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    for name, summary in results.items():
+        print(f"{name:<38} median {summary['median_ms']:10.2f} ms   p95 {summary['p95_ms']:10.2f} ms   max {summary['max_ms']:10.2f} ms")
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "matplotlib": matplotlib.__version__,
+            "repeat": args.repeat,
+            "dataset": params,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare and compare(results, params, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,442 @@
 import customtkinter as ctk
 import tkinter.ttk as ttk
-from tkinter import messagebox, filedialog, Text, END
+from tkinter import messagebox, filedialog, simpledialog, Canvas, Label, PhotoImage, TclError, END
 import time
-import json
+import datetime
 import os
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
-from PIL import Image, ImageTk
+import queue
+import hashlib
+import importlib
+import gc
+from concurrent.futures import ThreadPoolExecutor
+
+from gamify_core import (
+    SNAPSHOT_PATH, TIERS, GamifyModel, create_profile, get_tier_indices, list_profiles, parse_ladder, profile_path, profiler,
+    save_snapshot, summarize, valid_snapshot
+)
+
+DEFAULT_PROFILE = "Default"
+NEW_PROFILE = "New Profile..."
+
+
+class ChartManager:
+    # Shows the persistent dashboard figures at the bottom of the dashboard,
+    # redrawing only the figures whose data changed since they were last shown.
+    def __init__(self, master):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from gamify_core.charts import DashboardCharts
+
+        self.charts = DashboardCharts()
+        self.frame = ctk.CTkFrame(master)
+        self.canvases = {}
+        for name, figure in self.charts.figures.items():
+            canvas = FigureCanvasTkAgg(figure, master=self.frame)
+            canvas.draw = profiler.wrap(f"chart.draw.{name}", canvas.draw)
+            canvas.get_tk_widget().pack(pady=20)
+            self.canvases[name] = canvas
+
+    def update(self, categories, totals, stats):
+        self.charts.update(categories, totals, stats)
+
+    def show(self):
+        self.frame.pack(fill="both", expand=True)
+        for name in self.charts.dirty:
+            self.canvases[name].draw_idle()
+        self.charts.dirty.clear()
+
+    def hide(self):
+        self.frame.pack_forget()
+
+    def close(self):
+        for canvas in self.canvases.values():
+            canvas.get_tk_widget().destroy()
+        self.canvases.clear()
+        self.charts.close()
+        self.frame.destroy()
+
+
+class CanvasChartManager:
+    # ChartManager's counterpart for the Tk canvas charts (settings "charts":
+    # "canvas"): no matplotlib to import, and an update only moves the items
+    # already on the canvases
+    def __init__(self, master):
+        from gamify_core.canvas_charts import CanvasCharts
+
+        self.frame = ctk.CTkFrame(master)
+        if ctk.get_appearance_mode() == "Dark":
+            background, foreground, radar_fill = "#2b2b2b", "#dce4ee", "#202060"
+        else:
+            background, foreground, radar_fill = "#ffffff", "#1a1a1a", "#bfbfff"
+        canvases = {}
+        for name, (width, height) in CanvasCharts.sizes.items():
+            canvases[name] = Canvas(self.frame, width=width, height=height, background=background, highlightthickness=0)
+            canvases[name].pack(pady=20)
+        self.charts = CanvasCharts(canvases["totals"], canvases["stats"], foreground, radar_fill)
+
+    def update(self, categories, totals, stats):
+        self.charts.update(categories, totals, stats)
+
+    def show(self):
+        self.frame.pack(fill="both", expand=True)
+
+    def hide(self):
+        self.frame.pack_forget()
+
+    def close(self):
+        self.frame.destroy()
+
+
+class ViewManager:
+    # Builds each screen into its own frame the first time it is shown and from
+    # then on only hides and shows it. Mutations mark the screens that display
+    # the changed data as dirty; a dirty screen is refreshed, not rebuilt, when
+    # it is next shown (or straight away if it is the one on screen).
+    def __init__(self, master):
+        self.master = master
+        self.frames = {}
+        self.refreshers = {}
+        self.dirty = set()
+        self.current = None
+
+    def show(self, name, build, refresh):
+        if self.current is not None and self.current != name:
+            self.frames[self.current].pack_forget()
+        if name not in self.frames:
+            self.frames[name] = ctk.CTkFrame(self.master)
+            self.refreshers[name] = refresh
+            build(self.frames[name])
+        elif name in self.dirty:
+            refresh()
+        self.dirty.discard(name)
+        self.frames[name].pack(fill="both", expand=True)
+        self.current = name
+
+    def mark_dirty(self, *names):
+        for name in names:
+            if name == self.current:
+                self.refreshers[name]()
+            elif name in self.frames:
+                self.dirty.add(name)
+
+
+class VirtualList(ctk.CTkFrame):
+    # Scrolling list that only builds widgets for the rows that fit on screen.
+    # make_row(parent) builds one empty row, bind_row(row, item) fills it in for
+    # an item; rows are reused as the list scrolls and row.item_index says which
+    # item a row currently shows. Callers mutate `items` themselves and then
+    # report the change with insert_item/remove_item/refresh_item, which only
+    # rebinds the visible rows at or after the changed index.
+    def __init__(self, master, make_row, bind_row, row_height=50, **kwargs):
+        super().__init__(master, **kwargs)
+        self.make_row = make_row
+        self.bind_row = bind_row
+        self.row_height = row_height
+        self.items = []
+        self.rows = []
+        self.first = 0
+
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.viewport.bind("<Configure>", self.on_resize)
+        self.bind("<Enter>", self.bind_wheel)
+        self.bind("<Leave>", self.unbind_wheel)
+
+    def set_items(self, items):
+        self.items = items
+        self.render(start=0)
+
+    def insert_item(self, index):
+        self.render(start=index)
+
+    def remove_item(self, index):
+        self.render(start=index)
+
+    def scroll_to(self, index):
+        self.first = index
+        self.render()
+
+    def refresh_item(self, index):
+        for row in self.rows:
+            if row.item_index == index:
+                self.bind_row(row, self.items[index])
+
+    def visible_count(self):
+        return max(1, self.viewport.winfo_height() // self.row_height)
+
+    def on_resize(self, event):
+        while len(self.rows) < event.height // self.row_height + 1:
+            row = self.make_row(self.viewport)
+            row.configure(height=self.row_height - 5)
+            row.pack_propagate(False)
+            row.item_index = None
+            self.rows.append(row)
+        self.render()
+
+    def render(self, start=None):
+        count = len(self.items)
+        visible = self.visible_count()
+        self.first = max(0, min(self.first, count - visible))
+        for slot, row in enumerate(self.rows):
+            index = self.first + slot
+            if index >= count or slot >= visible + 1:
+                if row.item_index is not None:
+                    row.place_forget()
+                    row.item_index = None
+                continue
+            if row.item_index is None:
+                row.place(x=0, y=slot * self.row_height, relwidth=1)
+            if row.item_index != index or (start is not None and index >= start):
+                row.item_index = index
+                self.bind_row(row, self.items[index])
+        if count:
+            self.scrollbar.set(self.first / count, min(1, (self.first + visible) / count))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * len(self.items))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self.visible_count()
+            self.first += step
+        self.render()
+
+    def bind_wheel(self, event):
+        self.bind_all("<MouseWheel>", self.on_wheel)
+        self.bind_all("<Button-4>", self.on_wheel)
+        self.bind_all("<Button-5>", self.on_wheel)
+
+    def unbind_wheel(self, event):
+        # Moving onto one of our own rows also counts as leaving this frame
+        widget = self.winfo_containing(event.x_root, event.y_root)
+        if widget is not None and (str(widget) + ".").startswith(str(self) + "."):
+            return
+        self.unbind_all("<MouseWheel>")
+        self.unbind_all("<Button-4>")
+        self.unbind_all("<Button-5>")
+
+    def on_wheel(self, event):
+        step = -1 if event.num == 4 or event.delta > 0 else 1
+        self.yview("scroll", step, "units")
+
+
+class SelectionBar(ctk.CTkFrame):
+    # Multi-select for a VirtualList, shown above it: Select All/None, the
+    # view's bulk action buttons and a Show Archived switch. Rows get a
+    # checkbox from make_box() and bind_box(); ticked items are kept by key in
+    # `selected`, so ticks survive scrolling and row reuse. `archived` says
+    # whether the list shows the archived items or the others.
+    # `selected` maps each key to its item: holding on to the items keeps a
+    # key made from id() from being reused by a new item.
+    def __init__(self, master, key, is_archived, on_archived, actions):
+        super().__init__(master)
+        self.key = key
+        self.is_archived = is_archived
+        self.on_archived = on_archived
+        self.list = None
+        self.selected = {}
+        self.archived = False
+
+        select_all_btn = ctk.CTkButton(self, text="Select All", width=90, command=self.select_all)
+        select_all_btn.pack(side="left", padx=5, pady=5)
+        select_none_btn = ctk.CTkButton(self, text="Select None", width=90, command=self.select_none)
+        select_none_btn.pack(side="left", padx=5, pady=5)
+        self.buttons = {}
+        for text, command in actions:
+            self.buttons[text] = ctk.CTkButton(self, text=text, width=90, command=command)
+            self.buttons[text].pack(side="left", padx=5, pady=5)
+
+        self.archived_switch = ctk.CTkSwitch(self, text="Show Archived", command=self.toggle_archived)
+        self.archived_switch.pack(side="right", padx=10)
+        self.count_label = ctk.CTkLabel(self, text="")
+        self.count_label.pack(side="right", padx=10)
+
+    def make_box(self, row):
+        row.select_box = ctk.CTkCheckBox(row, text="", width=24, command=lambda: self.toggle(row))
+        row.select_box.pack(side="left", padx=5)
+
+    def bind_box(self, row, item):
+        row.select_key = self.key(item)
+        row.select_item = item
+        if row.select_key in self.selected:
+            row.select_box.select()
+        else:
+            row.select_box.deselect()
+
+    def toggle(self, row):
+        if row.select_box.get():
+            self.selected[row.select_key] = row.select_item
+        else:
+            self.selected.pop(row.select_key, None)
+        self.update_count()
+
+    def forget(self, item):
+        # For an item that was deleted on its own
+        self.selected.pop(self.key(item), None)
+        self.update_count()
+
+    def visible(self, items):
+        # The items the list should show; ticks on items that are no longer in it are dropped
+        items = [item for item in items if self.is_archived(item) == self.archived]
+        self.selected = {self.key(item): item for item in items if self.selected.get(self.key(item)) is item}
+        self.update_count()
+        return items
+
+    def select_all(self):
+        self.selected = {self.key(item): item for item in self.list.items}
+        self.list.render(start=0)
+        self.update_count()
+
+    def select_none(self):
+        self.selected.clear()
+        self.list.render(start=0)
+        self.update_count()
+
+    def take(self):
+        # The ticked {key: item}, unticking them
+        selected, self.selected = self.selected, {}
+        self.update_count()
+        return selected
+
+    def toggle_archived(self):
+        self.archived = bool(self.archived_switch.get())
+        self.selected.clear()
+        if "Archive" in self.buttons:
+            self.buttons["Archive"].configure(text="Restore" if self.archived else "Archive")
+        self.on_archived()
+
+    def show_unarchived(self):
+        if self.archived:
+            self.archived_switch.deselect()
+            self.toggle_archived()
+
+    def update_count(self):
+        self.count_label.configure(text=f"{len(self.selected)} selected" if self.selected else "")
+
+
+def identity_index(items, item):
+    # list.index() compares vision board items (dicts) by value
+    return next(idx for idx, candidate in enumerate(items) if candidate is item)
+
+
+class ThumbnailLoader:
+    # Decodes Vision Board thumbnails on a thread pool and caches them on disk,
+    # keyed by path, mtime and size, so each photo is decoded at most once.
+    # Finished images are handed back to the Tk thread by polling a queue, since
+    # PhotoImages may only be created there.
+    def __init__(self, widget, cache_dir=".thumbnails", size=(100, 100), workers=4):
+        from PIL import Image, ImageTk
+
+        self.widget = widget
+        self.cache_dir = cache_dir
+        self.size = size
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.ready = queue.Queue()
+        self.photos = {}
+        self.pending = {}
+        self.poll_job = None
+        self.placeholder = ImageTk.PhotoImage(Image.new("RGB", size, "gray"))
+
+    def request(self, path, callback):
+        if path in self.photos:
+            callback(self.photos[path])
+            return
+        if path in self.pending:
+            self.pending[path].append(callback)
+            return
+        self.pending[path] = [callback]
+        future = self.executor.submit(profiler.wrap("thumbnails.load", self.load), path)
+        future.add_done_callback(lambda f: self.ready.put((path, f)))
+        if self.poll_job is None:
+            self.poll_job = self.widget.after(50, profiler.scheduled("thumbnails.poll", 50, self.poll))
+
+    def load(self, path):
+        # Runs on a worker thread
+        from PIL import Image
+
+        stat = os.stat(path)
+        key = hashlib.sha1(f"{path}|{stat.st_mtime_ns}|{stat.st_size}".encode()).hexdigest()
+        cache_path = os.path.join(self.cache_dir, key + ".png")
+        if os.path.exists(cache_path):
+            img = Image.open(cache_path)
+            img.load()
+            return img
+        img = Image.open(path)
+        img.draft("RGB", self.size)  # JPEGs decode straight at 1/2, 1/4 or 1/8 scale
+        img.thumbnail(self.size)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        img.save(cache_path + ".tmp", "PNG")
+        os.replace(cache_path + ".tmp", cache_path)
+        return img
+
+    def poll(self):
+        from PIL import ImageTk
+
+        while True:
+            try:
+                path, future = self.ready.get_nowait()
+            except queue.Empty:
+                break
+            callbacks = self.pending.pop(path, [])
+            try:
+                photo = ImageTk.PhotoImage(future.result())
+            except Exception:
+                # Missing, unreadable or oversized (DecompressionBombError)
+                # image; the placeholder stays
+                continue
+            self.photos[path] = photo
+            for callback in callbacks:
+                callback(photo)
+        self.poll_job = self.widget.after(50, profiler.scheduled("thumbnails.poll", 50, self.poll)) if self.pending else None
+
+    def close(self):
+        if self.poll_job is not None:
+            self.widget.after_cancel(self.poll_job)
+        self.executor.shutdown(wait=False, cancel_futures=True)
 
 
 class GamifyLifeApp(ctk.CTk):
-    def __init__(self):
+    def __init__(self, model=None):
         super().__init__()
         self.title("Gamify Your Life")
         self.geometry("1280x720")
         ctk.set_appearance_mode("system")
 
-        self.categories = {}
-        self.activity_start_times = {}
-        self.activity_labels = {}
-        self.activity_progress_bars = {}
-        self.activity_progress_labels = {}
-        self.activity_goals = {}
-        self.activity_sessions = {}
-        self.milestones = [1, 10, 100, 1000, 10000]  # Hours
-        self.milestones_reached = {}
-        self.tasks = []
-        self.goals = []
-        self.vision_board = []
+        self.model = model if model is not None else GamifyModel()
+        self.tracker = self.model.tracker
+        self.activity_widgets = {}  # activity_id -> (time_label, progress_bar, progress_label) on screen
+        self.tick_job = None
+        self.charts = None  # Created the first time the dashboard has something to chart; see settings "charts"
+        self.thumbnails = None  # Created the first time the Vision Board is opened
+        self.reports = None  # Created the first time reports are generated
+        self.report_futures = []
+        self.report_up_to_date = 0
+        self.reports_job = None
+        self.debug_panel = None
+        self.control = None
+        self.control_job = None
+        self.control_changes = False
+        self.control_refreshed = 0.0
+        self.loader = None
+        self.load_future = None
+        self.load_job = None
+        self.snapshot_label = None
+        self.snapshot_image = None
 
         self.create_widgets()
+        self.views = ViewManager(self.content)
+        self.activities_category = None
+        self.heatmap_selection = "All Activities"
+        if profiler.enabled:
+            self.bind("<Control-Shift-D>", lambda event: self.toggle_debug_panel())
+        self.protocol("WM_DELETE_WINDOW", self.exit_app)  # Closing the window flushes pending writes too
         self.load_data()
-        self.show_dashboard()
 
     def create_widgets(self):
         self.sidebar = ctk.CTkFrame(self, width=200)
@@ -41,6 +445,14 @@ class GamifyLifeApp(ctk.CTk):
         self.content = ctk.CTkFrame(self)
         self.content.pack(side="right", fill="both", expand=True)
 
+        self.profile_menu = ctk.CTkOptionMenu(self.sidebar, values=self.profile_choices(), command=self.select_profile)
+        self.profile_menu.set(self.model.settings.get("profile") or DEFAULT_PROFILE)
+        self.profile_menu.pack(pady=10, padx=10)
+
+        self.search_entry = ctk.CTkEntry(self.sidebar, placeholder_text="Search")
+        self.search_entry.pack(pady=10, padx=10)
+        self.search_entry.bind("<KeyRelease>", self.on_search)
+
         self.dashboard_button = ctk.CTkButton(self.sidebar, text="Dashboard", command=self.show_dashboard)
         self.dashboard_button.pack(pady=10)
 
@@ -59,119 +471,110 @@ class GamifyLifeApp(ctk.CTk):
         self.vision_board_button = ctk.CTkButton(self.sidebar, text="Vision Board", command=self.show_vision_board)
         self.vision_board_button.pack(pady=10)
 
+        self.reports_button = ctk.CTkButton(self.sidebar, text="Reports", command=self.show_reports)
+        self.reports_button.pack(pady=10)
+
+        # Only with a shared folder to sync through (settings "sync_dir")
+        self.sync_button = ctk.CTkButton(self.sidebar, text="Sync", command=self.sync_now)
+        if self.model.settings.get("sync_dir"):
+            self.sync_button.pack(pady=10)
+
         self.exit_button = ctk.CTkButton(self.sidebar, text="Exit", command=self.exit_app)
         self.exit_button.pack(pady=10)
 
+        # Everything in the sidebar but Exit needs the data
+        self.data_widgets = [
+            self.profile_menu, self.search_entry, self.dashboard_button, self.categories_button, self.statistics_button,
+            self.tasks_button, self.goals_button, self.vision_board_button, self.reports_button, self.sync_button
+        ]
+
+    def show_view(self, name, build, refresh):
+        # Only the screen on show has its activity widgets registered for the timer
+        self.activity_widgets.clear()
+        self.views.show(name, build, refresh)
+
+    @profiler.profiled("view.show_dashboard")
     def show_dashboard(self):
-        self.clear_content()
-        title_label = ctk.CTkLabel(self.content, text="Gamify Your Life Dashboard", font=("Arial", 24, "bold"))
+        self.show_view("dashboard", self.build_dashboard, self.refresh_dashboard)
+        self.attach_dashboard_rows(self.tracker.running)
+
+    def build_dashboard(self, frame):
+        title_label = ctk.CTkLabel(frame, text="Gamify Your Life Dashboard", font=("Arial", 24, "bold"))
         title_label.pack(pady=10)
-        dashboard_frame = ctk.CTkFrame(self.content)
-        dashboard_frame.pack(fill="both", expand=True)
-        self.create_dashboard_content(dashboard_frame)
+        self.dashboard_frame = ctk.CTkFrame(frame)
+        self.dashboard_frame.pack(fill="both", expand=True)
+        self.dashboard_layout = None
+        self.dashboard_rows = {}
+        self.refresh_dashboard()
+
+    def refresh_dashboard(self):
+        layout = [(category.id, list(category.activity_ids)) for category in self.tracker.categories.values()]
+        if layout != self.dashboard_layout:
+            # Categories or activities were added or removed, so the rows change too
+            for widget in self.dashboard_frame.winfo_children():
+                widget.destroy()
+            self.dashboard_rows = {}
+            self.dashboard_layout = layout
+            self.create_dashboard_content(self.dashboard_frame)
+        if layout:
+            if self.charts is None:
+                manager = ChartManager if self.model.settings.get("charts") == "matplotlib" else CanvasChartManager
+                self.charts = manager(self.views.frames["dashboard"])
+            self.update_charts()
+            self.charts.show()
+        elif self.charts is not None:
+            self.charts.hide()
+        self.attach_dashboard_rows(self.dashboard_rows)
 
     def create_dashboard_content(self, parent_frame):
-        categories = list(self.categories.keys())
-        if not categories:
+        if not self.dashboard_layout:
             label = ctk.CTkLabel(parent_frame, text="No categories available. Please add categories.", font=("Arial", 18))
             label.pack(pady=20)
             return
 
-        for category in categories:
+        for category_id, activity_ids in self.dashboard_layout:
             category_frame = ctk.CTkFrame(parent_frame)
             category_frame.pack(fill="x", pady=10)
 
-            category_label = ctk.CTkLabel(category_frame, text=f"{category.capitalize()} Progress", font=("Arial", 18))
+            category_label = ctk.CTkLabel(category_frame, text=f"{self.tracker.categories[category_id].name.capitalize()} Progress", font=("Arial", 18))
             category_label.pack(pady=5)
 
-            activities = list(self.categories[category].keys())
-            for activity in activities:
+            for activity_id in activity_ids:
                 activity_frame = ctk.CTkFrame(category_frame)
                 activity_frame.pack(fill="x", pady=5)
 
-                activity_label = ctk.CTkLabel(activity_frame, text=f"{activity.capitalize()}", font=("Arial", 14))
+                activity_label = ctk.CTkLabel(activity_frame, text=f"{self.tracker.activities[activity_id].name.capitalize()}", font=("Arial", 14))
                 activity_label.pack(side="left", padx=5)
-                
-                self.activity_labels[f"{category}_{activity}_label"] = ctk.CTkLabel(activity_frame, text="")
-                self.activity_labels[f"{category}_{activity}_label"].pack(side="left", padx=5)
-                
-                self.activity_progress_bars[f"{category}_{activity}_progress_bar"] = ctk.CTkProgressBar(activity_frame, mode='determinate')
-                self.activity_progress_bars[f"{category}_{activity}_progress_bar"].pack(side="left", padx=5, fill="x", expand=True)
-                
-                self.activity_progress_labels[f"{category}_{activity}_progress_label"] = ctk.CTkLabel(activity_frame, text="")
-                self.activity_progress_labels[f"{category}_{activity}_progress_label"].pack(side="left", padx=5)
-                
-                self.update_activity_display(category, activity, self.categories[category][activity])
-
-        self.create_dashboard_graphs(parent_frame)
-        self.create_stats_chart(parent_frame)
-
-    def create_dashboard_graphs(self, parent_frame):
-        if not self.categories:
-            return
-
-        fig, ax = plt.subplots(1, 2, figsize=(14, 6))
-
-        categories = list(self.categories.keys())
-        total_times = [sum(self.categories[cat].values()) / 3600 for cat in categories]  # Convert to hours
-
-        # Bar Graph
-        ax[0].barh(categories, total_times, color='skyblue')
-        ax[0].set_xlabel('Total Hours')
-        ax[0].set_title('Total Hours Spent per Category')
 
-        # Pie Chart
-        ax[1].pie(total_times, labels=categories, autopct='%1.1f%%', colors=plt.cm.Paired.colors)
-        ax[1].set_title('Distribution of Total Hours per Category')
+                time_label = ctk.CTkLabel(activity_frame, text="")
+                time_label.pack(side="left", padx=5)
 
-        canvas = FigureCanvasTkAgg(fig, master=parent_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(pady=20)
+                progress_bar = ctk.CTkProgressBar(activity_frame, mode='determinate')
+                progress_bar.pack(side="left", padx=5, fill="x", expand=True)
 
-    def create_stats_chart(self, parent_frame):
-        if not self.categories:
-            return
-
-        activities = list(self.categories.keys())
-        if not activities:
-            return
-
-        fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(polar=True))
-        metrics = ["Total Hours", "Sessions", "Avg Hours/Session", "Goal Progress"]
-        num_vars = len(metrics)
+                progress_label = ctk.CTkLabel(activity_frame, text="")
+                progress_label.pack(side="left", padx=5)
 
-        angles = np.linspace(0, 2 * np.pi, num_vars, endpoint=False).tolist()
-        angles += angles[:1]
+                self.dashboard_rows[activity_id] = (time_label, progress_bar, progress_label)
 
-        def get_metric_values(activity):
-            total_time = sum(self.categories[activity].values()) / 3600  # Convert to hours
-            sessions = sum(self.activity_sessions.get(act, 0) for act in self.categories[activity])
-            avg_time_per_session = (total_time / sessions) if sessions > 0 else 0
-            goal_progress = (total_time / (self.activity_goals.get(activity, 1) / 3600)) * 100
+    def attach_dashboard_rows(self, activity_ids):
+        # Registers the dashboard rows with the timer and brings the given ones up to date
+        self.activity_widgets.update(self.dashboard_rows)
+        for activity_id in list(activity_ids):
+            if activity_id in self.dashboard_rows:
+                self.update_activity_display(activity_id, self.tracker.current_total(activity_id))
 
-            return [total_time, sessions, avg_time_per_session, goal_progress]
-
-        stats = [get_metric_values(activity) for activity in activities]
-        stats = np.array(stats)
-        stats = np.mean(stats, axis=0).tolist()
-        stats += stats[:1]
-
-        ax.fill(angles, stats, color='blue', alpha=0.25)
-        ax.plot(angles, stats, color='blue', linewidth=2)
-        ax.set_yticklabels([])
-        ax.set_xticks(angles[:-1])
-        ax.set_xticklabels(metrics)
-
-        canvas = FigureCanvasTkAgg(fig, master=parent_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(pady=20)
+    @profiler.profiled("chart.update")
+    def update_charts(self):
+        stats = self.model.get_stats()
+        total_times = (stats.category_sums(stats.totals) / 3600).tolist()  # Convert to hours
+        self.charts.update(stats.category_names, total_times, stats.radar_values())
 
+    @profiler.profiled("view.show_categories")
     def show_categories(self):
-        self.clear_content()
-
-        categories_frame = ctk.CTkFrame(self.content)
-        categories_frame.pack(fill="both", expand=True)
+        self.show_view("categories", self.build_categories, self.update_categories_list)
 
+    def build_categories(self, categories_frame):
         label = ctk.CTkLabel(categories_frame, text="Manage Categories", font=("Arial", 24))
         label.pack(pady=20)
 
@@ -183,179 +586,238 @@ class GamifyLifeApp(ctk.CTk):
         add_category_btn = ctk.CTkButton(categories_frame, text="Add Category", command=self.add_category)
         add_category_btn.pack(pady=10)
 
-        self.categories_list_frame = ctk.CTkFrame(categories_frame)
-        self.categories_list_frame.pack(fill="both", expand=True)
+        self.categories_list = VirtualList(categories_frame, self.make_category_row, self.bind_category_row)
+        self.categories_list.pack(fill="both", expand=True)
 
         self.update_categories_list()
 
     def add_category(self):
-        new_category = self.new_category_entry.get().strip()
-        if new_category and new_category not in self.categories:
-            self.categories[new_category] = {}
-            self.update_categories_list()
-            self.save_data()
+        category = self.model.add_category(self.new_category_entry.get().strip())
+        if category is not None:
+            self.views.mark_dirty("dashboard", "statistics", "heatmap")
+            self.categories_list.items.append(category)
+            self.categories_list.insert_item(len(self.categories_list.items) - 1)
 
+    @profiler.profiled("list.update_categories_list")
     def update_categories_list(self):
-        for widget in self.categories_list_frame.winfo_children():
-            widget.destroy()
-
-        for category in self.categories.keys():
-            frame = ctk.CTkFrame(self.categories_list_frame)
-            frame.pack(fill="x", pady=5)
+        self.categories_list.set_items(list(self.tracker.categories.values()))
 
-            label = ctk.CTkLabel(frame, text=category, font=("Arial", 14))
-            label.pack(side="left", padx=10)
+    def make_category_row(self, parent):
+        frame = ctk.CTkFrame(parent)
 
-            manage_btn = ctk.CTkButton(frame, text="Manage", command=lambda c=category: self.show_activities(c))
-            manage_btn.pack(side="right", padx=10)
+        frame.category_label = ctk.CTkLabel(frame, text="", font=("Arial", 14))
+        frame.category_label.pack(side="left", padx=10)
 
-            delete_btn = ctk.CTkButton(frame, text="Delete", command=lambda c=category: self.delete_category(c))
-            delete_btn.pack(side="right", padx=10)
-
-    def delete_category(self, category):
-        if category in self.categories:
-            del self.categories[category]
-            self.update_categories_list()
-            self.save_data()
+        manage_btn = ctk.CTkButton(frame, text="Manage", command=lambda: self.show_activities(frame.category.id))
+        manage_btn.pack(side="right", padx=10)
 
-    def show_activities(self, category):
-        self.clear_content()
+        delete_btn = ctk.CTkButton(frame, text="Delete", command=lambda: self.delete_category(frame.category))
+        delete_btn.pack(side="right", padx=10)
+        return frame
 
-        activities_frame = ctk.CTkFrame(self.content)
-        activities_frame.pack(fill="both", expand=True)
+    def bind_category_row(self, frame, category):
+        frame.category = category
+        frame.category_label.configure(text=category.name)
 
-        label = ctk.CTkLabel(activities_frame, text=f"Manage Activities for {category.capitalize()}", font=("Arial", 24))
-        label.pack(pady=20)
+    def delete_category(self, category):
+        if self.model.delete_category(category.id):
+            self.views.mark_dirty("dashboard", "statistics", "heatmap", "activities")
+            index = self.categories_list.items.index(category)
+            del self.categories_list.items[index]
+            self.categories_list.remove_item(index)
+
+    @profiler.profiled("view.show_activities")
+    def show_activities(self, category_id):
+        if category_id != self.activities_category:
+            self.activities_category = category_id
+            self.views.mark_dirty("activities")
+        self.show_view("activities", self.build_activities, self.refresh_activities)
+        self.activities_list.render(start=0)  # Registers the visible rows with the timer again
+
+    def build_activities(self, activities_frame):
+        self.activities_title = ctk.CTkLabel(activities_frame, text="", font=("Arial", 24))
+        self.activities_title.pack(pady=20)
 
         new_activity_label = ctk.CTkLabel(activities_frame, text="New Activity Name:", font=("Arial", 14))
         new_activity_label.pack(pady=5)
         self.new_activity_entry = ctk.CTkEntry(activities_frame)
         self.new_activity_entry.pack(pady=5)
 
-        add_activity_btn = ctk.CTkButton(activities_frame, text="Add Activity", command=lambda: self.add_activity(category))
+        add_activity_btn = ctk.CTkButton(activities_frame, text="Add Activity", command=lambda: self.add_activity(self.activities_category))
         add_activity_btn.pack(pady=10)
 
-        self.activities_list_frame = ctk.CTkFrame(activities_frame)
-        self.activities_list_frame.pack(fill="both", expand=True)
-
-        self.update_activities_list(category)
-
-    def add_activity(self, category):
-        new_activity = self.new_activity_entry.get().strip()
-        if new_activity and new_activity not in self.categories[category]:
-            self.categories[category][new_activity] = 0
-            self.activity_start_times[new_activity] = None
-            self.activity_goals[new_activity] = 3600  # Default goal is 1 hour to avoid division by zero
-            self.activity_sessions[new_activity] = 0  # Track number of sessions
-            self.milestones_reached[new_activity] = []
-            self.update_activities_list(category)
-            self.save_data()
-
-    def update_activities_list(self, category):
-        for widget in self.activities_list_frame.winfo_children():
-            widget.destroy()
-
-        for activity in self.categories[category].keys():
-            frame = ctk.CTkFrame(self.activities_list_frame)
-            frame.pack(fill="x", pady=5)
-
-            label = ctk.CTkLabel(frame, text=activity, font=("Arial", 14))
-            label.pack(side="left", padx=10)
-
-            start_btn = ctk.CTkButton(frame, text="Start", command=lambda a=activity: self.start_activity(category, a))
-            start_btn.pack(side="right", padx=5)
-
-            stop_btn = ctk.CTkButton(frame, text="Stop", command=lambda a=activity: self.stop_activity(category, a))
-            stop_btn.pack(side="right", padx=5)
-
-            delete_btn = ctk.CTkButton(frame, text="Delete", command=lambda a=activity: self.delete_activity(category, a))
-            delete_btn.pack(side="right", padx=10)
-
-            goal_entry_label = ctk.CTkLabel(frame, text="Goal (hours):", font=("Arial", 14))
-            goal_entry_label.pack(side="left", padx=5)
-            goal_entry = ctk.CTkEntry(frame)
-            goal_entry.pack(side="left", padx=5)
-            set_goal_btn = ctk.CTkButton(frame, text="Set Goal", command=lambda a=activity, e=goal_entry: self.set_goal(a, e.get()))
-            set_goal_btn.pack(side="left", padx=5)
-
-            self.activity_labels[f"{category}_{activity}_label"] = ctk.CTkLabel(frame, text="")
-            self.activity_labels[f"{category}_{activity}_label"].pack(pady=5)
-            self.activity_progress_bars[f"{category}_{activity}_progress_bar"] = ctk.CTkProgressBar(frame, mode='determinate')
-            self.activity_progress_bars[f"{category}_{activity}_progress_bar"].pack(pady=5, fill="x", expand=True)
-            self.activity_progress_labels[f"{category}_{activity}_progress_label"] = ctk.CTkLabel(frame, text=f"{activity.replace('_', ' ').capitalize()} Progress: 0%", font=("Arial", 14))
-            self.activity_progress_labels[f"{category}_{activity}_progress_label"].pack(pady=5)
-
-    def delete_activity(self, category, activity):
-        if activity in self.categories[category]:
-            del self.categories[category][activity]
-            self.update_activities_list(category)
-            self.save_data()
-
-    def set_goal(self, activity, goal):
+        self.activities_list = VirtualList(activities_frame, self.make_activity_row, self.bind_activity_row, row_height=90)
+        self.activities_list.pack(fill="both", expand=True)
+
+        self.refresh_activities()
+
+    def refresh_activities(self):
+        category_id = self.activities_category
+        self.activities_title.configure(text=f"Manage Activities for {self.tracker.categories[category_id].name.capitalize()}")
+        self.new_activity_entry.delete(0, END)
+        self.update_activities_list(category_id)
+
+    def add_activity(self, category_id):
+        activity = self.model.add_activity(category_id, self.new_activity_entry.get().strip())
+        if activity is not None:
+            self.views.mark_dirty("dashboard", "statistics", "heatmap")
+            self.activities_list.items.append(activity)
+            self.activities_list.insert_item(len(self.activities_list.items) - 1)
+
+    @profiler.profiled("list.update_activities_list")
+    def update_activities_list(self, category_id):
+        self.activities_list.set_items(self.tracker.category_activities(category_id))
+
+    def make_activity_row(self, parent):
+        frame = ctk.CTkFrame(parent)
+        frame.activity_id = None
+
+        controls_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        controls_frame.pack(fill="x")
+
+        frame.activity_label = ctk.CTkLabel(controls_frame, text="", font=("Arial", 14))
+        frame.activity_label.pack(side="left", padx=10)
+
+        start_btn = ctk.CTkButton(controls_frame, text="Start", command=lambda: self.start_activity(frame.activity_id))
+        start_btn.pack(side="right", padx=5)
+
+        stop_btn = ctk.CTkButton(controls_frame, text="Stop", command=lambda: self.stop_activity(frame.activity_id))
+        stop_btn.pack(side="right", padx=5)
+
+        delete_btn = ctk.CTkButton(controls_frame, text="Delete", command=lambda: self.delete_activity(frame.activity_id))
+        delete_btn.pack(side="right", padx=10)
+
+        goal_entry_label = ctk.CTkLabel(controls_frame, text="Goal (hours):", font=("Arial", 14))
+        goal_entry_label.pack(side="left", padx=5)
+        frame.goal_entry = ctk.CTkEntry(controls_frame)
+        frame.goal_entry.pack(side="left", padx=5)
+        set_goal_btn = ctk.CTkButton(controls_frame, text="Set Goal", command=lambda: self.set_goal(frame.activity_id, frame.goal_entry.get()))
+        set_goal_btn.pack(side="left", padx=5)
+        ladder_btn = ctk.CTkButton(controls_frame, text="Milestones", command=lambda: self.edit_milestone_ladder(frame.activity_id))
+        ladder_btn.pack(side="left", padx=5)
+
+        frame.time_label = ctk.CTkLabel(frame, text="")
+        frame.time_label.pack(side="left", padx=10)
+        frame.progress_bar = ctk.CTkProgressBar(frame, mode='determinate')
+        frame.progress_bar.pack(side="left", padx=5, fill="x", expand=True)
+        frame.progress_label = ctk.CTkLabel(frame, text="", font=("Arial", 14))
+        frame.progress_label.pack(side="left", padx=5)
+        return frame
+
+    def bind_activity_row(self, frame, activity):
+        widgets = (frame.time_label, frame.progress_bar, frame.progress_label)
+        if frame.activity_id is not None:
+            # The row is being recycled; drop the registry entry that still points at it
+            if self.activity_widgets.get(frame.activity_id) == widgets:
+                del self.activity_widgets[frame.activity_id]
+        frame.activity_id = activity.id
+        frame.activity_label.configure(text=activity.name)
+        frame.goal_entry.delete(0, END)
+
+        self.activity_widgets[activity.id] = widgets
+        self.update_activity_display(activity.id, self.tracker.current_total(activity.id))
+
+    def delete_activity(self, activity_id):
+        activity = self.tracker.activities.get(activity_id)
+        if self.model.delete_activity(activity_id):
+            self.views.mark_dirty("dashboard", "statistics", "heatmap")
+            index = self.activities_list.items.index(activity)
+            del self.activities_list.items[index]
+            self.activities_list.remove_item(index)
+
+    def set_goal(self, activity_id, goal):
         try:
             goal_hours = float(goal)
-            self.activity_goals[activity] = goal_hours * 3600  # Convert hours to seconds
-            self.save_data()
         except ValueError:
             messagebox.showerror("Invalid Input", "Please enter a valid number for the goal.")
+            return
+        self.model.set_goal(activity_id, goal_hours)
+        self.views.mark_dirty("dashboard", "statistics")
+
+    def start_activity(self, activity_id):
+        if not self.model.start_activity(activity_id):
+            return
+        self.views.mark_dirty("statistics")
+        if self.tick_job is None:
+            self.schedule_tick(1000)
+
+    def stop_activity(self, activity_id):
+        notifications = self.model.stop_activity(activity_id)
+        if notifications is not None:
+            self.views.mark_dirty("dashboard", "statistics", "heatmap")
+            self.update_label(activity_id)
+            self.show_notifications(notifications)
+
+    def show_notifications(self, notifications):
+        for title, message in summarize(notifications):
+            messagebox.showinfo(title, message)
+
+    def edit_milestone_ladder(self, activity_id):
+        activity = self.tracker.activities[activity_id]
+        current = ", ".join(str(hours) for hours in self.model.milestones.ladder_for(activity))
+        text = simpledialog.askstring("Milestones", "Milestone hours, comma-separated (leave empty for the default):", initialvalue=current)
+        if text is None:
+            return
+        try:
+            hours = parse_ladder(text) or None
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Please enter positive numbers of hours separated by commas.")
+            return
+        self.model.set_milestone_ladder(activity_id, hours)
+        self.show_notifications(self.model.check_milestones([activity_id]))
+
+    def tick(self):
+        # One shared 1 Hz loop for every running timer; it stops itself when nothing runs
+        if not self.tracker.running:
+            self.tick_job = None
+            return
+        if self.state() == "iconic":
+            self.schedule_tick(5000)
+            return
 
-    def start_activity(self, category, activity):
-        self.activity_start_times[activity] = time.time()
-        if activity not in self.activity_sessions:
-            self.activity_sessions[activity] = 0
-        self.activity_sessions[activity] += 1
-        self.update_activity_timer(category, activity)
-
-    def stop_activity(self, category, activity):
-        start_time = self.activity_start_times[activity]
-        if start_time is not None:
-            elapsed = time.time() - start_time
-            self.categories[category][activity] += elapsed
-            self.activity_start_times[activity] = None
-            self.update_label(category, activity)
-            self.check_milestones(activity, self.categories[category][activity])
-            self.save_data()
-
-    def update_activity_timer(self, category, activity):
-        start_time = self.activity_start_times[activity]
-        if start_time is not None:
-            elapsed = time.time() - start_time
-            total_time = self.categories[category][activity] + elapsed
-            self.update_activity_display(category, activity, total_time)
-            self.after(1000, lambda: self.update_activity_timer(category, activity))
-
-    def update_activity_display(self, category, activity, total_time):
+        now = time.time()
+        updates = []
+        for activity_id in self.tracker.running:
+            widgets = self.activity_widgets.get(activity_id)
+            if widgets is None or not widgets[0].winfo_ismapped():
+                continue
+            updates.append((activity_id, self.tracker.current_total(activity_id, now)))
+        for activity_id, total_time in updates:
+            self.update_activity_display(activity_id, total_time)
+        self.schedule_tick(1000)
+
+    def schedule_tick(self, delay):
+        self.tick_job = self.after(delay, profiler.scheduled("timer.tick", delay, self.tick))
+
+    def update_activity_display(self, activity_id, total_time):
+        widgets = self.activity_widgets.get(activity_id)
+        if widgets is None:
+            return  # Not on screen
+        time_label, progress_bar, progress_label = widgets
+        activity = self.tracker.activities[activity_id]
         hours, rem = divmod(total_time, 3600)
         minutes, seconds = divmod(rem, 60)
-        self.activity_labels[f"{category}_{activity}_label"].configure(text=f"{activity.replace('_', ' ').capitalize()} Time: {int(hours)}h {int(minutes)}m {int(seconds)}s")
-        goal_time = self.activity_goals.get(activity, 1)  # Avoid division by zero
+        time_label.configure(text=f"{activity.display_name} Time: {int(hours)}h {int(minutes)}m {int(seconds)}s")
+        goal_time = activity.goal
         progress_percentage = (total_time / goal_time) * 100 if goal_time > 0 else 0
-        self.activity_progress_bars[f"{category}_{activity}_progress_bar"]['value'] = progress_percentage
-        self.activity_progress_labels[f"{category}_{activity}_progress_label"].configure(text=f"{activity.replace('_', ' ').capitalize()} Progress: {progress_percentage:.2f}%")
-
-    def update_label(self, category, activity):
-        total_time = self.categories[category][activity]
-        self.update_activity_display(category, activity, total_time)
+        progress_bar.set(min(progress_percentage / 100, 1))
+        progress_label.configure(text=f"{activity.display_name} Progress: {progress_percentage:.2f}%")
 
-    def check_milestones(self, activity, total_time):
-        hours = total_time / 3600
-        for milestone in self.milestones:
-            if hours >= milestone and milestone not in self.milestones_reached[activity]:
-                self.milestones_reached[activity].append(milestone)
-                messagebox.showinfo("Milestone Reached", f"Congratulations! You've reached {milestone} hours in {activity.replace('_', ' ').capitalize()}!")
-
-        if activity in self.activity_goals and total_time >= self.activity_goals[activity]:
-            messagebox.showinfo("Goal Achieved", f"Great job! You've achieved your goal for {activity.replace('_', ' ').capitalize()}!")
+    def update_label(self, activity_id):
+        total_time = self.model.activity_total(activity_id)
+        self.update_activity_display(activity_id, total_time)
 
+    @profiler.profiled("view.show_statistics")
     def show_statistics(self):
-        self.clear_content()
-
-        statistics_frame = ctk.CTkFrame(self.content)
-        statistics_frame.pack(fill="both", expand=True)
+        self.show_view("statistics", self.build_statistics, self.refresh_statistics)
 
+    def build_statistics(self, statistics_frame):
         label = ctk.CTkLabel(statistics_frame, text="Statistics", font=("Arial", 24))
         label.pack(pady=20)
 
+        heatmap_btn = ctk.CTkButton(statistics_frame, text="Calendar Heatmap", command=self.show_heatmap)
+        heatmap_btn.pack(pady=5)
+
         # Tier Key
         tiers_frame = ctk.CTkFrame(statistics_frame)
         tiers_frame.pack(fill="x", pady=10)
@@ -371,52 +833,125 @@ class GamifyLifeApp(ctk.CTk):
             tier_label = ctk.CTkLabel(tiers_frame, text=tier, fg_color=color, width=200)
             tier_label.pack(side="left", padx=10, pady=5)
 
+        self.statistics_body = ctk.CTkFrame(statistics_frame, fg_color="transparent")
+        self.statistics_body.pack(fill="both", expand=True)
+        self.statistics_layout = None
+        self.statistics_labels = {}
+        self.refresh_statistics()
+
+    def refresh_statistics(self):
+        layout = [(category.id, list(category.activity_ids)) for category in self.tracker.categories.values()]
+        if layout != self.statistics_layout:
+            for widget in self.statistics_body.winfo_children():
+                widget.destroy()
+            self.statistics_labels = {}
+            self.statistics_layout = layout
+            for category_id, activity_ids in layout:
+                category_label = ctk.CTkLabel(self.statistics_body, text=f"{self.tracker.categories[category_id].name.capitalize()} Statistics", font=("Arial", 18))
+                category_label.pack(pady=10)
+                for activity_id in activity_ids:
+                    activity_label = ctk.CTkLabel(self.statistics_body, text="")
+                    activity_label.pack(pady=5)
+                    self.statistics_labels[activity_id] = activity_label
+
         # Display detailed statistics
-        for category, activities in self.categories.items():
-            category_label = ctk.CTkLabel(statistics_frame, text=f"{category.capitalize()} Statistics", font=("Arial", 18))
-            category_label.pack(pady=10)
-            for activity, total_time in activities.items():
-                hours, rem = divmod(total_time, 3600)
-                minutes, seconds = divmod(rem, 60)
-                tier, color = self.get_tier_and_color(total_time)
-                sessions = self.activity_sessions.get(activity, 0)
-                average_time = total_time / sessions if sessions > 0 else 0
-                avg_hours, avg_rem = divmod(average_time, 3600)
-                avg_minutes, avg_seconds = divmod(avg_rem, 60)
-                progress_percentage = (total_time / self.activity_goals.get(activity, 1)) * 100 if self.activity_goals.get(activity, 1) > 0 else 0
-                activity_label = ctk.CTkLabel(
-                    statistics_frame, 
-                    text=(
-                        f"{activity.replace('_', ' ').capitalize()}: {int(hours)}h {int(minutes)}m {int(seconds)}s\n"
-                        f"Tier: {tier}\n"
-                        f"Sessions: {sessions}\n"
-                        f"Average Time per Session: {int(avg_hours)}h {int(avg_minutes)}m {int(avg_seconds)}s\n"
-                        f"Goal Progress: {progress_percentage:.2f}%"
-                    ), 
-                    fg_color=color
-                )
-                activity_label.pack(pady=5)
+        stats = self.model.get_stats()
+        hours, rem = np.divmod(stats.totals.astype(int), 3600)
+        minutes, seconds = np.divmod(rem, 60)
+        avg_hours, avg_rem = np.divmod(stats.averages().astype(int), 3600)
+        avg_minutes, avg_seconds = np.divmod(avg_rem, 60)
+        columns = [
+            column.tolist() for column in
+            (hours, minutes, seconds, stats.sessions.astype(int), avg_hours, avg_minutes, avg_seconds, stats.goal_progress(), stats.tier_indices())
+        ]
+        today = datetime.date.today()
+        week_totals = {}
+        if self.model.storage.session_history:
+            week_start = time.time() - 7 * 24 * 3600
+            week_totals = self.model.activity_totals(since=week_start)
+        for activity_id, activity_label in self.statistics_labels.items():
+            row = stats.rows[activity_id]
+            h, m, s, sessions, avg_h, avg_m, avg_s, progress_percentage, tier_index = (column[row] for column in columns)
+            _, tier, color = TIERS[tier_index]
+            habit = self.tracker.habits.summary(activity_id, today)
+            text = (
+                f"{self.tracker.activities[activity_id].display_name}: {h}h {m}m {s}s\n"
+                f"Tier: {tier}\n"
+                f"Sessions: {sessions}\n"
+                f"Average Time per Session: {avg_h}h {avg_m}m {avg_s}s\n"
+                f"Goal Progress: {progress_percentage:.2f}%\n"
+                f"Streak: {habit['streak']} days (longest {habit['longest']})\n"
+                f"Daily Average: {habit['avg_7'] / 3600:.1f}h over 7 days, {habit['avg_30'] / 3600:.1f}h over 30 days\n"
+                f"Consistency: {habit['consistency']:.0f}% of the last 30 days"
+            )
+            if self.model.storage.session_history:
+                week_time = week_totals.get(activity_id, 0)
+                text += f"\nLast 7 Days: {week_time / 3600:.1f}h"
+            activity_label.configure(text=text, fg_color=color)
+
+    @profiler.profiled("view.show_heatmap")
+    def show_heatmap(self):
+        self.show_view("heatmap", self.build_heatmap, self.refresh_heatmap)
+
+    def build_heatmap(self, heatmap_frame):
+        label = ctk.CTkLabel(heatmap_frame, text="Calendar Heatmap", font=("Arial", 24))
+        label.pack(pady=20)
+
+        controls_frame = ctk.CTkFrame(heatmap_frame)
+        controls_frame.pack(pady=5)
+        back_btn = ctk.CTkButton(controls_frame, text="Back to Statistics", command=self.show_statistics)
+        back_btn.pack(side="left", padx=10)
+        self.heatmap_menu = ctk.CTkOptionMenu(controls_frame, values=[self.heatmap_selection], command=self.select_heatmap)
+        self.heatmap_menu.pack(side="left", padx=10)
+
+        self.heatmap_body = ctk.CTkFrame(heatmap_frame, fg_color="transparent")
+        self.heatmap_body.pack(fill="both", expand=True)
+        self.refresh_heatmap()
+
+    def refresh_heatmap(self):
+        # Each choice maps to the activity IDs it covers; None means all of them
+        self.heatmap_choices = {"All Activities": None}
+        for category in self.tracker.categories.values():
+            self.heatmap_choices[category.name] = list(category.activity_ids)
+            for activity in self.tracker.category_activities(category.id):
+                self.heatmap_choices[f"{category.name} / {activity.name}"] = [activity.id]
+        if self.heatmap_selection not in self.heatmap_choices:
+            self.heatmap_selection = "All Activities"
+        self.heatmap_menu.configure(values=list(self.heatmap_choices))
+        self.heatmap_menu.set(self.heatmap_selection)
+        self.render_heatmap()
+
+    def select_heatmap(self, selection):
+        self.heatmap_selection = selection
+        self.render_heatmap()
+
+    def render_heatmap(self):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from gamify_core.charts import build_heatmap_figure
+
+        for widget in self.heatmap_body.winfo_children():
+            widget.destroy()
+        fig = build_heatmap_figure(self.tracker.rollups, self.heatmap_choices[self.heatmap_selection])
+        if fig is None:
+            label = ctk.CTkLabel(self.heatmap_body, text="No sessions recorded yet.", font=("Arial", 18))
+            label.pack(pady=20)
+            return
+
+        canvas = FigureCanvasTkAgg(fig, master=self.heatmap_body)
+        with profiler.timed("chart.draw.heatmap"):
+            canvas.draw()
+        canvas.get_tk_widget().pack(pady=10)
 
     def get_tier_and_color(self, total_time):
-        tiers = [
-            (360000000, "Master", "green"),  # 100,000 hours
-            (180000000, "Expert", "yellow"),  # 50,000 hours
-            (36000000, "Pro", "orange"),  # 10,000 hours
-            (3600000, "Intermediate", "purple"),  # 1,000 hours
-            (360000, "Beginner", "blue"),  # 100 hours
-            (0, "Noob", "red")  # 0 hours
-        ]
-        for threshold, tier, color in tiers:
-            if total_time >= threshold:
-                return tier, color
-        return "Noob", "red"
+        _, tier, color = TIERS[get_tier_indices(total_time)]
+        return tier, color
 
+    @profiler.profiled("view.show_tasks")
     def show_tasks(self):
-        self.clear_content()
-
-        tasks_frame = ctk.CTkFrame(self.content)
-        tasks_frame.pack(fill="both", expand=True)
+        self.model.ensure_loaded("tasks")  # Read the first time it is shown
+        self.show_view("tasks", self.build_tasks, self.update_tasks_list)
 
+    def build_tasks(self, tasks_frame):
         label = ctk.CTkLabel(tasks_frame, text="Task List", font=("Arial", 24))
         label.pack(pady=20)
 
@@ -428,57 +963,88 @@ class GamifyLifeApp(ctk.CTk):
         add_task_btn = ctk.CTkButton(tasks_frame, text="Add Task", command=self.add_task)
         add_task_btn.pack(pady=10)
 
-        self.tasks_list_frame = ctk.CTkFrame(tasks_frame)
-        self.tasks_list_frame.pack(fill="both", expand=True)
+        self.tasks_bar = SelectionBar(
+            tasks_frame, lambda task: task.id, lambda task: task.archived, self.update_tasks_list,
+            [("Complete", lambda: self.bulk_tasks("complete")), ("Archive", lambda: self.bulk_tasks("archive")), ("Delete", lambda: self.bulk_tasks("delete"))]
+        )
+        self.tasks_bar.pack(fill="x", padx=10)
+        self.tasks_list = VirtualList(tasks_frame, self.make_task_row, self.bind_task_row)
+        self.tasks_list.pack(fill="both", expand=True)
+        self.tasks_bar.list = self.tasks_list
 
         self.update_tasks_list()
 
     def add_task(self):
         new_task = self.new_task_entry.get().strip()
         if new_task:
-            self.tasks.append({"task": new_task, "completed": False})
-            self.update_tasks_list()
-            self.save_data()
+            idx = self.model.add_task(new_task)
+            if not self.tasks_bar.archived:
+                self.tasks_list.items.append(self.model.tasks.items[idx])
+                self.tasks_list.insert_item(len(self.tasks_list.items) - 1)
 
+    @profiler.profiled("list.update_tasks_list")
     def update_tasks_list(self):
-        for widget in self.tasks_list_frame.winfo_children():
-            widget.destroy()
+        self.tasks_list.set_items(self.tasks_bar.visible(self.model.tasks.items))
 
-        for idx, task in enumerate(self.tasks):
-            frame = ctk.CTkFrame(self.tasks_list_frame)
-            frame.pack(fill="x", pady=5)
+    def make_task_row(self, parent):
+        frame = ctk.CTkFrame(parent)
+        self.tasks_bar.make_box(frame)
 
-            task_text = task["task"]
-            if task["completed"]:
-                task_text += " (Completed)"
-                label = ctk.CTkLabel(frame, text=task_text, font=("Arial", 14), fg_color="green")
-            else:
-                label = ctk.CTkLabel(frame, text=task_text, font=("Arial", 14))
+        frame.task_label = ctk.CTkLabel(frame, text="", font=("Arial", 14))
+        frame.task_label.pack(side="left", padx=10)
+
+        complete_btn = ctk.CTkButton(frame, text="Complete", command=lambda: self.complete_task(frame.item_index))
+        complete_btn.pack(side="right", padx=5)
 
-            label.pack(side="left", padx=10)
+        delete_btn = ctk.CTkButton(frame, text="Delete", command=lambda: self.delete_task(frame.item_index))
+        delete_btn.pack(side="right", padx=5)
+        return frame
 
-            complete_btn = ctk.CTkButton(frame, text="Complete", command=lambda idx=idx: self.complete_task(idx))
-            complete_btn.pack(side="right", padx=5)
+    def bind_task_row(self, frame, task):
+        self.tasks_bar.bind_box(frame, task)
+        if task.completed:
+            frame.task_label.configure(text=task.task + " (Completed)", fg_color="green")
+        else:
+            frame.task_label.configure(text=task.task, fg_color="transparent")
 
-            delete_btn = ctk.CTkButton(frame, text="Delete", command=lambda idx=idx: self.delete_task(idx))
-            delete_btn.pack(side="right", padx=5)
+    # Row buttons pass the row's index in the list on screen, which only holds
+    # the archived or the unarchived items
 
     def complete_task(self, idx):
-        self.tasks[idx]["completed"] = True
-        self.update_tasks_list()
-        self.save_data()
+        self.model.complete_task(self.tasks_list.items[idx].id)
+        self.tasks_list.refresh_item(idx)
 
     def delete_task(self, idx):
-        del self.tasks[idx]
+        task = self.tasks_list.items.pop(idx)
+        self.tasks_bar.forget(task)
+        self.model.delete_task(task.id)
+        self.tasks_list.remove_item(idx)
+
+    def bulk_tasks(self, action):
+        # One model call (so one event) and one list refresh however many are ticked
+        if not self.confirm_bulk(action, self.tasks_bar):
+            return
+        task_ids = self.tasks_bar.take()
+        if action == "complete":
+            self.model.complete_tasks(task_ids)
+        elif action == "archive":
+            self.model.archive_tasks(task_ids, not self.tasks_bar.archived)
+        else:
+            self.model.delete_tasks(task_ids)
+        self.views.mark_dirty("search")
         self.update_tasks_list()
-        self.save_data()
 
-    def show_goals(self):
-        self.clear_content()
+    def confirm_bulk(self, action, bar):
+        if not bar.selected:
+            return False
+        return action != "delete" or messagebox.askyesno("Delete", f"Delete {len(bar.selected)} selected items?")
 
-        goals_frame = ctk.CTkFrame(self.content)
-        goals_frame.pack(fill="both", expand=True)
+    @profiler.profiled("view.show_goals")
+    def show_goals(self):
+        self.model.ensure_loaded("goals")
+        self.show_view("goals", self.build_goals, self.update_goals_list)
 
+    def build_goals(self, goals_frame):
         label = ctk.CTkLabel(goals_frame, text="Goal List", font=("Arial", 24))
         label.pack(pady=20)
 
@@ -490,166 +1056,564 @@ class GamifyLifeApp(ctk.CTk):
         add_goal_btn = ctk.CTkButton(goals_frame, text="Add Goal", command=self.add_goal)
         add_goal_btn.pack(pady=10)
 
-        self.goals_list_frame = ctk.CTkFrame(goals_frame)
-        self.goals_list_frame.pack(fill="both", expand=True)
+        self.goals_bar = SelectionBar(
+            goals_frame, lambda goal: goal.id, lambda goal: goal.archived, self.update_goals_list,
+            [("Complete", lambda: self.bulk_goals("complete")), ("Archive", lambda: self.bulk_goals("archive")), ("Delete", lambda: self.bulk_goals("delete"))]
+        )
+        self.goals_bar.pack(fill="x", padx=10)
+        self.goals_list = VirtualList(goals_frame, self.make_goal_row, self.bind_goal_row)
+        self.goals_list.pack(fill="both", expand=True)
+        self.goals_bar.list = self.goals_list
 
         self.update_goals_list()
 
     def add_goal(self):
         new_goal = self.new_goal_entry.get().strip()
         if new_goal:
-            self.goals.append({"goal": new_goal, "progress": 0})
-            self.update_goals_list()
-            self.save_data()
+            idx = self.model.add_goal(new_goal)
+            if not self.goals_bar.archived:
+                self.goals_list.items.append(self.model.goals.items[idx])
+                self.goals_list.insert_item(len(self.goals_list.items) - 1)
 
+    @profiler.profiled("list.update_goals_list")
     def update_goals_list(self):
-        for widget in self.goals_list_frame.winfo_children():
-            widget.destroy()
+        self.goals_list.set_items(self.goals_bar.visible(self.model.goals.items))
+
+    def make_goal_row(self, parent):
+        frame = ctk.CTkFrame(parent)
+        self.goals_bar.make_box(frame)
 
-        for idx, goal in enumerate(self.goals):
-            frame = ctk.CTkFrame(self.goals_list_frame)
-            frame.pack(fill="x", pady=5)
+        frame.goal_label = ctk.CTkLabel(frame, text="", font=("Arial", 14))
+        frame.goal_label.pack(side="left", padx=10)
 
-            goal_text = goal["goal"]
-            label = ctk.CTkLabel(frame, text=goal_text, font=("Arial", 14))
-            label.pack(side="left", padx=10)
+        frame.progress_label = ctk.CTkLabel(frame, text="", font=("Arial", 14))
+        frame.progress_label.pack(side="left", padx=10)
 
-            progress_label = ctk.CTkLabel(frame, text=f"Progress: {goal['progress']}%", font=("Arial", 14))
-            progress_label.pack(side="left", padx=10)
+        frame.progress_entry = ctk.CTkEntry(frame, width=50)
+        frame.progress_entry.pack(side="left", padx=5)
+        set_progress_btn = ctk.CTkButton(frame, text="Set Progress", command=lambda: self.set_goal_progress(frame.item_index, frame.progress_entry.get()))
+        set_progress_btn.pack(side="left", padx=5)
 
-            progress_entry = ctk.CTkEntry(frame, width=50)
-            progress_entry.pack(side="left", padx=5)
-            set_progress_btn = ctk.CTkButton(frame, text="Set Progress", command=lambda idx=idx, e=progress_entry: self.set_goal_progress(idx, e.get()))
-            set_progress_btn.pack(side="left", padx=5)
+        delete_btn = ctk.CTkButton(frame, text="Delete", command=lambda: self.delete_goal(frame.item_index))
+        delete_btn.pack(side="right", padx=10)
+        return frame
 
-            delete_btn = ctk.CTkButton(frame, text="Delete", command=lambda idx=idx: self.delete_goal(idx))
-            delete_btn.pack(side="right", padx=10)
+    def bind_goal_row(self, frame, goal):
+        self.goals_bar.bind_box(frame, goal)
+        frame.goal_label.configure(text=goal.goal)
+        frame.progress_label.configure(text=f"Progress: {goal.progress}%")
+        frame.progress_entry.delete(0, END)
 
     def set_goal_progress(self, idx, progress):
         try:
             progress_value = int(progress)
-            if 0 <= progress_value <= 100:
-                self.goals[idx]["progress"] = progress_value
-                self.update_goals_list()
-                self.save_data()
-            else:
-                messagebox.showerror("Invalid Input", "Please enter a valid progress percentage (0-100).")
         except ValueError:
             messagebox.showerror("Invalid Input", "Please enter a valid number for the progress.")
+            return
+        try:
+            self.model.set_goal_progress(self.goals_list.items[idx].id, progress_value)
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Please enter a valid progress percentage (0-100).")
+            return
+        self.goals_list.refresh_item(idx)
 
     def delete_goal(self, idx):
-        del self.goals[idx]
+        goal = self.goals_list.items.pop(idx)
+        self.goals_bar.forget(goal)
+        self.model.delete_goal(goal.id)
+        self.goals_list.remove_item(idx)
+
+    def bulk_goals(self, action):
+        if not self.confirm_bulk(action, self.goals_bar):
+            return
+        goal_ids = self.goals_bar.take()
+        if action == "complete":
+            self.model.complete_goals(goal_ids)
+        elif action == "archive":
+            self.model.archive_goals(goal_ids, not self.goals_bar.archived)
+        else:
+            self.model.delete_goals(goal_ids)
+        self.views.mark_dirty("search")
         self.update_goals_list()
-        self.save_data()
 
+    @profiler.profiled("view.show_vision_board")
     def show_vision_board(self):
-        self.clear_content()
-
-        vision_board_frame = ctk.CTkFrame(self.content)
-        vision_board_frame.pack(fill="both", expand=True)
+        self.model.ensure_loaded("vision_board")
+        self.show_view("vision_board", self.build_vision_board, self.update_vision_board_list)
 
+    def build_vision_board(self, vision_board_frame):
         label = ctk.CTkLabel(vision_board_frame, text="Vision Board", font=("Arial", 24))
         label.pack(pady=20)
 
         upload_image_btn = ctk.CTkButton(vision_board_frame, text="Upload Image", command=self.upload_image)
         upload_image_btn.pack(pady=10)
 
-        self.vision_board_list_frame = ctk.CTkFrame(vision_board_frame)
-        self.vision_board_list_frame.pack(fill="both", expand=True)
+        if self.thumbnails is None:
+            self.thumbnails = ThumbnailLoader(self)
+        # Vision board items have no IDs; they are ticked by identity
+        self.vision_board_bar = SelectionBar(
+            vision_board_frame, id, lambda item: item.get("archived", False), self.update_vision_board_list,
+            [("Archive", lambda: self.bulk_vision_items("archive")), ("Delete", lambda: self.bulk_vision_items("delete"))]
+        )
+        self.vision_board_bar.pack(fill="x", padx=10)
+        self.vision_board_list = VirtualList(vision_board_frame, self.make_vision_board_row, self.bind_vision_board_row, row_height=115)
+        self.vision_board_list.pack(fill="both", expand=True)
+        self.vision_board_bar.list = self.vision_board_list
 
         self.update_vision_board_list()
 
     def upload_image(self):
         file_path = filedialog.askopenfilename(filetypes=[("Image files", "*.jpg *.jpeg *.png")])
         if file_path:
-            description = self.simpledialog.askstring("Image Description", "Enter a description for the image:")
+            description = simpledialog.askstring("Image Description", "Enter a description for the image:")
             if description:
-                self.vision_board.append({"image_path": file_path, "description": description})
-                self.update_vision_board_list()
-                self.save_data()
+                idx = self.model.add_vision_item(file_path, description)
+                if not self.vision_board_bar.archived:
+                    self.vision_board_list.items.append(self.model.vision_board.items[idx])
+                    self.vision_board_list.insert_item(len(self.vision_board_list.items) - 1)
 
+    @profiler.profiled("list.update_vision_board_list")
     def update_vision_board_list(self):
-        for widget in self.vision_board_list_frame.winfo_children():
-            widget.destroy()
+        self.vision_board_list.set_items(self.vision_board_bar.visible(self.model.vision_board.items))
 
-        for idx, item in enumerate(self.vision_board):
-            frame = ctk.CTkFrame(self.vision_board_list_frame)
-            frame.pack(fill="x", pady=5)
+    def make_vision_board_row(self, parent):
+        frame = ctk.CTkFrame(parent)
+        self.vision_board_bar.make_box(frame)
 
-            img = Image.open(item["image_path"])
-            img.thumbnail((100, 100))
-            img = ImageTk.PhotoImage(img)
+        frame.image_label = ctk.CTkLabel(frame, text="", image=self.thumbnails.placeholder)
+        frame.image_label.pack(side="left", padx=10)
 
-            img_label = ctk.CTkLabel(frame, image=img)
-            img_label.image = img  # Keep a reference to avoid garbage collection
-            img_label.pack(side="left", padx=10)
+        frame.description_label = ctk.CTkLabel(frame, text="", font=("Arial", 14))
+        frame.description_label.pack(side="left", padx=10)
 
-            description_label = ctk.CTkLabel(frame, text=item["description"], font=("Arial", 14))
-            description_label.pack(side="left", padx=10)
+        delete_btn = ctk.CTkButton(frame, text="Delete", command=lambda: self.delete_vision_board_item(frame.item_index))
+        delete_btn.pack(side="right", padx=10)
+        return frame
 
-            delete_btn = ctk.CTkButton(frame, text="Delete", command=lambda idx=idx: self.delete_vision_board_item(idx))
-            delete_btn.pack(side="right", padx=10)
+    def bind_vision_board_row(self, frame, item):
+        self.vision_board_bar.bind_box(frame, item)
+        image_path = item["image_path"]
+        frame.image_path = image_path
+        frame.image_label.configure(image=self.thumbnails.placeholder)
+        frame.description_label.configure(text=item["description"])
+
+        def show_thumbnail(photo):
+            # The row may have been recycled or destroyed while the image loaded
+            if frame.winfo_exists() and frame.image_path == image_path:
+                frame.image_label.configure(image=photo)
+
+        self.thumbnails.request(image_path, show_thumbnail)
 
     def delete_vision_board_item(self, idx):
-        del self.vision_board[idx]
+        item = self.vision_board_list.items.pop(idx)
+        self.vision_board_bar.forget(item)
+        self.model.delete_vision_item(identity_index(self.model.vision_board.items, item))
+        self.vision_board_list.remove_item(idx)
+
+    def bulk_vision_items(self, action):
+        if not self.confirm_bulk(action, self.vision_board_bar):
+            return
+        selected = self.vision_board_bar.take()
+        indices = [idx for idx, item in enumerate(self.model.vision_board.items) if selected.get(id(item)) is item]
+        if action == "archive":
+            self.model.archive_vision_items(indices, not self.vision_board_bar.archived)
+        else:
+            self.model.delete_vision_items(indices)
+        self.views.mark_dirty("search")
         self.update_vision_board_list()
-        self.save_data()
 
-    def get_tier_and_color(self, total_time):
-        tiers = [
-            (360000000, "Master", "green"),  # 100,000 hours
-            (180000000, "Expert", "yellow"),  # 50,000 hours
-            (36000000, "Pro", "orange"),  # 10,000 hours
-            (3600000, "Intermediate", "purple"),  # 1,000 hours
-            (360000, "Beginner", "blue"),  # 100 hours
-            (0, "Noob", "red")  # 0 hours
-        ]
-        for threshold, tier, color in tiers:
-            if total_time >= threshold:
-                return tier, color
-        return "Noob", "red"
+    @profiler.profiled("view.show_reports")
+    def show_reports(self):
+        self.show_view("reports", self.build_reports, lambda: None)
+
+    def build_reports(self, reports_frame):
+        label = ctk.CTkLabel(reports_frame, text="Reports", font=("Arial", 24))
+        label.pack(pady=20)
+
+        options_frame = ctk.CTkFrame(reports_frame)
+        options_frame.pack(pady=5)
+        self.report_period_menu = ctk.CTkOptionMenu(options_frame, values=["Weekly", "Monthly"])
+        self.report_period_menu.pack(side="left", padx=10)
+        self.report_format_menu = ctk.CTkOptionMenu(options_frame, values=["PNG", "PDF", "PNG and PDF"])
+        self.report_format_menu.pack(side="left", padx=10)
+
+        buttons_frame = ctk.CTkFrame(reports_frame)
+        buttons_frame.pack(pady=5)
+        self.report_buttons = []
+        for text, which in (("This Period", "current"), ("Last Period", "last"), ("Whole Year", "year")):
+            button = ctk.CTkButton(buttons_frame, text=text, command=lambda which=which: self.generate_reports(which))
+            button.pack(side="left", padx=10)
+            self.report_buttons.append(button)
+
+        self.reports_status = ctk.CTkLabel(reports_frame, text=f"Reports are saved to {os.path.abspath(self.reports_dir())}")
+        self.reports_status.pack(pady=10)
+
+    def reports_dir(self):
+        return profile_path(self.model.settings, self.model.settings["reports_dir"])
+
+    def generate_reports(self, which):
+        # Rendering happens in worker processes; the window only polls for them
+        from gamify_core.reports import ReportGenerator, period_key, year_periods
+
+        kind = "week" if self.report_period_menu.get() == "Weekly" else "month"
+        formats = {"PNG": ["png"], "PDF": ["pdf"], "PNG and PDF": ["png", "pdf"]}[self.report_format_menu.get()]
+        today = datetime.date.today()
+        if which == "year":
+            keys = year_periods(kind, today.year, today)
+        elif which == "current":
+            keys = [period_key(kind, today)]
+        elif kind == "week":
+            keys = [period_key(kind, today - datetime.timedelta(days=7))]
+        else:
+            keys = [period_key(kind, today.replace(day=1) - datetime.timedelta(days=1))]
+        if self.reports is None:
+            self.reports = ReportGenerator(self.reports_dir())
+        try:
+            self.report_futures, up_to_date = self.reports.start(self.model, kind, keys, formats)
+        except OSError as error:
+            messagebox.showerror("Reports", f"Could not generate the reports: {error}")
+            return
+        if not self.report_futures:
+            self.reports_status.configure(text=f"All {up_to_date} reports are up to date in {os.path.abspath(self.reports.output_dir)}")
+            return
+        for button in self.report_buttons:
+            button.configure(state="disabled")
+        self.report_up_to_date = up_to_date
+        self.poll_reports()
+
+    def poll_reports(self):
+        done = sum(future.done() for future in self.report_futures)
+        if done < len(self.report_futures):
+            self.reports_status.configure(text=f"Rendering reports... {done} of {len(self.report_futures)} done")
+            self.reports_job = self.after(200, self.poll_reports)
+            return
+        self.reports_job = None
+        errors = self.reports.finish(self.report_futures)
+        text = f"Rendered {len(self.report_futures) - len(errors)} reports ({self.report_up_to_date} already up to date) in {os.path.abspath(self.reports.output_dir)}"
+        if errors:
+            text += "\nFailed: " + "\n".join(errors)
+        self.report_futures = []
+        self.reports_status.configure(text=text)
+        for button in self.report_buttons:
+            button.configure(state="normal")
+
+    def sync_now(self):
+        try:
+            result = self.model.sync.sync()
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Sync", f"Could not sync through {self.model.sync.folder}: {error}")
+            return
+        if result["received"]:
+            if self.views.current == "activities" and self.activities_category not in self.tracker.categories:
+                self.show_categories()  # Its category was deleted on another device
+            self.views.mark_dirty("dashboard", "categories", "statistics", "heatmap", "tasks", "goals", "vision_board", "search")
+            if self.views.current == "activities":
+                self.update_activities_list(self.activities_category)  # Keeps the entry as it is
+            else:
+                self.views.mark_dirty("activities")
+        if result["notifications"]:
+            self.show_notifications(result["notifications"])
+        messagebox.showinfo("Sync", f"Sent {result['sent']} changes and received {result['received']}.")
+
+    def start_control_server(self):
+        # Optional local API (see gamify_core.control); its requests are run
+        # here on the Tk thread, everything queued since the last poll at once
+        socket_path = self.model.settings.get("control_socket")
+        port = self.model.settings.get("control_port")
+        if socket_path is None and port is None:
+            return
+        from gamify_core.control import ControlServer
+
+        self.control = ControlServer(self.model, socket_path, port)
+        try:
+            self.control.start()
+        except OSError as error:
+            self.control = None
+            messagebox.showerror("Control API", f"Could not start the control API: {error}")
+            return
+        self.poll_control()
+
+    def poll_control(self):
+        try:
+            count, notifications = self.control.drain()
+            if count:
+                self.control_changes = True
+                if self.tracker.running and self.tick_job is None:
+                    self.schedule_tick(1000)
+            # Scripts can send thousands of events a second; the views catch up at most once a second
+            if self.control_changes and time.monotonic() - self.control_refreshed >= 1.0:
+                self.control_changes = False
+                self.control_refreshed = time.monotonic()
+                self.views.mark_dirty("dashboard", "statistics", "heatmap", "tasks")
+                if self.views.current == "activities":
+                    self.activities_list.render(start=0)  # Rebinds the visible rows without clearing the entry
+                else:
+                    self.views.mark_dirty("activities")
+            if notifications:
+                self.show_notifications(notifications)
+        finally:
+            # One bad request must not stop the API
+            self.control_job = self.after(20, profiler.scheduled("control.poll", 20, self.poll_control))
+
+    def on_search(self, event=None):
+        # Results update as the user types
+        if not self.search_entry.get().strip():
+            return
+        built = "search" in self.views.frames
+        self.show_view("search", self.build_search, self.refresh_search)
+        if built:
+            self.refresh_search()
+
+    def build_search(self, search_frame):
+        label = ctk.CTkLabel(search_frame, text="Search Results", font=("Arial", 24))
+        label.pack(pady=20)
+        self.search_list = VirtualList(search_frame, self.make_search_row, self.bind_search_row)
+        self.search_list.pack(fill="both", expand=True)
+        self.refresh_search()
+
+    @profiler.profiled("list.refresh_search")
+    def refresh_search(self):
+        self.search_list.set_items(self.model.search_items(self.search_entry.get(), limit=50))
+
+    def make_search_row(self, parent):
+        frame = ctk.CTkFrame(parent)
+
+        frame.kind_label = ctk.CTkLabel(frame, text="", width=80, font=("Arial", 12))
+        frame.kind_label.pack(side="left", padx=10)
+
+        frame.title_label = ctk.CTkLabel(frame, text="", font=("Arial", 14))
+        frame.title_label.pack(side="left", padx=10)
+
+        open_btn = ctk.CTkButton(frame, text="Open", command=lambda: self.open_search_result(frame.result))
+        open_btn.pack(side="right", padx=10)
+        return frame
+
+    def bind_search_row(self, frame, result):
+        kind, _, title = result
+        frame.result = result
+        frame.kind_label.configure(text=kind.capitalize())
+        frame.title_label.configure(text=title)
+
+    def open_search_result(self, result):
+        kind, key, _ = result
+        if kind == "category" and key in self.tracker.categories:
+            self.show_activities(key)
+        elif kind == "activity" and key in self.tracker.activities:
+            activity = self.tracker.activities[key]
+            self.show_activities(activity.category_id)
+            self.activities_list.scroll_to(self.activities_list.items.index(activity))
+        elif kind == "task" and key in self.model.tasks.by_id:
+            # Archived items aren't searched, so results are always in the unarchived list
+            self.show_tasks()
+            self.tasks_bar.show_unarchived()
+            self.tasks_list.scroll_to(self.tasks_list.items.index(self.model.tasks.by_id[key]))
+        elif kind == "goal" and key in self.model.goals.by_id:
+            self.show_goals()
+            self.goals_bar.show_unarchived()
+            self.goals_list.scroll_to(self.goals_list.items.index(self.model.goals.by_id[key]))
+        elif kind == "vision":
+            self.show_vision_board()
+            self.vision_board_bar.show_unarchived()
+            for index, item in enumerate(self.vision_board_list.items):
+                if id(item) == key:
+                    self.vision_board_list.scroll_to(index)
+                    break
 
     def load_data(self):
-        if os.path.exists("timer_data.json"):
-            with open("timer_data.json", "r") as file:
-                data = json.load(file)
-                self.categories = data.get("categories", {})
-                self.activity_goals = data.get("activity_goals", {})
-                self.activity_sessions = data.get("activity_sessions", {})
-                self.milestones_reached = data.get("milestones_reached", {})
-                self.tasks = data.get("tasks", [])
-                self.goals = data.get("goals", [])
-                self.vision_board = data.get("vision_board", [])
-                for category in self.categories.keys():
-                    for activity in self.categories[category].keys():
-                        self.activity_start_times[activity] = None
-                        if activity not in self.milestones_reached:
-                            self.milestones_reached[activity] = []
-                        if activity not in self.activity_sessions:
-                            self.activity_sessions[activity] = 0
+        # The data is read on a worker thread so the window responds at once.
+        # Meanwhile the picture of the dashboard taken on the last exit stands
+        # in for it, as long as the data hasn't changed since.
+        self.show_snapshot()
+        for widget in self.data_widgets:
+            widget.configure(state="disabled")
+        self.loader = ThreadPoolExecutor(max_workers=1)
+        self.load_future = self.loader.submit(profiler.wrap("startup.load", self.load_in_background))
+        self.load_job = self.after(20, profiler.scheduled("startup.poll_load", 20, self.poll_load))
+
+    def load_in_background(self):
+        # Runs on the loader thread; the Tk thread leaves the model alone until it is done
+        self.model.load()
+        if self.tracker.categories and self.model.settings.get("charts") == "matplotlib":
+            # Importing matplotlib takes a good part of a second; the dashboard charts need it next
+            importlib.import_module("matplotlib.backends.backend_tkagg")
+            importlib.import_module("gamify_core.charts")
+
+    def poll_load(self):
+        if not self.load_future.done():
+            self.load_job = self.after(20, profiler.scheduled("startup.poll_load", 20, self.poll_load))
+            return
+        self.load_job = None
+        self.loader.shutdown()
+        self.loader = None
+        try:
+            self.load_future.result()
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Gamify Your Life", f"Could not load the data: {error}")
+            self.model.close()
+            self.destroy()
+            return
+        for widget in self.data_widgets:
+            widget.configure(state="normal")
+        if self.snapshot_label is not None:
+            self.snapshot_label.destroy()
+            self.snapshot_label = None
+            self.snapshot_image = None
+        self.show_dashboard()
+        self.start_control_server()
+
+    def show_snapshot(self):
+        path = valid_snapshot(self.model.storage, ctk.get_appearance_mode(), profile_path(self.model.settings, SNAPSHOT_PATH))
+        if path is None:
+            return
+        try:
+            self.snapshot_image = PhotoImage(file=path)
+        except TclError:
+            return  # Unreadable; the live dashboard follows shortly anyway
+        self.snapshot_label = Label(self.content, image=self.snapshot_image, anchor="nw", borderwidth=0)
+        self.snapshot_label.pack(fill="both", expand=True)
+
+    def take_snapshot(self):
+        # Only after the storage is closed, so the snapshot matches the data on disk
+        try:
+            save_snapshot(
+                self.model, self.content.winfo_width(), self.content.winfo_height(), ctk.get_appearance_mode(),
+                profile_path(self.model.settings, SNAPSHOT_PATH)
+            )
+        except OSError:
+            pass  # The next start just goes without
 
     def save_data(self):
-        data = {
-            "categories": self.categories,
-            "activity_goals": self.activity_goals,
-            "activity_sessions": self.activity_sessions,
-            "milestones_reached": self.milestones_reached,
-            "tasks": self.tasks,
-            "goals": self.goals,
-            "vision_board": self.vision_board
-        }
-        with open("timer_data.json", "w") as file:
-            json.dump(data, file)
+        self.model.save()
 
     def exit_app(self):
         if messagebox.askokcancel("Quit", "Do you want to quit?"):
-            self.save_data()
+            if self.loader is not None:
+                # Still loading: nothing can have changed, so there is nothing to save
+                self.after_cancel(self.load_job)
+                self.loader.shutdown()
+                self.model.close()
+                self.destroy()
+                return
+            self.close_profile()
             self.destroy()
 
-    def clear_content(self):
-        for widget in self.content.winfo_children():
-            widget.destroy()
-
+    def close_profile(self):
+        # Saves and closes the model and lets go of everything built from it
+        if self.control is not None:
+            self.after_cancel(self.control_job)
+            self.control.drain()  # Answer anything already queued
+            self.control.close()
+            self.control = None
+        if self.model.sync is not None:
+            try:
+                self.model.sync.push()  # So the other devices get today's changes
+            except OSError:
+                pass  # The folder isn't there; they go out with the next sync
+        self.save_data()
+        self.model.close()
+        self.take_snapshot()
+        if self.charts is not None:
+            self.charts.close()
+            self.charts = None
+        if self.thumbnails is not None:
+            self.thumbnails.close()
+            self.thumbnails = None
+        if self.reports is not None:
+            if self.reports_job is not None:
+                self.after_cancel(self.reports_job)
+                self.reports_job = None
+            self.reports.close()
+            self.reports = None
+            self.report_futures = []
+
+    def profile_choices(self):
+        return [DEFAULT_PROFILE] + list_profiles() + [NEW_PROFILE]
+
+    def select_profile(self, choice):
+        current = self.model.settings.get("profile") or DEFAULT_PROFILE
+        if choice == NEW_PROFILE:
+            self.profile_menu.set(current)
+            name = simpledialog.askstring("New Profile", "Profile name:")
+            if name is None:
+                return
+            choice = create_profile(name)
+            if choice is None:
+                messagebox.showerror("Invalid Input", "Profile names must be new and can't contain slashes or start with a dot.")
+                return
+            self.profile_menu.configure(values=self.profile_choices())
+            self.profile_menu.set(choice)
+        if choice != current:
+            self.switch_profile(None if choice == DEFAULT_PROFILE else choice)
+
+    def switch_profile(self, name):
+        # Everything of the current profile is saved and dropped before the
+        # next one is read, so only one profile's data is ever in memory.
+        # Running timers are stopped first so their time is kept.
+        notifications = []
+        for activity_id in list(self.tracker.running):
+            notifications.extend(self.model.stop_activity(activity_id) or [])
+        if self.tick_job is not None:
+            self.after_cancel(self.tick_job)
+            self.tick_job = None
+        self.close_profile()
+        for frame in self.views.frames.values():
+            frame.destroy()
+        self.views = ViewManager(self.content)
+        # The lists and selection bars of the destroyed views still hold on to their items
+        for name in (
+            "categories_list", "activities_list", "tasks_bar", "tasks_list", "goals_bar", "goals_list",
+            "vision_board_bar", "vision_board_list", "search_list"
+        ):
+            vars(self).pop(name, None)
+        self.activity_widgets.clear()
+        self.activities_category = None
+        self.heatmap_selection = "All Activities"
+        self.search_entry.delete(0, END)
+        settings = dict(self.model.settings, profile=name)
+        self.model = self.tracker = None
+        gc.collect()
+        self.model = GamifyModel(settings=settings)
+        self.tracker = self.model.tracker
+        self.profile_menu.set(name or DEFAULT_PROFILE)
+        if notifications:
+            self.show_notifications(notifications)
+        self.load_data()
 
-app = GamifyLifeApp()
-app.mainloop()
+    def toggle_debug_panel(self):
+        # Hidden panel (Ctrl+Shift+D, only with GAMIFY_PROFILE set) listing the
+        # rolling timings; it refreshes itself once a second while open.
+        if self.debug_panel is not None:
+            self.debug_panel.destroy()
+            self.debug_panel = None
+            return
+        self.debug_panel = ctk.CTkToplevel(self)
+        self.debug_panel.title("Profiling")
+        self.debug_panel.geometry("720x480")
+        self.debug_panel.protocol("WM_DELETE_WINDOW", self.toggle_debug_panel)
+        columns = ("count", "p50_ms", "p95_ms", "max_ms")
+        tree = ttk.Treeview(self.debug_panel, columns=columns)
+        tree.heading("#0", text="Timing")
+        tree.column("#0", width=280)
+        for column in columns:
+            tree.heading(column, text=column)
+            tree.column(column, width=100, anchor="e")
+        tree.pack(fill="both", expand=True)
+        export_btn = ctk.CTkButton(self.debug_panel, text="Export", command=lambda: messagebox.showinfo("Profiling", f"Exported to {profiler.export()}"))
+        export_btn.pack(pady=5)
+
+        def refresh():
+            if self.debug_panel is None or not tree.winfo_exists():
+                return
+            for name, summary in profiler.summary().items():
+                values = (summary["count"], f"{summary['p50_ms']:.2f}", f"{summary['p95_ms']:.2f}", f"{summary['max_ms']:.2f}")
+                if tree.exists(name):
+                    tree.item(name, values=values)
+                else:
+                    tree.insert("", "end", iid=name, text=name, values=values)
+            self.debug_panel.after(1000, refresh)
+        refresh()
+
+
+if __name__ == "__main__":
+    app = GamifyLifeApp()
+    app.mainloop()
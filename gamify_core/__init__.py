@@ -0,0 +1,18 @@
+from .entities import Activity, Category, Goal, Task
+from .goals import GoalList
+from .migrations import DATA_VERSION, upgrade
+from .milestones import DEFAULT_LADDER, Milestones, parse_ladder, summarize
+from .model import GamifyModel
+from .persistence import STORAGE_BACKENDS, JournalStorage, JsonStorage, ShardedStorage, SqliteStorage, apply_event, open_storage
+from .profiles import create_profile, list_profiles, open_profile_storage, profile_path
+from .profiling import Profiler, profiler
+from .rollups import Rollups
+from .search import SearchIndex, tokenize
+from .settings import load_settings
+from .snapshot import SNAPSHOT_PATH, render_dashboard, save_snapshot, valid_snapshot
+from .stats import TIERS, StatsEngine, get_tier_indices
+from .streaks import Habits, habit_summary
+from .tasks import TaskList
+from .tracker import ActivityTracker
+from .vision_board import VisionBoard
+from .writer import BackgroundWriter
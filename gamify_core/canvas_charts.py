@@ -0,0 +1,165 @@
+import math
+
+# matplotlib's "Paired" colormap, which the pie chart uses there too
+PAIRED = ["#a6cee3", "#1f78b4", "#b2df8a", "#33a02c", "#fb9a99", "#e31a1c", "#fdbf6f", "#ff7f00", "#cab2d6", "#6a3d9a", "#ffff99", "#b15928"]
+METRICS = ["Total Hours", "Sessions", "Avg Hours/Session", "Goal Progress"]
+
+
+def nice_ticks(top, count=5):
+    # Tick values from 0 to at least `top` in steps of 1, 2, 2.5 or 5 times a power of ten
+    if top <= 0:
+        return [0, 1]
+    raw = top / count
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw)
+    ticks = [0]
+    while ticks[-1] < top:
+        ticks.append(ticks[-1] + step)
+    return ticks
+
+
+def tick_label(value):
+    return f"{value:g}"
+
+
+class CanvasCharts:
+    # The dashboard's bar, pie and radar charts drawn straight onto two Tk
+    # canvases ("totals" and "stats", created by the caller with `sizes`),
+    # without matplotlib. update() takes the same data as DashboardCharts.
+    # Items are created once per list of categories; after that a change in
+    # the numbers moves and resizes the existing items, which Tk redraws on
+    # its own.
+    sizes = {"totals": (1000, 420), "stats": (520, 520)}
+
+    def __init__(self, totals_canvas, stats_canvas, foreground="black", radar_fill="#bfbfff"):
+        # Tk has no transparency, so radar_fill stands for matplotlib's blue at
+        # alpha 0.25 over the background (the default is for white)
+        self.totals_canvas = totals_canvas
+        self.stats_canvas = stats_canvas
+        self.foreground = foreground
+        self.radar_fill = radar_fill
+        self.categories = None
+        self.totals = None
+        self.stats = None
+        self.bars = []
+        self.bar_labels = []
+        self.wedges = []
+        self.wedge_labels = []
+        self.wedge_percentages = []
+        self.radar_polygon = None
+
+        width, height = self.sizes["totals"]
+        # Bar chart on the left half, with room for category names; pie on the right
+        self.plot = (150, 50, width // 2 - 30, height - 55)
+        self.pie_center = (width * 3 // 4, (height + 30) // 2)
+        self.pie_radius = min(width // 4, height // 2) - 70
+        self.build_stats_axes()
+
+    def update(self, categories, totals, stats):
+        if categories != self.categories:
+            self.categories = list(categories)
+            self.totals = list(totals)
+            self.build_totals()
+        elif totals != self.totals:
+            self.totals = list(totals)
+            self.update_totals()
+        if stats != self.stats:
+            self.stats = list(stats)
+            self.update_stats()
+
+    def text(self, canvas, x, y, label, size=10, anchor="center", tags=()):
+        return canvas.create_text(x, y, text=label, fill=self.foreground, font=("Arial", size), anchor=anchor, tags=tags)
+
+    def build_totals(self):
+        canvas = self.totals_canvas
+        canvas.delete("all")
+        x0, y0, x1, y1 = self.plot
+        self.text(canvas, (x0 + x1) / 2, 22, "Total Hours Spent per Category", 12)
+        self.text(canvas, (x0 + x1) / 2, y1 + 38, "Total Hours")
+        canvas.create_rectangle(x0, y0, x1, y1, outline=self.foreground)
+        self.text(canvas, self.pie_center[0], 22, "Distribution of Total Hours per Category", 12)
+
+        # The first category at the bottom, as barh() has it
+        slot = (y1 - y0) / max(len(self.categories), 1)
+        self.bars = []
+        self.bar_labels = []
+        for i, category in enumerate(self.categories):
+            middle = y1 - slot * (i + 0.5)
+            self.bars.append(canvas.create_rectangle(x0, middle - slot * 0.4, x0, middle + slot * 0.4, fill="skyblue", outline=""))
+            self.bar_labels.append(self.text(canvas, x0 - 8, middle, category, anchor="e"))
+
+        cx, cy = self.pie_center
+        r = self.pie_radius
+        self.wedges = []
+        self.wedge_labels = []
+        self.wedge_percentages = []
+        for i, category in enumerate(self.categories):
+            self.wedges.append(canvas.create_arc(cx - r, cy - r, cx + r, cy + r, start=0, extent=0, style="pieslice", fill=PAIRED[i % len(PAIRED)], outline=""))
+            self.wedge_labels.append(self.text(canvas, cx, cy, category))
+            self.wedge_percentages.append(self.text(canvas, cx, cy, "", 9))
+        self.update_totals()
+
+    def update_totals(self):
+        canvas = self.totals_canvas
+        x0, y0, x1, y1 = self.plot
+        ticks = nice_ticks(max(self.totals, default=0))
+        scale = (x1 - x0) / ticks[-1]
+        canvas.delete("ticks")
+        for tick in ticks:
+            x = x0 + tick * scale
+            canvas.create_line(x, y1, x, y1 + 5, fill=self.foreground, tags="ticks")
+            self.text(canvas, x, y1 + 16, tick_label(tick), 9, tags="ticks")
+        for bar, total in zip(self.bars, self.totals):
+            _, top, _, bottom = canvas.coords(bar)
+            canvas.coords(bar, x0, top, x0 + total * scale, bottom)
+
+        cx, cy = self.pie_center
+        r = self.pie_radius
+        grand_total = sum(self.totals)
+        theta = 0
+        for wedge, label, percentage, total in zip(self.wedges, self.wedge_labels, self.wedge_percentages, self.totals):
+            if grand_total <= 0 or total <= 0:
+                for item in (wedge, label, percentage):
+                    canvas.itemconfigure(item, state="hidden")
+                continue
+            span = 360 * total / grand_total
+            # An extent of exactly 360 draws nothing
+            canvas.itemconfigure(wedge, start=theta, extent=min(span, 359.99), state="normal")
+            middle = math.radians(theta + span / 2)
+            x, y = math.cos(middle), -math.sin(middle)  # Canvas y grows downwards
+            canvas.coords(label, cx + 1.1 * r * x, cy + 1.1 * r * y)
+            canvas.itemconfigure(label, anchor="w" if x > 0 else "e", state="normal")
+            canvas.coords(percentage, cx + 0.6 * r * x, cy + 0.6 * r * y)
+            canvas.itemconfigure(percentage, text=f"{100 * total / grand_total:.1f}%", state="normal")
+            theta += span
+
+    def build_stats_axes(self):
+        # Rings, spokes and metric names; only the polygon changes with the data
+        canvas = self.stats_canvas
+        width, height = self.sizes["stats"]
+        self.radar_center = (width / 2, height / 2)
+        self.radar_radius = min(width, height) / 2 - 80
+        cx, cy = self.radar_center
+        r = self.radar_radius
+        for fraction in (0.25, 0.5, 0.75, 1):
+            canvas.create_oval(cx - r * fraction, cy - r * fraction, cx + r * fraction, cy + r * fraction, outline="#b0b0b0")
+        for i, metric in enumerate(METRICS):
+            angle = 2 * math.pi * i / len(METRICS)
+            x, y = math.cos(angle), -math.sin(angle)
+            canvas.create_line(cx, cy, cx + r * x, cy + r * y, fill="#b0b0b0")
+            anchor = ("s" if y < 0 else "n") if abs(x) < 0.01 else ("w" if x > 0 else "e")
+            self.text(canvas, cx + (r + 12) * x, cy + (r + 12) * y, metric, anchor=anchor)
+
+    def update_stats(self):
+        canvas = self.stats_canvas
+        cx, cy = self.radar_center
+        top = max(self.stats) * 1.1 or 1
+        points = []
+        for i, value in enumerate(self.stats):
+            angle = 2 * math.pi * i / len(self.stats)
+            distance = self.radar_radius * value / top
+            points += [cx + distance * math.cos(angle), cy - distance * math.sin(angle)]
+        if self.radar_polygon is None:
+            self.radar_polygon = canvas.create_polygon(points, fill=self.radar_fill, outline="blue", width=2)
+        else:
+            canvas.coords(self.radar_polygon, points)
@@ -0,0 +1,195 @@
+import datetime
+
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.figure import Figure
+
+
+class DashboardCharts:
+    # The dashboard figures, built once (outside pyplot, so nothing accumulates
+    # in its registry) with their artists updated in place. `dirty` names the
+    # figures whose data changed since the caller last drew them.
+    metrics = ["Total Hours", "Sessions", "Avg Hours/Session", "Goal Progress"]
+
+    def __init__(self):
+        self.totals_figure = Figure(figsize=(14, 6))
+        self.bar_ax, self.pie_ax = self.totals_figure.subplots(1, 2)
+        self.stats_figure = Figure(figsize=(8, 8))
+        self.radar_ax = self.stats_figure.add_subplot(polar=True)
+        self.figures = {"totals": self.totals_figure, "stats": self.stats_figure}
+        self.dirty = set()
+        self.categories = None
+        self.totals = None
+        self.stats = None
+        self.bars = None
+        self.wedges = None
+        self.pie_labels = None
+        self.pie_percentages = None
+        self.radar_line = None
+        self.radar_fill = None
+        self.angles = np.linspace(0, 2 * np.pi, len(self.metrics), endpoint=False).tolist()
+        self.angles += self.angles[:1]
+
+    def update(self, categories, totals, stats):
+        if categories != self.categories:
+            self.categories = list(categories)
+            self.totals = list(totals)
+            self.build_totals()
+        elif totals != self.totals:
+            self.totals = list(totals)
+            self.update_totals()
+        if stats != self.stats:
+            self.stats = list(stats)
+            self.update_stats()
+
+    def build_totals(self):
+        self.bar_ax.clear()
+        self.bars = self.bar_ax.barh(self.categories, self.totals, color='skyblue')
+        self.bar_ax.set_xlabel('Total Hours')
+        self.bar_ax.set_title('Total Hours Spent per Category')
+
+        self.pie_ax.clear()
+        self.pie_ax.set_title('Distribution of Total Hours per Category')
+        self.wedges = None
+        if sum(self.totals) > 0:
+            self.wedges, self.pie_labels, self.pie_percentages = self.pie_ax.pie(
+                self.totals, labels=self.categories, autopct='%1.1f%%', colors=colormaps["Paired"].colors
+            )
+        self.dirty.add("totals")
+
+    def update_totals(self):
+        for bar, total in zip(self.bars, self.totals):
+            bar.set_width(total)
+        self.bar_ax.relim()
+        self.bar_ax.autoscale_view()
+
+        grand_total = sum(self.totals)
+        if self.wedges is None or grand_total == 0:
+            # The pie appears or disappears as a whole
+            self.build_totals()
+            return
+        theta = 0
+        for wedge, label, percentage, total in zip(self.wedges, self.pie_labels, self.pie_percentages, self.totals):
+            span = 360 * total / grand_total
+            wedge.set_theta1(theta)
+            wedge.set_theta2(theta + span)
+            middle = np.deg2rad(theta + span / 2)
+            x, y = np.cos(middle), np.sin(middle)
+            label.set_position((1.1 * x, 1.1 * y))
+            label.set_horizontalalignment('left' if x > 0 else 'right')
+            percentage.set_position((0.6 * x, 0.6 * y))
+            percentage.set_text(f"{100 * total / grand_total:.1f}%")
+            theta += span
+        self.dirty.add("totals")
+
+    def update_stats(self):
+        values = self.stats + self.stats[:1]
+        if self.radar_line is None:
+            self.radar_fill, = self.radar_ax.fill(self.angles, values, color='blue', alpha=0.25)
+            self.radar_line, = self.radar_ax.plot(self.angles, values, color='blue', linewidth=2)
+            self.radar_ax.set_yticklabels([])
+            self.radar_ax.set_xticks(self.angles[:-1])
+            self.radar_ax.set_xticklabels(self.metrics)
+        else:
+            self.radar_fill.set_xy(np.column_stack([self.angles, values]))
+            self.radar_line.set_data(self.angles, values)
+        self.radar_ax.set_ylim(0, max(values) * 1.1 or 1)
+        self.dirty.add("stats")
+
+    def close(self):
+        for figure in self.figures.values():
+            figure.clear()
+        self.figures.clear()
+
+
+def build_heatmap_figure(rollups, activity_ids=None, today=None):
+    # Calendar heatmap (one row of weeks per year) plus a 52-week trend, read
+    # entirely from the rollup buckets. Returns None when there is no data.
+    days = rollups.series("day", activity_ids)
+    if not days:
+        return None
+
+    years = sorted({int(day[:4]) for day in days}, reverse=True)
+    fig = Figure(figsize=(12, 1.6 * len(years) + 3))
+    axes = fig.subplots(len(years) + 1, 1, squeeze=False)[:, 0]
+    for ax, year in zip(axes, years):
+        # One column per week starting on the Monday on or before January 1st
+        first_monday = datetime.date(year, 1, 1) - datetime.timedelta(days=datetime.date(year, 1, 1).weekday())
+        grid = np.full((7, 54), np.nan)
+        day = datetime.date(year, 1, 1)
+        while day.year == year:
+            offset = (day - first_monday).days
+            grid[offset % 7, offset // 7] = days.get(day.isoformat(), 0) / 3600
+            day += datetime.timedelta(days=1)
+        ax.imshow(grid, cmap="Greens", aspect="equal", vmin=0)
+        ax.set_title(str(year), loc="left")
+        ax.set_yticks([0, 2, 4])
+        ax.set_yticklabels(["Mon", "Wed", "Fri"])
+        ax.set_xticks([])
+
+    # Trend over the last 52 weeks, with a 4-week moving average
+    weeks = rollups.series("week", activity_ids)
+    today = today or datetime.date.today()
+    week_keys = []
+    for weeks_ago in range(51, -1, -1):
+        iso_year, iso_week, _ = (today - datetime.timedelta(weeks=weeks_ago)).isocalendar()
+        week_keys.append(f"{iso_year}-W{iso_week:02d}")
+    weekly_hours = np.array([weeks.get(key, 0) / 3600 for key in week_keys])
+    moving_average = np.convolve(weekly_hours, np.ones(4) / 4, mode="full")[:len(weekly_hours)]
+    trend_ax = axes[-1]
+    trend_ax.bar(range(len(week_keys)), weekly_hours, color="skyblue", label="Hours per week")
+    trend_ax.plot(range(len(week_keys)), moving_average, color="tab:blue", linewidth=2, label="4-week average")
+    trend_ax.set_xticks(range(0, len(week_keys), 4))
+    trend_ax.set_xticklabels(week_keys[::4], fontsize=8)
+    trend_ax.legend(loc="upper left")
+    fig.tight_layout()
+    return fig
+
+
+def build_report_figure(report):
+    # A one-page progress report (A4 landscape) from the dict built by
+    # reports.ReportBuilder: hours per category in the period, goal progress
+    # and tier for the activities worked on, and the milestones reached
+    fig = Figure(figsize=(11.69, 8.27))
+    fig.suptitle(f"{report['title']}  ({report['first_day']} to {report['last_day']})", fontsize=16, fontweight="bold")
+    grid = fig.add_gridspec(2, 2, height_ratios=[3, 1], hspace=0.3, wspace=0.45)
+
+    category_ax = fig.add_subplot(grid[0, 0])
+    names = [category["name"] for category in report["categories"]]
+    hours = [sum(activity["seconds"] for activity in category["activities"]) / 3600 for category in report["categories"]]
+    category_ax.barh(names, hours, color="skyblue")
+    category_ax.set_xlabel("Hours")
+    category_ax.set_title(f"Hours per Category (total {sum(hours):.1f} h)")
+
+    # The activities with time in the period, most first; bars show goal
+    # progress at the end of the period in the colour of the tier reached
+    activities = sorted(
+        (activity for category in report["categories"] for activity in category["activities"] if activity["seconds"] > 0),
+        key=lambda activity: activity["seconds"], reverse=True
+    )[:15][::-1]
+    goal_ax = fig.add_subplot(grid[0, 1])
+    if activities:
+        goal_ax.barh(
+            [f"{activity['name']} ({activity['seconds'] / 3600:.1f} h)" for activity in activities],
+            [min(activity["progress"], 100) for activity in activities],
+            color=[activity["tier_color"] for activity in activities]
+        )
+        for y, activity in enumerate(activities):
+            goal_ax.text(2, y, f"{activity['progress']:.0f}% · {activity['tier']}", va="center", fontsize=8, bbox={"facecolor": "white", "alpha": 0.8, "linewidth": 0})
+    else:
+        goal_ax.text(0.5, 0.5, "No time logged", ha="center", va="center", transform=goal_ax.transAxes)
+    goal_ax.set_xlim(0, 100)
+    goal_ax.set_xlabel("Goal progress (%)")
+    goal_ax.set_title("Activities")
+
+    text_ax = fig.add_subplot(grid[1, :])
+    text_ax.axis("off")
+    lines = [
+        f"{activity['name']}: {', '.join(f'{milestone:g} h' for milestone in activity['milestones'])}"
+        for category in report["categories"] for activity in category["activities"] if activity["milestones"]
+    ]
+    text_ax.set_title("Milestones Reached", loc="left")
+    text_ax.text(0, 1, "\n".join(lines[:12]) if lines else "None this period", va="top", fontsize=10, transform=text_ax.transAxes)
+    if len(lines) > 12:
+        text_ax.text(0, 0, f"...and {len(lines) - 12} more", fontsize=9, transform=text_ax.transAxes)
+    return fig
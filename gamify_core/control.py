@@ -0,0 +1,289 @@
+import argparse
+import asyncio
+import errno
+import json
+import os
+import queue
+import socket
+import stat
+import sys
+import threading
+import time
+
+from .profiling import profiler
+from .transfer import check_session
+
+
+def resolve_activity(model, command):
+    # An activity is given by ID, or by name together with its category's name
+    activity = command.get("activity")
+    if isinstance(activity, int):
+        if activity not in model.tracker.activities:
+            raise ValueError(f"No activity with ID {activity}")
+        return activity
+    category = model.tracker.find_category(command.get("category"))
+    if category is None:
+        raise ValueError(f"No category named {command.get('category')!r}")
+    for candidate in model.tracker.category_activities(category.id):
+        if candidate.name == activity:
+            return candidate.id
+    raise ValueError(f"No activity named {activity!r} in {category.name!r}")
+
+
+def remove_stale_socket(path):
+    # Removes a socket left behind by a previous run. Raises OSError if `path`
+    # is something else, or if another instance is still listening on it.
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(errno.EEXIST, "Not a socket", path)
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.remove(path)
+        return
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, "Another instance is already running", path)
+
+
+class ControlServer:
+    # Local API for editors, shell hooks and scripts: newline-delimited JSON
+    # over a Unix socket, or TCP on 127.0.0.1 where there are none. Each
+    # request line is one command or {"commands": [...]} and gets one response
+    # line with a result per command and the current totals of the activities
+    # they touched.
+    #
+    # The asyncio loop runs on its own thread and never touches the model: it
+    # queues requests, and the thread that owns the model (the Tk thread in the
+    # app) calls drain() to run everything queued so far as one batch, in one
+    # model transaction. Logged sessions in a batch become a single import event.
+    def __init__(self, model, path=None, port=None, max_batch=5000):
+        self.model = model
+        self.path = path
+        self.port = port
+        self.max_batch = max_batch
+        self.requests = queue.Queue()
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.ready = threading.Event()
+        self.error = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+
+    def run(self):
+        self.loop = asyncio.new_event_loop()
+        try:
+            if self.path is not None:
+                remove_stale_socket(self.path)
+                self.server = self.loop.run_until_complete(asyncio.start_unix_server(self.handle, self.path))
+                os.chmod(self.path, 0o600)
+            else:
+                self.server = self.loop.run_until_complete(asyncio.start_server(self.handle, "127.0.0.1", self.port or 0))
+                self.port = self.server.sockets[0].getsockname()[1]
+        except OSError as error:
+            self.error = error
+            self.ready.set()
+            return
+        self.ready.set()
+        self.loop.run_forever()
+        self.loop.close()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    commands = request["commands"] if isinstance(request, dict) and "commands" in request else [request]
+                    if not isinstance(commands, list) or not all(isinstance(command, dict) for command in commands):
+                        raise ValueError("not a list of objects")
+                except (ValueError, TypeError, KeyError):
+                    response = {"error": "Expected a JSON command or {\"commands\": [...]}"}
+                else:
+                    future = self.loop.create_future()
+                    self.requests.put((commands, future))
+                    response = await future
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @profiler.profiled("control.drain")
+    def drain(self):
+        # Runs on the model's thread. Returns (commands run, notifications).
+        batch = []
+        count = 0
+        while count < self.max_batch:
+            try:
+                commands, future = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            batch.append((commands, future))
+            count += len(commands)
+        if not batch:
+            return 0, []
+
+        sessions = []
+        notifications = []
+        responses = []
+        answered = False
+        try:
+            with self.model.transaction():
+                for commands, future in batch:
+                    results = []
+                    touched = []
+                    for command in commands:
+                        # Whatever a command does wrong, the rest of the batch still runs
+                        try:
+                            result, activity_id = self.execute(command, sessions, notifications)
+                        except Exception as error:
+                            result, activity_id = {"error": str(error) or type(error).__name__}, None
+                        results.append(result)
+                        if activity_id is not None:
+                            touched.append(activity_id)
+                    responses.append((future, results, touched))
+                if sessions:
+                    self.model.import_sessions(sessions)
+                    notifications.extend(self.model.check_milestones({activity_id for activity_id, _, _ in sessions}))
+
+            now = time.time()
+            tracker = self.model.tracker
+            for future, results, touched in responses:
+                totals = {str(a): tracker.current_total(a, now) for a in touched if a in tracker.activities}
+                self.loop.call_soon_threadsafe(self.reply, future, {"results": results, "totals": totals})
+            answered = True
+        finally:
+            if not answered:
+                # No client is left waiting; reply() skips the ones answered already
+                for _, future in batch:
+                    self.loop.call_soon_threadsafe(self.reply, future, {"error": "The commands could not be run"})
+        return count, notifications
+
+    def execute(self, command, sessions, notifications):
+        op = command.get("op")
+        if op == "start":
+            activity_id = resolve_activity(self.model, command)
+            return {"started": self.model.start_activity(activity_id)}, activity_id
+        if op == "stop":
+            activity_id = resolve_activity(self.model, command)
+            stopped = self.model.stop_activity(activity_id)
+            if stopped is not None:
+                notifications.extend(stopped)
+            return {"stopped": stopped is not None}, activity_id
+        if op == "log_session":
+            activity_id = resolve_activity(self.model, command)
+            start, end = float(command["start"]), float(command["end"])
+            check_session(start, end, time.time())
+            sessions.append((activity_id, start, end))
+            return {"logged": True}, activity_id
+        if op == "add_task":
+            text = str(command["task"]).strip()
+            if not text:
+                raise ValueError("empty task")
+            idx = self.model.add_task(text)
+            return {"task": self.model.tasks.items[idx].id}, None
+        if op == "totals":
+            now = time.time()
+            return {"totals": {str(a): self.model.tracker.current_total(a, now) for a in self.model.tracker.activities}}, None
+        raise ValueError(f"Unknown op {op!r}")
+
+    def reply(self, future, response):
+        if not future.done():
+            future.set_result(response)
+
+    def close(self):
+        if self.loop is None or self.loop.is_closed():
+            return
+
+        def stop():
+            self.server.close()
+            self.loop.stop()
+        self.loop.call_soon_threadsafe(stop)
+        self.thread.join()
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class ControlClient:
+    # Blocking client for scripts: send() one batch of commands, get the response
+    def __init__(self, path=None, port=None, timeout=10):
+        if path is not None:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(path)
+        else:
+            self.sock = socket.create_connection(("127.0.0.1", port))
+        self.sock.settimeout(timeout)
+        self.file = self.sock.makefile("rwb")
+
+    def send(self, *commands):
+        self.file.write(json.dumps({"commands": list(commands)}).encode() + b"\n")
+        self.file.flush()
+        return json.loads(self.file.readline())
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+def activity_command(op, target):
+    # "12" -> {"activity": 12}; "Work/reading" -> {"category": "Work", "activity": "reading"}
+    if target.isdigit():
+        return {"op": op, "activity": int(target)}
+    category, _, activity = target.partition("/")
+    return {"op": op, "category": category, "activity": activity}
+
+
+def main():
+    from .settings import load_settings
+
+    settings = load_settings()
+    parser = argparse.ArgumentParser(description="Send commands to a running Gamify Your Life app")
+    parser.add_argument("--socket", default=settings.get("control_socket"))
+    parser.add_argument("--port", type=int, default=settings.get("control_port"))
+    sub = parser.add_subparsers(dest="command", required=True)
+    for op in ("start", "stop"):
+        sub.add_parser(op).add_argument("activity", help="activity ID or Category/activity")
+    log = sub.add_parser("log")
+    log.add_argument("activity", help="activity ID or Category/activity")
+    log.add_argument("minutes", type=float)
+    task = sub.add_parser("task")
+    task.add_argument("text")
+    sub.add_parser("totals")
+    args = parser.parse_args()
+    if args.socket is None and args.port is None:
+        parser.error("set control_socket or control_port in settings.json, or pass --socket/--port")
+
+    if args.command in ("start", "stop"):
+        command = activity_command(args.command, args.activity)
+    elif args.command == "log":
+        end = time.time()
+        command = dict(activity_command("log_session", args.activity), start=end - args.minutes * 60, end=end)
+    elif args.command == "task":
+        command = {"op": "add_task", "task": args.text}
+    else:
+        command = {"op": "totals"}
+    client = ControlClient(args.socket, args.port)
+    try:
+        response = client.send(command)
+    finally:
+        client.close()
+    json.dump(response, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+class Category:
+    __slots__ = ("id", "name", "activity_ids")
+
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+        self.activity_ids = []
+
+    def to_data(self):
+        return {"name": self.name}
+
+
+class Activity:
+    # Everything known about one activity; `start_time` is only set while it runs
+    # `ladder` is the activity's own list of milestone hours, or None for the default ladder
+    __slots__ = ("id", "category_id", "name", "total", "goal", "sessions", "milestones_reached", "ladder", "start_time")
+
+    def __init__(self, id, category_id, name, total=0, goal=3600, sessions=0, milestones_reached=None, ladder=None):
+        self.id = id
+        self.category_id = category_id
+        self.name = name
+        self.total = total
+        self.goal = goal  # Default goal is 1 hour to avoid division by zero
+        self.sessions = sessions
+        self.milestones_reached = milestones_reached if milestones_reached is not None else []
+        self.ladder = ladder
+        self.start_time = None
+
+    @property
+    def display_name(self):
+        return self.name.replace('_', ' ').capitalize()
+
+    @classmethod
+    def from_data(cls, id, data):
+        return cls(id, data["category"], data["name"], data["total"], data["goal"], data["sessions"], data["milestones"], data.get("ladder"))
+
+    def to_data(self):
+        return {
+            "category": self.category_id,
+            "name": self.name,
+            "total": self.total,
+            "goal": self.goal,
+            "sessions": self.sessions,
+            "milestones": self.milestones_reached,
+            "ladder": self.ladder,
+        }
+
+
+class Task:
+    # Archived tasks and goals are kept but only listed on request
+    __slots__ = ("id", "task", "completed", "archived")
+
+    def __init__(self, id, task, completed=False, archived=False):
+        self.id = id
+        self.task = task
+        self.completed = completed
+        self.archived = archived
+
+    def to_data(self):
+        return {"task": self.task, "completed": self.completed, "archived": self.archived}
+
+
+class Goal:
+    __slots__ = ("id", "goal", "progress", "archived")
+
+    def __init__(self, id, goal, progress=0, archived=False):
+        self.id = id
+        self.goal = goal
+        self.progress = progress
+        self.archived = archived
+
+    def to_data(self):
+        return {"goal": self.goal, "progress": self.progress, "archived": self.archived}
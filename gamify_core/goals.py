@@ -0,0 +1,45 @@
+from .entities import Goal
+
+
+class GoalList:
+    def __init__(self):
+        self.items = []
+        self.by_id = {}
+
+    def load(self, data):
+        self.items = [Goal(int(key), goal["goal"], goal["progress"], goal.get("archived", False)) for key, goal in data.get("goals", {}).items()]
+        self.by_id = {goal.id: goal for goal in self.items}
+
+    def index(self, goal_id):
+        return self.items.index(self.by_id[goal_id])
+
+    def add(self, goal_id, goal):
+        self.by_id[goal_id] = Goal(goal_id, goal)
+        self.items.append(self.by_id[goal_id])
+        return len(self.items) - 1
+
+    def set_progress(self, goal_id, progress):
+        if not 0 <= progress <= 100:
+            raise ValueError("Progress must be between 0 and 100")
+        self.by_id[goal_id].progress = progress
+        return self.index(goal_id)
+
+    def delete(self, goal_id):
+        idx = self.index(goal_id)
+        del self.items[idx]
+        del self.by_id[goal_id]
+        return idx
+
+    def complete_many(self, goal_ids):
+        for goal_id in goal_ids:
+            self.by_id[goal_id].progress = 100
+
+    def set_archived(self, goal_ids, archived):
+        for goal_id in goal_ids:
+            self.by_id[goal_id].archived = archived
+
+    def delete_many(self, goal_ids):
+        goal_ids = set(goal_ids)
+        self.items[:] = [goal for goal in self.items if goal.id not in goal_ids]
+        for goal_id in goal_ids:
+            del self.by_id[goal_id]
@@ -0,0 +1,114 @@
+from .rollups import add_to_day_buckets
+
+
+DATA_VERSION = 2
+
+
+def apply_legacy_event(data, event):
+    # Replays a journal record written before entity IDs, when everything was
+    # keyed by category and activity name
+    categories = data.setdefault("categories", {})
+    activity_goals = data.setdefault("activity_goals", {})
+    activity_sessions = data.setdefault("activity_sessions", {})
+    milestones_reached = data.setdefault("milestones_reached", {})
+    tasks = data.setdefault("tasks", [])
+    goals = data.setdefault("goals", [])
+    vision_board = data.setdefault("vision_board", [])
+    rollups = data.setdefault("rollups", {})
+
+    op = event["op"]
+    if op == "add_category":
+        categories.setdefault(event["category"], {})
+    elif op == "delete_category":
+        categories.pop(event["category"], None)
+        rollups.pop(event["category"], None)
+    elif op == "add_activity":
+        categories.setdefault(event["category"], {})[event["activity"]] = 0
+        activity_goals[event["activity"]] = 3600
+        activity_sessions[event["activity"]] = 0
+        milestones_reached[event["activity"]] = []
+    elif op == "delete_activity":
+        categories.get(event["category"], {}).pop(event["activity"], None)
+        rollups.get(event["category"], {}).pop(event["activity"], None)
+    elif op == "set_goal":
+        activity_goals[event["activity"]] = event["seconds"]
+    elif op == "start":
+        activity_sessions[event["activity"]] = activity_sessions.get(event["activity"], 0) + 1
+    elif op == "stop":
+        activities = categories.setdefault(event["category"], {})
+        activities[event["activity"]] = activities.get(event["activity"], 0) + event["end"] - event["start"]
+        add_to_day_buckets(rollups.setdefault(event["category"], {}).setdefault(event["activity"], {}), event["start"], event["end"])
+    elif op == "milestone":
+        milestones_reached.setdefault(event["activity"], []).append(event["milestone"])
+    elif op == "add_task":
+        tasks.append({"task": event["task"], "completed": False})
+    elif op == "complete_task":
+        tasks[event["index"]]["completed"] = True
+    elif op == "delete_task":
+        del tasks[event["index"]]
+    elif op == "add_goal":
+        goals.append({"goal": event["goal"], "progress": 0})
+    elif op == "set_goal_progress":
+        goals[event["index"]]["progress"] = event["progress"]
+    elif op == "delete_goal":
+        del goals[event["index"]]
+    elif op == "add_vision_item":
+        vision_board.append({"image_path": event["image_path"], "description": event["description"]})
+    elif op == "delete_vision_item":
+        del vision_board[event["index"]]
+
+
+def upgrade(data):
+    # Converts name-keyed data (no "version" field) to the ID-keyed layout.
+    # Goals, session counts and milestones used to be keyed by the bare
+    # activity name, so same-named activities in different categories shared
+    # them; each one gets its own copy here.
+    if data.get("version") == DATA_VERSION:
+        return data
+    activity_goals = data.get("activity_goals", {})
+    activity_sessions = data.get("activity_sessions", {})
+    milestones_reached = data.get("milestones_reached", {})
+    legacy_rollups = data.get("rollups", {})
+    next_id = 1
+    categories = {}
+    activities = {}
+    rollups = {}
+    for category, category_activities in data.get("categories", {}).items():
+        category_id = next_id
+        next_id += 1
+        categories[str(category_id)] = {"name": category}
+        for activity, total_time in category_activities.items():
+            activities[str(next_id)] = {
+                "category": category_id,
+                "name": activity,
+                "total": total_time,
+                "goal": activity_goals.get(activity, 3600),
+                "sessions": activity_sessions.get(activity, 0),
+                "milestones": list(milestones_reached.get(activity, [])),
+                "ladder": None,
+            }
+            days = legacy_rollups.get(category, {}).get(activity)
+            if days:
+                rollups[str(next_id)] = days
+            next_id += 1
+    tasks = {}
+    for task in data.get("tasks", []):
+        tasks[str(next_id)] = {"task": task["task"], "completed": task["completed"]}
+        next_id += 1
+    goals = {}
+    for goal in data.get("goals", []):
+        goals[str(next_id)] = {"goal": goal["goal"], "progress": goal["progress"]}
+        next_id += 1
+    upgraded = {
+        "version": DATA_VERSION,
+        "next_id": next_id,
+        "categories": categories,
+        "activities": activities,
+        "tasks": tasks,
+        "goals": goals,
+        "vision_board": data.get("vision_board", []),
+        "rollups": rollups,
+    }
+    if "journal_seq" in data:
+        upgraded["journal_seq"] = data["journal_seq"]
+    return upgraded
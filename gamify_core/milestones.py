@@ -0,0 +1,99 @@
+DEFAULT_LADDER = (1, 10, 100, 1000, 10000)  # Hours
+
+
+def parse_ladder(text):
+    # "1, 5, 25" -> [1, 5, 25]; raises ValueError for anything that isn't a list of positive hours
+    hours = []
+    for part in text.replace(";", ",").split(","):
+        if part.strip():
+            value = float(part)
+            if value <= 0:
+                raise ValueError("Milestones must be positive")
+            hours.append(int(value) if value.is_integer() else value)
+    return sorted(set(hours))
+
+
+def summarize(notifications, limit=3):
+    # Folds a long list of (title, message) notifications into at most `limit`
+    # so evaluating a bulk import doesn't open thousands of message boxes
+    if len(notifications) <= limit:
+        return notifications
+    shown = notifications[:limit - 1]
+    rest = notifications[limit - 1:]
+    lines = [message for _, message in rest[:10]]
+    if len(rest) > 10:
+        lines.append(f"...and {len(rest) - 10} more.")
+    return shown + [(f"{len(rest)} More Achievements", "\n".join(lines))]
+
+
+class Milestones:
+    # Keeps, per activity, the index of the next milestone on its ladder and
+    # whether its goal is still to be reached, so checking after a stop is a
+    # comparison against one threshold rather than a scan of every milestone.
+    # Each milestone and each goal fires once; raising a goal above the
+    # current total arms it again.
+    def __init__(self, ladder=DEFAULT_LADDER):
+        self.ladder = sorted(ladder)
+        self.next_index = {}
+        self.goal_pending = {}
+
+    def ladder_for(self, activity):
+        return activity.ladder if activity.ladder is not None else self.ladder
+
+    def load(self, activities):
+        self.next_index = {}
+        self.goal_pending = {}
+        for activity in activities:
+            self.track(activity)
+
+    def track(self, activity):
+        # Anything already passed when an activity is loaded was announced
+        # when it was passed (or recorded as reached), so it isn't fired again
+        ladder = self.ladder_for(activity)
+        reached = set(activity.milestones_reached)
+        index = 0
+        while index < len(ladder) and ladder[index] in reached:
+            index += 1
+        self.next_index[activity.id] = index
+        self.goal_pending[activity.id] = activity.total < activity.goal
+
+    def forget(self, activity_id):
+        self.next_index.pop(activity_id, None)
+        self.goal_pending.pop(activity_id, None)
+
+    def goal_changed(self, activity):
+        self.goal_pending[activity.id] = activity.total < activity.goal
+
+    def check(self, activity):
+        # Returns the milestones newly reached and the (title, message) notifications to show
+        ladder = self.ladder_for(activity)
+        index = self.next_index.get(activity.id, 0)
+        hours = activity.total / 3600
+        new_milestones = []
+        notifications = []
+        while index < len(ladder) and hours >= ladder[index]:
+            milestone = ladder[index]
+            index += 1
+            if milestone in activity.milestones_reached:
+                continue  # Reached under an earlier ladder
+            activity.milestones_reached.append(milestone)
+            new_milestones.append(milestone)
+            notifications.append(("Milestone Reached", f"Congratulations! You've reached {milestone} hours in {activity.display_name}!"))
+        self.next_index[activity.id] = index
+
+        if self.goal_pending.get(activity.id, True) and activity.total >= activity.goal:
+            self.goal_pending[activity.id] = False
+            notifications.append(("Goal Achieved", f"Great job! You've achieved your goal for {activity.display_name}!"))
+        return new_milestones, notifications
+
+    def check_all(self, activities):
+        # One pass over many activities, e.g. after importing sessions in bulk.
+        # Returns {activity_id: new milestones} and all notifications.
+        new_milestones = {}
+        notifications = []
+        for activity in activities:
+            reached, messages = self.check(activity)
+            if reached:
+                new_milestones[activity.id] = reached
+            notifications.extend(messages)
+        return new_milestones, notifications
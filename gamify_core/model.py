@@ -0,0 +1,415 @@
+import contextlib
+import datetime
+import os
+
+from .goals import GoalList
+from .migrations import DATA_VERSION
+from .milestones import DEFAULT_LADDER, Milestones, summarize
+from .persistence import LAZY_AREAS
+from .profiles import open_profile_storage
+from .profiling import profiler
+from .search import SearchIndex
+from .settings import load_settings
+from .tasks import TaskList
+from .tracker import ActivityTracker
+from .vision_board import VisionBoard
+
+
+class GamifyModel:
+    # Everything the app knows, without any UI. Each mutation updates the
+    # in-memory state and records one event with the storage backend.
+    def __init__(self, storage=None, settings=None):
+        self.settings = settings if settings is not None else load_settings()
+        self.storage = storage if storage is not None else open_profile_storage(self.settings)
+        self.next_id = 1
+        self.tracker = ActivityTracker()
+        self.milestones = Milestones(self.settings.get("milestones", DEFAULT_LADDER))
+        self.tasks = TaskList()
+        self.goals = GoalList()
+        self.vision_board = VisionBoard()
+        self.search = SearchIndex()
+        self.pending_areas = set()  # Areas the storage hasn't read yet (see ensure_loaded)
+        self.pending_events = None  # Events recorded inside a transaction
+        self.sync = None  # FolderSync once loaded, if settings has a sync_dir
+
+    def load(self):
+        with profiler.timed("storage.load"):
+            data = self.storage.load()
+        self.pending_areas = set(self.storage.lazy_areas)
+        self.next_id = data.get("next_id", 1)
+        self.tracker.load(data)
+        self.milestones.load(self.tracker.activities.values())
+        self.tasks.load(data)
+        self.goals.load(data)
+        self.vision_board.load(data)
+        self.build_search_index()
+        if self.sync is None and self.settings.get("sync_dir"):
+            # Each profile syncs through its own subfolder
+            folder = self.settings["sync_dir"]
+            if self.settings.get("profile"):
+                folder = os.path.join(folder, self.settings["profile"])
+            from .sync import FolderSync
+
+            self.sync = FolderSync(self, folder, self.settings.get("write_delay", 0.5))
+
+    def ensure_loaded(self, *areas):
+        # Reads the named areas ("tasks", "goals", "vision_board"; all of them
+        # if none are named) if the storage left them out of load(). Methods
+        # that take an ID or index need no check: the caller got it from a
+        # loaded list.
+        for area in areas or LAZY_AREAS:
+            if area not in self.pending_areas:
+                continue
+            with profiler.timed(f"storage.load_{area}"):
+                data = self.storage.load_area(area)
+            self.pending_areas.discard(area)
+            if area == "tasks":
+                self.tasks.load(data)
+                self.index_tasks()
+            elif area == "goals":
+                self.goals.load(data)
+                self.index_goals()
+            else:
+                self.vision_board.load(data)
+                self.index_vision_board()
+
+    def build_search_index(self):
+        self.search.clear()
+        for category in self.tracker.categories.values():
+            self.index_category(category)
+        for activity in self.tracker.activities.values():
+            self.index_activity(activity)
+        self.index_tasks()
+        self.index_goals()
+        self.index_vision_board()
+
+    # Archived items stay out of search until they are restored
+
+    def index_tasks(self):
+        for task in self.tasks.items:
+            if not task.archived:
+                self.search.add(("task", task.id), task.task)
+
+    def index_goals(self):
+        for goal in self.goals.items:
+            if not goal.archived:
+                self.search.add(("goal", goal.id), goal.goal)
+
+    def index_vision_board(self):
+        for item in self.vision_board.items:
+            if not item.get("archived", False):
+                self.index_vision_item(item)
+
+    def index_category(self, category):
+        self.search.add(("category", category.id), category.name)
+
+    def index_activity(self, activity):
+        category_name = self.tracker.categories[activity.category_id].name
+        self.search.add(("activity", activity.id), f"{category_name} / {activity.name}", f"{activity.name} {category_name}")
+
+    def index_vision_item(self, item):
+        # Vision board items have no IDs; the dict itself identifies them while loaded
+        self.search.add(("vision", id(item)), item["description"])
+
+    def search_items(self, query, limit=20, kinds=None):
+        # Returns [(kind, key, title)], best match first
+        self.ensure_loaded()
+        with profiler.timed("search.query"):
+            return [(kind, key, title) for (kind, key), title in self.search.search(query, limit, kinds)]
+
+    def new_id(self):
+        # IDs are unique across categories, activities, tasks and goals and are never reused
+        entity_id = self.next_id
+        self.next_id += 1
+        return entity_id
+
+    def get_data(self):
+        # Areas that were never loaded are left out
+        data = {
+            "version": DATA_VERSION,
+            "next_id": self.next_id,
+            "categories": {str(category.id): category.to_data() for category in self.tracker.categories.values()},
+            "activities": {str(activity.id): activity.to_data() for activity in self.tracker.activities.values()},
+            "tasks": {str(task.id): task.to_data() for task in self.tasks.items},
+            "goals": {str(goal.id): goal.to_data() for goal in self.goals.items},
+            "vision_board": self.vision_board.items,
+            "rollups": {str(activity_id): buckets for activity_id, buckets in self.tracker.rollups.days.items()},
+            "habits": {str(activity_id): state for activity_id, state in self.tracker.habits.states.items()}
+        }
+        for area in self.pending_areas:
+            del data[area]
+        return data
+
+    def record_event(self, event):
+        if self.pending_events is not None:
+            self.pending_events.append(event)
+            return
+        if self.sync is not None:
+            self.sync.observe(event)
+        with profiler.timed("storage.record"):
+            self.storage.record(event)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        # Groups every mutation made inside into one "batch" event, which the
+        # storage commits in one go: one journal line, one SQLite transaction,
+        # one write for the JSON backend. Nested transactions join the
+        # outermost one. The in-memory state can't be rolled back, so if the
+        # block raises, what it changed so far is still committed.
+        if self.pending_events is not None:
+            yield
+            return
+        self.pending_events = []
+        try:
+            yield
+        finally:
+            events, self.pending_events = self.pending_events, None
+            if len(events) == 1:
+                self.record_event(events[0])
+            elif events:
+                self.record_event({"op": "batch", "events": events})
+
+    def save(self):
+        with profiler.timed("storage.save"):
+            self.storage.save(self.get_data())
+
+    def close(self):
+        if self.sync is not None:
+            self.sync.close()
+        self.storage.close()
+
+    def add_category(self, name):
+        # Returns the new Category, or None if the name is empty or taken
+        category = self.tracker.add_category(self.next_id, name)
+        if category is not None:
+            self.new_id()
+            self.index_category(category)
+            self.record_event({"op": "add_category", "id": category.id, "name": name})
+        return category
+
+    def delete_category(self, category_id):
+        category = self.tracker.categories.get(category_id)
+        if self.tracker.delete_category(category_id):
+            for activity_id in category.activity_ids:
+                self.milestones.forget(activity_id)
+                self.search.remove(("activity", activity_id))
+            self.search.remove(("category", category_id))
+            self.record_event({"op": "delete_category", "id": category_id})
+            return True
+        return False
+
+    def add_activity(self, category_id, name):
+        # Returns the new Activity, or None if the name is empty or taken in this category
+        activity = self.tracker.add_activity(self.next_id, category_id, name)
+        if activity is not None:
+            self.new_id()
+            self.milestones.track(activity)
+            self.index_activity(activity)
+            self.record_event({"op": "add_activity", "id": activity.id, "category": category_id, "name": name})
+        return activity
+
+    def delete_activity(self, activity_id):
+        if self.tracker.delete_activity(activity_id):
+            self.milestones.forget(activity_id)
+            self.search.remove(("activity", activity_id))
+            self.record_event({"op": "delete_activity", "id": activity_id})
+            return True
+        return False
+
+    def set_goal(self, activity_id, goal_hours):
+        goal_time = goal_hours * 3600  # Convert hours to seconds
+        self.tracker.set_goal(activity_id, goal_time)
+        self.milestones.goal_changed(self.tracker.activities[activity_id])
+        self.record_event({"op": "set_goal", "activity": activity_id, "seconds": goal_time})
+
+    def set_milestone_ladder(self, activity_id, hours):
+        # hours is a sorted list of milestone hours, or None to go back to the default ladder
+        activity = self.tracker.activities[activity_id]
+        activity.ladder = hours
+        self.milestones.track(activity)
+        self.record_event({"op": "set_milestone_ladder", "activity": activity_id, "hours": hours})
+
+    def start_activity(self, activity_id):
+        if self.tracker.start(activity_id):
+            self.record_event({"op": "start", "activity": activity_id})
+            return True
+        return False
+
+    def stop_activity(self, activity_id):
+        # Returns the notifications to show, or None if the activity wasn't running
+        session = self.tracker.stop(activity_id)
+        if session is None:
+            return None
+        start_time, end_time = session
+        self.record_event({"op": "stop", "activity": activity_id, "start": start_time, "end": end_time})
+        new_milestones, notifications = self.milestones.check(self.tracker.activities[activity_id])
+        for milestone in new_milestones:
+            self.record_event({"op": "milestone", "activity": activity_id, "milestone": milestone})
+        return notifications
+
+    def import_sessions(self, sessions):
+        # Adds a batch of finished (activity_id, start, end) sessions as one event.
+        # Milestones aren't checked here; call check_milestones once the import is done.
+        self.tracker.add_sessions(sessions)
+        self.record_event({"op": "import_sessions", "sessions": [list(session) for session in sessions]})
+
+    def iter_sessions(self):
+        # Every recorded session as (activity_id, start, end). Backends without
+        # session history only have day totals, which come back as one session
+        # per activity and day starting at local midnight.
+        if self.storage.session_history:
+            yield from self.storage.iter_sessions()
+            return
+        for activity_id, buckets in self.tracker.rollups.days.items():
+            for day in sorted(buckets):
+                start = datetime.datetime.combine(datetime.date.fromisoformat(day), datetime.time()).timestamp()
+                yield activity_id, start, start + buckets[day]
+
+    def check_milestones(self, activity_ids=None):
+        # Evaluates many activities in one pass (e.g. after a bulk import) and
+        # returns their notifications folded into a handful
+        ids = activity_ids if activity_ids is not None else list(self.tracker.activities)
+        new_milestones, notifications = self.milestones.check_all(self.tracker.activities[activity_id] for activity_id in ids)
+        for activity_id, milestones in new_milestones.items():
+            for milestone in milestones:
+                self.record_event({"op": "milestone", "activity": activity_id, "milestone": milestone})
+        return summarize(notifications)
+
+    def activity_total(self, activity_id, since=None, until=None):
+        if since is None and until is None:
+            return self.tracker.activities[activity_id].total
+        return self.storage.activity_total(activity_id, since, until)
+
+    def activity_totals(self, since=None, until=None):
+        # {activity_id: seconds}
+        if since is None and until is None:
+            return {activity.id: activity.total for activity in self.tracker.activities.values()}
+        return self.storage.activity_totals(since, until)
+
+    def get_stats(self):
+        stats = self.tracker.stats
+        if stats.stale:
+            with profiler.timed("stats.rebuild"):
+                stats.rebuild(self.tracker.categories, self.tracker.activities)
+        return stats
+
+    def add_task(self, text):
+        self.ensure_loaded("tasks")
+        task_id = self.new_id()
+        idx = self.tasks.add(task_id, text)
+        self.search.add(("task", task_id), text)
+        self.record_event({"op": "add_task", "id": task_id, "task": text})
+        return idx
+
+    def complete_task(self, task_id):
+        # Task and goal methods return the item's current row index for the list views
+        idx = self.tasks.complete(task_id)
+        self.record_event({"op": "complete_task", "id": task_id})
+        return idx
+
+    def delete_task(self, task_id):
+        idx = self.tasks.delete(task_id)
+        self.search.remove(("task", task_id))
+        self.record_event({"op": "delete_task", "id": task_id})
+        return idx
+
+    # The bulk methods take any number of items and record a single event.
+    # IDs that aren't there (any more) are skipped.
+
+    def complete_tasks(self, task_ids):
+        task_ids = [task_id for task_id in task_ids if task_id in self.tasks.by_id]
+        if task_ids:
+            self.tasks.complete_many(task_ids)
+            self.record_event({"op": "complete_tasks", "ids": task_ids})
+
+    def delete_tasks(self, task_ids):
+        task_ids = [task_id for task_id in task_ids if task_id in self.tasks.by_id]
+        if task_ids:
+            self.tasks.delete_many(task_ids)
+            self.search.remove_many(("task", task_id) for task_id in task_ids)
+            self.record_event({"op": "delete_tasks", "ids": task_ids})
+
+    def archive_tasks(self, task_ids, archived=True):
+        task_ids = [task_id for task_id in task_ids if task_id in self.tasks.by_id]
+        if task_ids:
+            self.tasks.set_archived(task_ids, archived)
+            if archived:
+                self.search.remove_many(("task", task_id) for task_id in task_ids)
+            else:
+                for task_id in task_ids:
+                    self.search.add(("task", task_id), self.tasks.by_id[task_id].task)
+            self.record_event({"op": "archive_tasks", "ids": task_ids, "archived": archived})
+
+    def add_goal(self, text):
+        self.ensure_loaded("goals")
+        goal_id = self.new_id()
+        idx = self.goals.add(goal_id, text)
+        self.search.add(("goal", goal_id), text)
+        self.record_event({"op": "add_goal", "id": goal_id, "goal": text})
+        return idx
+
+    def set_goal_progress(self, goal_id, progress):
+        idx = self.goals.set_progress(goal_id, progress)
+        self.record_event({"op": "set_goal_progress", "id": goal_id, "progress": progress})
+        return idx
+
+    def delete_goal(self, goal_id):
+        idx = self.goals.delete(goal_id)
+        self.search.remove(("goal", goal_id))
+        self.record_event({"op": "delete_goal", "id": goal_id})
+        return idx
+
+    def complete_goals(self, goal_ids):
+        # Sets their progress to 100%
+        goal_ids = [goal_id for goal_id in goal_ids if goal_id in self.goals.by_id]
+        if goal_ids:
+            self.goals.complete_many(goal_ids)
+            self.record_event({"op": "complete_goals", "ids": goal_ids})
+
+    def delete_goals(self, goal_ids):
+        goal_ids = [goal_id for goal_id in goal_ids if goal_id in self.goals.by_id]
+        if goal_ids:
+            self.goals.delete_many(goal_ids)
+            self.search.remove_many(("goal", goal_id) for goal_id in goal_ids)
+            self.record_event({"op": "delete_goals", "ids": goal_ids})
+
+    def archive_goals(self, goal_ids, archived=True):
+        goal_ids = [goal_id for goal_id in goal_ids if goal_id in self.goals.by_id]
+        if goal_ids:
+            self.goals.set_archived(goal_ids, archived)
+            if archived:
+                self.search.remove_many(("goal", goal_id) for goal_id in goal_ids)
+            else:
+                for goal_id in goal_ids:
+                    self.search.add(("goal", goal_id), self.goals.by_id[goal_id].goal)
+            self.record_event({"op": "archive_goals", "ids": goal_ids, "archived": archived})
+
+    def add_vision_item(self, image_path, description):
+        self.ensure_loaded("vision_board")
+        idx = self.vision_board.add(image_path, description)
+        self.index_vision_item(self.vision_board.items[idx])
+        self.record_event({"op": "add_vision_item", "image_path": image_path, "description": description})
+        return idx
+
+    def delete_vision_item(self, idx):
+        self.search.remove(("vision", id(self.vision_board.items[idx])))
+        self.vision_board.delete(idx)
+        self.record_event({"op": "delete_vision_item", "index": idx})
+
+    def delete_vision_items(self, indices):
+        indices = list(indices)
+        if indices:
+            self.search.remove_many([("vision", id(self.vision_board.items[idx])) for idx in indices])
+            self.vision_board.delete_many(indices)
+            self.record_event({"op": "delete_vision_items", "indices": indices})
+
+    def archive_vision_items(self, indices, archived=True):
+        indices = list(indices)
+        if indices:
+            self.vision_board.set_archived(indices, archived)
+            if archived:
+                self.search.remove_many(("vision", id(self.vision_board.items[idx])) for idx in indices)
+            else:
+                for idx in indices:
+                    self.index_vision_item(self.vision_board.items[idx])
+            self.record_event({"op": "archive_vision_items", "indices": indices, "archived": archived})
@@ -0,0 +1,844 @@
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .migrations import DATA_VERSION, apply_legacy_event, upgrade
+from .rollups import add_to_day_buckets, split_by_day
+from .streaks import rebuild_habit, update_habits
+from .writer import BackgroundWriter
+
+
+def apply_event(data, event):
+    categories = data.setdefault("categories", {})
+    activities = data.setdefault("activities", {})
+    tasks = data.setdefault("tasks", {})
+    goals = data.setdefault("goals", {})
+    vision_board = data.setdefault("vision_board", [])
+    rollups = data.setdefault("rollups", {})
+    habits = data.setdefault("habits", {})
+    data["version"] = DATA_VERSION
+    # ShardedStorage records {"op": "reserve_id", "id": ...} for IDs handed
+    # out in other shards; it changes nothing but next_id
+    if "id" in event:
+        data["next_id"] = max(data.get("next_id", 1), event["id"] + 1)
+
+    op = event["op"]
+    if op == "add_category":
+        categories[str(event["id"])] = {"name": event["name"]}
+    elif op == "delete_category":
+        categories.pop(str(event["id"]), None)
+        for key in [key for key, activity in activities.items() if activity["category"] == event["id"]]:
+            del activities[key]
+            rollups.pop(key, None)
+            habits.pop(key, None)
+    elif op == "add_activity":
+        activities[str(event["id"])] = {"category": event["category"], "name": event["name"], "total": 0, "goal": 3600, "sessions": 0, "milestones": [], "ladder": None}
+    elif op == "delete_activity":
+        activities.pop(str(event["id"]), None)
+        rollups.pop(str(event["id"]), None)
+        habits.pop(str(event["id"]), None)
+    elif op == "set_goal":
+        activities[str(event["activity"])]["goal"] = event["seconds"]
+    elif op == "start":
+        activities[str(event["activity"])]["sessions"] += 1
+    elif op == "stop":
+        activities[str(event["activity"])]["total"] += event["end"] - event["start"]
+        key = str(event["activity"])
+        add_to_day_buckets(rollups.setdefault(key, {}), event["start"], event["end"])
+        update_habits(habits, key, [(event["start"], event["end"])], lambda: rollups[key])
+    elif op == "import_sessions":
+        # A batch of [activity_id, start, end] sessions, each counted like a start and stop
+        by_activity = {}
+        for activity_id, start, end in event["sessions"]:
+            activity = activities[str(activity_id)]
+            activity["sessions"] += 1
+            activity["total"] += end - start
+            add_to_day_buckets(rollups.setdefault(str(activity_id), {}), start, end)
+            by_activity.setdefault(str(activity_id), []).append((start, end))
+        for key, sessions in by_activity.items():
+            update_habits(habits, key, sessions, lambda: rollups[key])
+    elif op == "milestone":
+        activities[str(event["activity"])]["milestones"].append(event["milestone"])
+    elif op == "set_milestone_ladder":
+        activities[str(event["activity"])]["ladder"] = event["hours"]
+    elif op == "add_task":
+        tasks[str(event["id"])] = {"task": event["task"], "completed": False}
+    elif op == "complete_task":
+        tasks[str(event["id"])]["completed"] = True
+    elif op == "delete_task":
+        del tasks[str(event["id"])]
+    elif op == "add_goal":
+        goals[str(event["id"])] = {"goal": event["goal"], "progress": 0}
+    elif op == "set_goal_progress":
+        goals[str(event["id"])]["progress"] = event["progress"]
+    elif op == "delete_goal":
+        del goals[str(event["id"])]
+    elif op == "add_vision_item":
+        vision_board.append({"image_path": event["image_path"], "description": event["description"]})
+    elif op == "delete_vision_item":
+        del vision_board[event["index"]]
+    elif op == "complete_tasks":
+        for task_id in event["ids"]:
+            tasks[str(task_id)]["completed"] = True
+    elif op == "delete_tasks":
+        for task_id in event["ids"]:
+            del tasks[str(task_id)]
+    elif op == "archive_tasks":
+        for task_id in event["ids"]:
+            tasks[str(task_id)]["archived"] = event["archived"]
+    elif op == "complete_goals":
+        for goal_id in event["ids"]:
+            goals[str(goal_id)]["progress"] = 100
+    elif op == "delete_goals":
+        for goal_id in event["ids"]:
+            del goals[str(goal_id)]
+    elif op == "archive_goals":
+        for goal_id in event["ids"]:
+            goals[str(goal_id)]["archived"] = event["archived"]
+    elif op == "delete_vision_items":
+        indices = set(event["indices"])
+        vision_board[:] = [item for idx, item in enumerate(vision_board) if idx not in indices]
+    elif op == "archive_vision_items":
+        for idx in event["indices"]:
+            vision_board[idx]["archived"] = event["archived"]
+    elif op == "batch":
+        # Everything recorded inside one GamifyModel.transaction()
+        for sub_event in event["events"]:
+            apply_event(data, sub_event)
+
+
+# The parts of the data that can be read after startup (see load_area), by the
+# events that change them; every other event changes the activities
+LAZY_AREAS = ("tasks", "goals", "vision_board")
+AREA_OPS = {
+    "tasks": {"add_task", "complete_task", "delete_task", "complete_tasks", "delete_tasks", "archive_tasks"},
+    "goals": {"add_goal", "set_goal_progress", "delete_goal", "complete_goals", "delete_goals", "archive_goals"},
+    "vision_board": {"add_vision_item", "delete_vision_item", "delete_vision_items", "archive_vision_items"},
+}
+
+
+def event_area(op):
+    for area, ops in AREA_OPS.items():
+        if op in ops:
+            return area
+    return "activities"
+
+
+class JsonStorage:
+    # Keeps everything in one file. Mutations are handed to a background writer
+    # that replays them into its own copy of the data and rewrites the file at
+    # most once per burst (see BackgroundWriter), so the UI thread never
+    # serializes or waits on the disk. Every write goes to a temp file that is
+    # fsynced and renamed over the old one, so a crash leaves either the old or
+    # the new file, never a truncated one.
+    session_history = False
+    lazy_areas = ()  # Everything comes back from load()
+
+    def __init__(self, path="timer_data.json", write_delay=0.5):
+        self.path = path
+        self.write_delay = write_delay
+        self.writer = None
+        self.shadow = {}
+
+    def data_files(self):
+        # Every file the data is kept in (see snapshot.data_fingerprint)
+        return [self.path]
+
+    def read_snapshot(self):
+        if os.path.exists(self.path):
+            with open(self.path, "r") as file:
+                return json.load(file)
+        return {}
+
+    def load(self):
+        data = upgrade(self.read_snapshot())
+        self.shadow = copy.deepcopy(data)
+        return data
+
+    def submit(self, event):
+        if self.writer is None:
+            self.writer = BackgroundWriter(self.write_events, self.write_delay)
+        self.writer.submit(event)
+
+    def record(self, event):
+        self.submit(event)
+
+    def write_events(self, events):
+        # Runs on the writer thread, the only one that touches self.shadow
+        for event in events:
+            apply_event(self.shadow, event)
+        self.write_snapshot(self.shadow)
+
+    def write_snapshot(self, data):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+
+    def flush(self):
+        if self.writer is not None:
+            self.writer.flush()
+
+    def save(self, data):
+        # Full snapshot of the in-memory state, written right away; used on exit
+        self.flush()
+        self.write_snapshot(data)
+
+    def activity_total(self, activity_id, since=None, until=None):
+        return self.activity_totals(since, until).get(activity_id, 0)
+
+    def activity_totals(self, since=None, until=None):
+        # Lifetime totals live on the activities themselves
+        raise ValueError("Time range totals need per-session records; use the sqlite storage")
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class JournalStorage(JsonStorage):
+    # Appends one line per mutation to a journal next to the snapshot. Once the
+    # journal passes compact_threshold bytes it is rotated and folded into a new
+    # snapshot on a background thread. Every record carries a sequence number and
+    # the snapshot remembers the last one it contains, so replaying a journal that
+    # was already compacted is harmless. Appends go through the background
+    # writer, which writes and fsyncs each burst of records in one go.
+    def __init__(self, path="timer_data.json", journal_path="timer_data.journal", compact_threshold=1024 * 1024, write_delay=0.5):
+        super().__init__(path, write_delay)
+        self.journal_path = journal_path
+        self.rotated_path = journal_path + ".old"
+        self.compact_threshold = compact_threshold
+        self.seq = 0
+        self.journal_file = None
+        self.journal_size = 0
+        self.compaction_thread = None
+
+    def load(self):
+        data = self.read_snapshot()
+        # A missing snapshot next to a journal, or one without a version, was
+        # written before entity IDs; so were the journal records that follow it
+        legacy = "version" not in data
+        self.seq = data.get("journal_seq", 0)
+        for path in (self.rotated_path, self.journal_path):
+            for event in self.read_journal(path):
+                if event["n"] > self.seq:
+                    (apply_legacy_event if legacy else apply_event)(data, event)
+                    self.seq = event["n"]
+        if legacy:
+            # Persist the upgrade before anything is journaled in the new format
+            data = upgrade(data)
+            self.write_snapshot(dict(data, journal_seq=self.seq))
+            self.remove_journals()
+        data.pop("journal_seq", None)
+        if os.path.exists(self.rotated_path):
+            self.start_compaction()
+        return data
+
+    def data_files(self):
+        return [self.path, self.rotated_path, self.journal_path]
+
+    def read_journal(self, path):
+        if not os.path.exists(path):
+            return
+        with open(path, "r") as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A crash mid-append leaves a torn last line; everything before it is intact
+                    break
+
+    def record(self, event):
+        self.seq += 1
+        self.submit(dict(event, n=self.seq))
+
+    def write_events(self, events):
+        # Runs on the writer thread, the only one that touches the journal file
+        # until flush() has returned
+        if self.journal_file is None:
+            self.journal_file = open(self.journal_path, "a")
+            self.journal_size = self.journal_file.tell()
+        lines = "".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events)
+        self.journal_file.write(lines)
+        self.journal_file.flush()
+        os.fsync(self.journal_file.fileno())
+        self.journal_size += len(lines)
+        if self.journal_size >= self.compact_threshold:
+            self.start_compaction()
+
+    def start_compaction(self):
+        if self.compaction_thread is not None and self.compaction_thread.is_alive():
+            return
+        if not os.path.exists(self.rotated_path) and os.path.exists(self.journal_path):
+            self.close_journal()
+            os.replace(self.journal_path, self.rotated_path)
+        self.compaction_thread = threading.Thread(target=self.compact, daemon=True)
+        self.compaction_thread.start()
+
+    def compact(self):
+        # Only touches the snapshot and the rotated journal, never live app state
+        data = self.read_snapshot()
+        seq = data.get("journal_seq", 0)
+        for event in self.read_journal(self.rotated_path):
+            if event["n"] > seq:
+                apply_event(data, event)
+                seq = event["n"]
+        data["journal_seq"] = seq
+        self.write_snapshot(data)
+        os.remove(self.rotated_path)
+
+    def save(self, data):
+        # Full snapshot of the in-memory state, used on exit; it supersedes both journals
+        self.flush()
+        if self.compaction_thread is not None:
+            self.compaction_thread.join()
+        self.close_journal()
+        self.write_snapshot(dict(data, journal_seq=self.seq))
+        self.remove_journals()
+
+    def remove_journals(self):
+        for path in (self.rotated_path, self.journal_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def close_journal(self):
+        if self.journal_file is not None:
+            self.journal_file.close()
+            self.journal_file = None
+            self.journal_size = 0
+
+    def close(self):
+        super().close()
+        if self.compaction_thread is not None:
+            self.compaction_thread.join()
+        self.close_journal()
+
+
+class SqliteStorage:
+    # Keeps every timed session as its own row so totals for any time range can
+    # be answered with an indexed aggregate query. Sessions that existed before
+    # the migration are stored as one row per activity starting at the epoch.
+    # Row IDs are the model's entity IDs.
+    session_history = True
+    lazy_areas = LAZY_AREAS
+    schema_version = 7
+    # Streak state per activity (see streaks.py) as JSON
+    habits_table = """
+        CREATE TABLE IF NOT EXISTS habits (
+            activity_id INTEGER PRIMARY KEY REFERENCES activities(id),
+            state TEXT NOT NULL
+        )
+    """
+    # Counters that can't be derived cheaply from the rows: next_id (IDs of
+    # deleted rows are never handed out again) and longest_session, which
+    # gives time range queries a lower bound on start for the index
+    meta_table = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value
+        ) WITHOUT ROWID
+    """
+
+    def __init__(self, path="timer_data.db", json_path="timer_data.json"):
+        self.path = path
+        self.json_path = json_path
+        is_new = not os.path.exists(path)
+        # The app loads on a worker thread and then hands the connection to the
+        # Tk thread; it is never used from two threads at once
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        # In WAL mode with synchronous=NORMAL a commit is an append to the log
+        # without an fsync, and the database stays consistent after a crash
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if not is_new:
+            self.upgrade_schema(version)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS categories (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS activities (
+                id INTEGER PRIMARY KEY,
+                category_id INTEGER NOT NULL REFERENCES categories(id),
+                name TEXT NOT NULL,
+                goal REAL NOT NULL DEFAULT 3600,
+                sessions INTEGER NOT NULL DEFAULT 0,
+                milestone_ladder TEXT,
+                UNIQUE (category_id, name)
+            );
+            CREATE TABLE IF NOT EXISTS sessions (
+                id INTEGER PRIMARY KEY,
+                activity_id INTEGER NOT NULL REFERENCES activities(id),
+                start REAL NOT NULL,
+                end REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS sessions_activity_start ON sessions (activity_id, start);
+            CREATE INDEX IF NOT EXISTS sessions_start ON sessions (start);
+            CREATE TABLE IF NOT EXISTS daily_rollups (
+                activity_id INTEGER NOT NULL REFERENCES activities(id),
+                day TEXT NOT NULL,
+                seconds REAL NOT NULL,
+                PRIMARY KEY (activity_id, day)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS milestones (
+                activity_id INTEGER NOT NULL REFERENCES activities(id),
+                milestone INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY,
+                task TEXT NOT NULL,
+                completed INTEGER NOT NULL DEFAULT 0,
+                archived INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS goals (
+                id INTEGER PRIMARY KEY,
+                goal TEXT NOT NULL,
+                progress INTEGER NOT NULL DEFAULT 0,
+                archived INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS vision_board (
+                id INTEGER PRIMARY KEY,
+                image_path TEXT NOT NULL,
+                description TEXT NOT NULL,
+                archived INTEGER NOT NULL DEFAULT 0
+            );
+        """)
+        self.conn.execute(self.habits_table)
+        self.conn.execute(self.meta_table)
+        if is_new:
+            with self.conn:
+                self.conn.execute("INSERT INTO meta VALUES ('next_id', 1), ('longest_session', 0)")
+        self.longest_session = self.conn.execute("SELECT value FROM meta WHERE key = 'longest_session'").fetchone()[0]
+        if version != self.schema_version:
+            # Only when it changes: opening an up-to-date database writes nothing
+            self.conn.execute(f"PRAGMA user_version = {self.schema_version}")
+        journal_path = os.path.splitext(json_path)[0] + ".journal" if json_path else None
+        if is_new and json_path and (os.path.exists(json_path) or os.path.exists(journal_path)):
+            self.migrate_from_json(JournalStorage(json_path, journal_path).load())
+
+    def upgrade_schema(self, version):
+        if version < 2:
+            self.upgrade_names_to_ids()
+        if version < 3:
+            with self.conn:
+                # JSON list of milestone hours; NULL uses the default ladder
+                self.conn.execute("ALTER TABLE activities ADD COLUMN milestone_ladder TEXT")
+        if version < 4:
+            with self.conn:
+                self.conn.execute(self.habits_table)
+                for (activity_id,) in self.conn.execute("SELECT DISTINCT activity_id FROM daily_rollups").fetchall():
+                    self.conn.execute("INSERT INTO habits VALUES (?, ?)", (activity_id, json.dumps(rebuild_habit(self.day_buckets(activity_id)))))
+        if version < 5:
+            with self.conn:
+                for table in ("tasks", "goals", "vision_board"):
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN archived INTEGER NOT NULL DEFAULT 0")
+        if version < 6:
+            # The best that can be done for IDs deleted before this version
+            with self.conn:
+                self.conn.execute(self.meta_table)
+                next_id = 1 + max(
+                    self.conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+                    for table in ("categories", "activities", "tasks", "goals")
+                )
+                self.conn.execute("INSERT INTO meta VALUES ('next_id', ?)", (next_id,))
+        if version < 7:
+            # The rows at the epoch stand for time from before the sessions
+            # table (see migrate_from_json) and end long before any real range
+            with self.conn:
+                longest = self.conn.execute("SELECT COALESCE(MAX(end - start), 0) FROM sessions WHERE start > 0").fetchone()[0]
+                self.conn.execute("INSERT INTO meta VALUES ('longest_session', ?)", (longest,))
+
+    def upgrade_names_to_ids(self):
+        # Version 1 kept goals, session counts and milestones keyed by bare
+        # activity name; copy them onto every activity with that name
+        with self.conn:
+            self.conn.execute("ALTER TABLE activities ADD COLUMN goal REAL NOT NULL DEFAULT 3600")
+            self.conn.execute("ALTER TABLE activities ADD COLUMN sessions INTEGER NOT NULL DEFAULT 0")
+            self.conn.execute("UPDATE activities SET goal = COALESCE((SELECT seconds FROM activity_goals WHERE activity = activities.name), 3600)")
+            self.conn.execute("UPDATE activities SET sessions = COALESCE((SELECT count FROM activity_sessions WHERE activity = activities.name), 0)")
+            self.conn.execute("""
+                CREATE TABLE milestones (
+                    activity_id INTEGER NOT NULL REFERENCES activities(id),
+                    milestone INTEGER NOT NULL
+                )
+            """)
+            self.conn.execute(
+                "INSERT INTO milestones SELECT a.id, m.milestone FROM milestones_reached m JOIN activities a ON a.name = m.activity ORDER BY m.rowid"
+            )
+            for table in ("activity_goals", "activity_sessions", "milestones_reached"):
+                self.conn.execute(f"DROP TABLE {table}")
+
+    def migrate_from_json(self, data):
+        with self.conn:
+            self.conn.execute("UPDATE meta SET value = ? WHERE key = 'next_id'", (data.get("next_id", 1),))
+            self.conn.executemany("INSERT INTO categories (id, name) VALUES (?, ?)", [(int(key), c["name"]) for key, c in data["categories"].items()])
+            for key, activity in data["activities"].items():
+                activity_id = int(key)
+                self.conn.execute(
+                    "INSERT INTO activities (id, category_id, name, goal, sessions, milestone_ladder) VALUES (?, ?, ?, ?, ?, ?)",
+                    (activity_id, activity["category"], activity["name"], activity["goal"], activity["sessions"], self.encode_ladder(activity.get("ladder")))
+                )
+                if activity["total"]:
+                    self.conn.execute("INSERT INTO sessions (activity_id, start, end) VALUES (?, 0, ?)", (activity_id, activity["total"]))
+                self.conn.executemany("INSERT INTO milestones VALUES (?, ?)", [(activity_id, milestone) for milestone in activity["milestones"]])
+                self.conn.executemany(
+                    "INSERT INTO daily_rollups VALUES (?, ?, ?)",
+                    [(activity_id, day, seconds) for day, seconds in data["rollups"].get(key, {}).items()]
+                )
+            self.conn.executemany("INSERT INTO habits VALUES (?, ?)", [(int(key), json.dumps(state)) for key, state in data.get("habits", {}).items()])
+            self.conn.executemany(
+                "INSERT INTO tasks VALUES (?, ?, ?, ?)",
+                [(int(key), t["task"], int(t["completed"]), int(t.get("archived", False))) for key, t in data["tasks"].items()]
+            )
+            self.conn.executemany(
+                "INSERT INTO goals VALUES (?, ?, ?, ?)",
+                [(int(key), g["goal"], g["progress"], int(g.get("archived", False))) for key, g in data["goals"].items()]
+            )
+            self.conn.executemany(
+                "INSERT INTO vision_board (image_path, description, archived) VALUES (?, ?, ?)",
+                [(v["image_path"], v["description"], int(v.get("archived", False))) for v in data["vision_board"]]
+            )
+
+    def encode_ladder(self, hours):
+        return json.dumps(hours) if hours is not None else None
+
+    def row_id(self, table, index):
+        return self.conn.execute(f"SELECT id FROM {table} ORDER BY id LIMIT 1 OFFSET ?", (index,)).fetchone()[0]
+
+    def row_ids(self, table):
+        # Row IDs in list order, for events that address many rows by index
+        return [row[0] for row in self.conn.execute(f"SELECT id FROM {table} ORDER BY id")]
+
+    def delete_activity_rows(self, where, params):
+        activity_ids = [(row[0],) for row in self.conn.execute(f"SELECT id FROM activities WHERE {where}", params)]
+        for table in ("sessions", "daily_rollups", "milestones", "habits"):
+            self.conn.executemany(f"DELETE FROM {table} WHERE activity_id = ?", activity_ids)
+        self.conn.executemany("DELETE FROM activities WHERE id = ?", activity_ids)
+
+    def data_files(self):
+        # Commits since the last checkpoint are only in the write-ahead log
+        return [self.path, self.path + "-wal"]
+
+    def load(self):
+        categories = {str(category_id): {"name": name} for category_id, name in self.conn.execute("SELECT id, name FROM categories ORDER BY id")}
+        totals = self.activity_totals()
+        activities = {}
+        for activity_id, category_id, name, goal, sessions, ladder in self.conn.execute(
+            "SELECT id, category_id, name, goal, sessions, milestone_ladder FROM activities ORDER BY id"
+        ):
+            activities[str(activity_id)] = {
+                "category": category_id,
+                "name": name,
+                "total": totals.get(activity_id, 0),
+                "goal": goal,
+                "sessions": sessions,
+                "milestones": [],
+                "ladder": json.loads(ladder) if ladder is not None else None,
+            }
+        for activity_id, milestone in self.conn.execute("SELECT activity_id, milestone FROM milestones ORDER BY rowid"):
+            activities[str(activity_id)]["milestones"].append(milestone)
+        rollups = {}
+        for activity_id, day, seconds in self.conn.execute("SELECT activity_id, day, seconds FROM daily_rollups"):
+            rollups.setdefault(str(activity_id), {})[day] = seconds
+        next_id = self.conn.execute("SELECT value FROM meta WHERE key = 'next_id'").fetchone()[0]
+        # Tasks, goals and the vision board are read by load_area when first needed
+        return {
+            "version": DATA_VERSION,
+            "next_id": next_id,
+            "categories": categories,
+            "activities": activities,
+            "rollups": rollups,
+            "habits": {str(activity_id): json.loads(state) for activity_id, state in self.conn.execute("SELECT activity_id, state FROM habits")},
+        }
+
+    def load_area(self, area):
+        if area == "tasks":
+            return {"tasks": {
+                str(task_id): {"task": task, "completed": bool(completed), "archived": bool(archived)}
+                for task_id, task, completed, archived in self.conn.execute("SELECT id, task, completed, archived FROM tasks ORDER BY id")
+            }}
+        if area == "goals":
+            return {"goals": {
+                str(goal_id): {"goal": goal, "progress": progress, "archived": bool(archived)}
+                for goal_id, goal, progress, archived in self.conn.execute("SELECT id, goal, progress, archived FROM goals ORDER BY id")
+            }}
+        return {"vision_board": [
+            {"image_path": image_path, "description": description, "archived": bool(archived)}
+            for image_path, description, archived in self.conn.execute("SELECT image_path, description, archived FROM vision_board ORDER BY id")
+        ]}
+
+    def record(self, event):
+        with self.conn:
+            self.write_event(event)
+
+    def write_event(self, event):
+        op = event["op"]
+        if "id" in event and op.startswith("add_"):
+            self.conn.execute("UPDATE meta SET value = MAX(value, ?) WHERE key = 'next_id'", (event["id"] + 1,))
+        if op == "batch":
+            for sub_event in event["events"]:
+                self.write_event(sub_event)
+        elif op == "add_category":
+            self.conn.execute("INSERT INTO categories (id, name) VALUES (?, ?)", (event["id"], event["name"]))
+        elif op == "delete_category":
+            self.delete_activity_rows("category_id = ?", (event["id"],))
+            self.conn.execute("DELETE FROM categories WHERE id = ?", (event["id"],))
+        elif op == "add_activity":
+            self.conn.execute("INSERT INTO activities (id, category_id, name) VALUES (?, ?, ?)", (event["id"], event["category"], event["name"]))
+        elif op == "delete_activity":
+            self.delete_activity_rows("id = ?", (event["id"],))
+        elif op == "set_goal":
+            self.conn.execute("UPDATE activities SET goal = ? WHERE id = ?", (event["seconds"], event["activity"]))
+        elif op == "start":
+            self.conn.execute("UPDATE activities SET sessions = sessions + 1 WHERE id = ?", (event["activity"],))
+        elif op == "stop":
+            self.conn.execute("INSERT INTO sessions (activity_id, start, end) VALUES (?, ?, ?)", (event["activity"], event["start"], event["end"]))
+            self.note_longest(event["end"] - event["start"])
+            self.conn.executemany(
+                "INSERT INTO daily_rollups VALUES (?, ?, ?) ON CONFLICT (activity_id, day) DO UPDATE SET seconds = seconds + excluded.seconds",
+                [(event["activity"], day.isoformat(), seconds) for day, seconds in split_by_day(event["start"], event["end"])]
+            )
+            self.update_habit_rows({event["activity"]: [(event["start"], event["end"])]})
+        elif op == "import_sessions":
+            self.conn.executemany("INSERT INTO sessions (activity_id, start, end) VALUES (?, ?, ?)", event["sessions"])
+            self.note_longest(max((end - start for _, start, end in event["sessions"]), default=0))
+            counts = {}
+            days = {}
+            for activity_id, start, end in event["sessions"]:
+                counts[activity_id] = counts.get(activity_id, 0) + 1
+                for day, seconds in split_by_day(start, end):
+                    key = (activity_id, day.isoformat())
+                    days[key] = days.get(key, 0) + seconds
+            self.conn.executemany("UPDATE activities SET sessions = sessions + ? WHERE id = ?", [(n, activity_id) for activity_id, n in counts.items()])
+            self.conn.executemany(
+                "INSERT INTO daily_rollups VALUES (?, ?, ?) ON CONFLICT (activity_id, day) DO UPDATE SET seconds = seconds + excluded.seconds",
+                [(activity_id, day, seconds) for (activity_id, day), seconds in days.items()]
+            )
+            by_activity = {}
+            for activity_id, start, end in event["sessions"]:
+                by_activity.setdefault(activity_id, []).append((start, end))
+            self.update_habit_rows(by_activity)
+        elif op == "milestone":
+            self.conn.execute("INSERT INTO milestones VALUES (?, ?)", (event["activity"], event["milestone"]))
+        elif op == "set_milestone_ladder":
+            self.conn.execute("UPDATE activities SET milestone_ladder = ? WHERE id = ?", (self.encode_ladder(event["hours"]), event["activity"]))
+        elif op == "add_task":
+            self.conn.execute("INSERT INTO tasks (id, task) VALUES (?, ?)", (event["id"], event["task"]))
+        elif op == "complete_task":
+            self.conn.execute("UPDATE tasks SET completed = 1 WHERE id = ?", (event["id"],))
+        elif op == "delete_task":
+            self.conn.execute("DELETE FROM tasks WHERE id = ?", (event["id"],))
+        elif op == "add_goal":
+            self.conn.execute("INSERT INTO goals (id, goal) VALUES (?, ?)", (event["id"], event["goal"]))
+        elif op == "set_goal_progress":
+            self.conn.execute("UPDATE goals SET progress = ? WHERE id = ?", (event["progress"], event["id"]))
+        elif op == "delete_goal":
+            self.conn.execute("DELETE FROM goals WHERE id = ?", (event["id"],))
+        elif op == "add_vision_item":
+            self.conn.execute("INSERT INTO vision_board (image_path, description) VALUES (?, ?)", (event["image_path"], event["description"]))
+        elif op == "delete_vision_item":
+            self.conn.execute("DELETE FROM vision_board WHERE id = ?", (self.row_id("vision_board", event["index"]),))
+        elif op == "complete_tasks":
+            self.conn.executemany("UPDATE tasks SET completed = 1 WHERE id = ?", [(task_id,) for task_id in event["ids"]])
+        elif op == "delete_tasks":
+            self.conn.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in event["ids"]])
+        elif op == "archive_tasks":
+            self.conn.executemany("UPDATE tasks SET archived = ? WHERE id = ?", [(int(event["archived"]), task_id) for task_id in event["ids"]])
+        elif op == "complete_goals":
+            self.conn.executemany("UPDATE goals SET progress = 100 WHERE id = ?", [(goal_id,) for goal_id in event["ids"]])
+        elif op == "delete_goals":
+            self.conn.executemany("DELETE FROM goals WHERE id = ?", [(goal_id,) for goal_id in event["ids"]])
+        elif op == "archive_goals":
+            self.conn.executemany("UPDATE goals SET archived = ? WHERE id = ?", [(int(event["archived"]), goal_id) for goal_id in event["ids"]])
+        elif op == "delete_vision_items":
+            row_ids = self.row_ids("vision_board")
+            self.conn.executemany("DELETE FROM vision_board WHERE id = ?", [(row_ids[idx],) for idx in event["indices"]])
+        elif op == "archive_vision_items":
+            row_ids = self.row_ids("vision_board")
+            self.conn.executemany("UPDATE vision_board SET archived = ? WHERE id = ?", [(int(event["archived"]), row_ids[idx]) for idx in event["indices"]])
+
+    def flush(self):
+        pass  # Nothing is buffered
+
+    def save(self, data):
+        # Every event is committed as it happens
+        self.conn.commit()
+
+    def note_longest(self, seconds):
+        if seconds > self.longest_session:
+            self.longest_session = seconds
+            self.conn.execute("UPDATE meta SET value = ? WHERE key = 'longest_session'", (seconds,))
+
+    def day_buckets(self, activity_id):
+        return dict(self.conn.execute("SELECT day, seconds FROM daily_rollups WHERE activity_id = ?", (activity_id,)))
+
+    def update_habit_rows(self, sessions_by_activity):
+        # Runs after the sessions' daily rollups are written
+        habits = {}
+        for activity_id, sessions in sessions_by_activity.items():
+            row = self.conn.execute("SELECT state FROM habits WHERE activity_id = ?", (activity_id,)).fetchone()
+            if row is not None:
+                habits[activity_id] = json.loads(row[0])
+            update_habits(habits, activity_id, sessions, lambda: self.day_buckets(activity_id))
+        self.conn.executemany("INSERT OR REPLACE INTO habits VALUES (?, ?)", [(activity_id, json.dumps(state)) for activity_id, state in habits.items()])
+
+    def has_session(self, activity_id, start, end):
+        return self.conn.execute(
+            "SELECT 1 FROM sessions WHERE activity_id = ? AND start = ? AND end = ? LIMIT 1", (activity_id, start, end)
+        ).fetchone() is not None
+
+    def iter_sessions(self):
+        # (activity_id, start, end) for every session in start order, streamed from the cursor
+        return self.conn.execute("SELECT activity_id, start, end FROM sessions ORDER BY start")
+
+    def activity_total(self, activity_id, since=None, until=None):
+        if since is None and until is None:
+            row = self.conn.execute("SELECT SUM(end - start) FROM sessions WHERE activity_id = ?", (activity_id,)).fetchone()
+        else:
+            since = since if since is not None else 0
+            until = until if until is not None else time.time()
+            # A session that ends after `since` started at most longest_session before it
+            row = self.conn.execute(
+                "SELECT SUM(MIN(end, ?) - MAX(start, ?)) FROM sessions WHERE activity_id = ? AND start >= ? AND start < ? AND end > ?",
+                (until, since, activity_id, since - self.longest_session, until, since)
+            ).fetchone()
+        return row[0] or 0
+
+    def activity_totals(self, since=None, until=None):
+        if since is None and until is None:
+            rows = self.conn.execute("SELECT activity_id, SUM(end - start) FROM sessions GROUP BY activity_id")
+        else:
+            since = since if since is not None else 0
+            until = until if until is not None else time.time()
+            rows = self.conn.execute(
+                "SELECT activity_id, SUM(MIN(end, ?) - MAX(start, ?)) FROM sessions "
+                "WHERE start >= ? AND start < ? AND end > ? GROUP BY activity_id",
+                (until, since, since - self.longest_session, until, since)
+            )
+        return dict(rows)
+
+    def close(self):
+        self.conn.close()
+
+
+class ShardedStorage:
+    # Keeps each area of the data in its own journaled snapshot (see
+    # JournalStorage) in `directory`: activities.json with the categories,
+    # activities, rollups and streaks, then tasks.json, goals.json and
+    # vision_board.json. Only the activities are read by load(); the other
+    # areas are read by load_area the first time something needs them, so
+    # startup time and memory follow what is on screen rather than everything
+    # ever recorded. The activities shard keeps next_id for all areas, so new
+    # IDs are unique before the others are read. An existing single-file
+    # timer_data.json (and its journal) at `json_path` is split into shards the
+    # first time.
+    session_history = False
+    lazy_areas = LAZY_AREAS
+
+    def __init__(self, directory="", write_delay=0.5, json_path="timer_data.json"):
+        self.directory = directory
+        self.json_path = json_path
+        self.shards = {
+            area: JournalStorage(os.path.join(directory, f"{area}.json"), os.path.join(directory, f"{area}.journal"), write_delay=write_delay)
+            for area in ("activities",) + LAZY_AREAS
+        }
+        self.path = self.shards["activities"].path  # Files that belong with the data go next to it (see sync.py)
+        self.loaded = set()
+
+    def data_files(self):
+        # The dashboard only shows what is in the activities shard
+        return self.shards["activities"].data_files()
+
+    def load(self):
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        if not os.path.exists(self.path) and self.json_path:
+            journal_path = os.path.splitext(self.json_path)[0] + ".journal"
+            if os.path.exists(self.json_path) or os.path.exists(journal_path):
+                self.split(JournalStorage(self.json_path, journal_path))
+        data = self.load_shard("activities")
+        for area in LAZY_AREAS:
+            data.pop(area, None)
+        return data
+
+    def split(self, legacy):
+        data = legacy.load()
+        legacy.close()
+        for area, shard in self.shards.items():
+            shard.write_snapshot(dict(self.area_data(data, area), journal_seq=0))
+
+    def area_data(self, data, area):
+        if area == "activities":
+            return {key: value for key, value in data.items() if key not in LAZY_AREAS}
+        return {"version": DATA_VERSION, area: data[area]} if area in data else {"version": DATA_VERSION}
+
+    def load_shard(self, area):
+        # A shard has to be loaded before anything is journaled to it, since
+        # that is where its sequence numbers come from
+        self.loaded.add(area)
+        return self.shards[area].load()
+
+    def load_area(self, area):
+        return self.load_shard(area)
+
+    def record(self, event):
+        events = event["events"] if event["op"] == "batch" else [event]
+        by_area = {}
+        for sub_event in events:
+            by_area.setdefault(event_area(sub_event["op"]), []).append(sub_event)
+        for area, area_events in by_area.items():
+            if area not in self.loaded:
+                self.load_shard(area)
+            self.shards[area].record(area_events[0] if len(area_events) == 1 else {"op": "batch", "events": area_events})
+            # Only adds hand out IDs; edits of existing items stay in their own shard
+            ids = [sub_event["id"] for sub_event in area_events if "id" in sub_event and sub_event["op"].startswith("add_")]
+            if area != "activities" and ids:
+                self.shards["activities"].record({"op": "reserve_id", "id": max(ids)})
+
+    def flush(self):
+        for shard in self.shards.values():
+            shard.flush()
+
+    def save(self, data):
+        # Only the areas in `data`; the ones never loaded haven't changed
+        for area, shard in self.shards.items():
+            if area == "activities" or area in data:
+                shard.save(self.area_data(data, area))
+
+    def activity_total(self, activity_id, since=None, until=None):
+        return self.activity_totals(since, until).get(activity_id, 0)
+
+    def activity_totals(self, since=None, until=None):
+        raise ValueError("Time range totals need per-session records; use the sqlite storage")
+
+    def close(self):
+        for shard in self.shards.values():
+            shard.close()
+
+
+STORAGE_BACKENDS = {
+    "json": JsonStorage,
+    "journal": JournalStorage,
+    "sharded": ShardedStorage,
+    "sqlite": SqliteStorage,
+}
+
+
+def open_storage(settings, directory=""):
+    # `directory` holds the data of one profile (see profiles.py); "" is the working directory
+    backend = STORAGE_BACKENDS[settings["storage"]]
+    json_path = os.path.join(directory, "timer_data.json")
+    if backend is SqliteStorage:
+        return backend(os.path.join(directory, "timer_data.db"), json_path)  # Commits are already cheap in WAL mode
+    if backend is ShardedStorage:
+        return backend(directory, settings["write_delay"], json_path)
+    if backend is JournalStorage:
+        return backend(json_path, os.path.join(directory, "timer_data.journal"), write_delay=settings["write_delay"])
+    return backend(json_path, write_delay=settings["write_delay"])
@@ -0,0 +1,35 @@
+import os
+
+from .persistence import open_storage
+
+PROFILES_DIR = "profiles"
+
+
+def profile_path(settings, path):
+    # Where `path` (a data file or directory) is kept for the active profile.
+    # The default profile (None) keeps everything in the working directory.
+    name = settings.get("profile")
+    return os.path.join(PROFILES_DIR, name, path) if name else path
+
+
+def open_profile_storage(settings):
+    # Named profiles use the profile_storage backend in their own directory
+    name = settings.get("profile")
+    if not name:
+        return open_storage(settings)
+    return open_storage(dict(settings, storage=settings["profile_storage"]), os.path.join(PROFILES_DIR, name))
+
+
+def list_profiles():
+    if not os.path.isdir(PROFILES_DIR):
+        return []
+    return sorted(name for name in os.listdir(PROFILES_DIR) if os.path.isdir(os.path.join(PROFILES_DIR, name)))
+
+
+def create_profile(name):
+    # Returns the new profile's name, or None if it is empty, taken or not a plain file name
+    name = name.strip()
+    if not name or name.startswith(".") or os.sep in name or (os.altsep and os.altsep in name) or name in list_profiles():
+        return None
+    os.makedirs(os.path.join(PROFILES_DIR, name))
+    return name
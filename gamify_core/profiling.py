@@ -0,0 +1,129 @@
+import atexit
+import contextlib
+import functools
+import json
+import math
+import os
+import time
+from collections import deque
+
+
+class Histogram:
+    # The most recent `window` samples (in seconds) plus lifetime totals.
+    def __init__(self, window=1024):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q):
+        samples = sorted(self.samples)
+        if not samples:
+            return 0.0
+        return samples[max(math.ceil(q / 100 * len(samples)) - 1, 0)]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "max_ms": max(self.samples, default=0.0) * 1000,
+            "lifetime_max_ms": self.max * 1000,
+        }
+
+
+class Profiler:
+    # Opt-in timing of named hot paths. While disabled every helper hands back
+    # the wrapped function unchanged (or a shared no-op context), so
+    # instrumented code costs nothing in normal use.
+    def __init__(self, enabled=False, export_path="profile.json", window=1024):
+        self.enabled = enabled
+        self.export_path = export_path
+        self.window = window
+        self.histograms = {}
+        self.disabled_context = contextlib.nullcontext()
+        if enabled and export_path:
+            atexit.register(self.export)
+
+    @classmethod
+    def from_env(cls, var="GAMIFY_PROFILE"):
+        # GAMIFY_PROFILE=1 exports to profile.json on exit; any other value is
+        # taken as the path to export to.
+        value = os.environ.get(var, "")
+        if value in ("", "0"):
+            return cls()
+        return cls(enabled=True, export_path="profile.json" if value == "1" else value)
+
+    def record(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms.setdefault(name, Histogram(self.window))
+        histogram.add(seconds)
+
+    def timed(self, name):
+        if not self.enabled:
+            return self.disabled_context
+        return self.timer(name)
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def wrap(self, name, func):
+        if not self.enabled:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+        return wrapper
+
+    def profiled(self, name):
+        # Decorator form of wrap
+        return lambda func: self.wrap(name, func)
+
+    def scheduled(self, name, delay_ms, callback):
+        # For `after(delay_ms, ...)` callbacks: records how late the callback
+        # ran compared to when it was scheduled as "<name>.lag", and how long
+        # it took as "<name>".
+        if not self.enabled:
+            return callback
+        due = time.perf_counter() + delay_ms / 1000
+
+        @functools.wraps(callback)
+        def wrapper(*args):
+            start = time.perf_counter()
+            self.record(name + ".lag", max(start - due, 0.0))
+            try:
+                return callback(*args)
+            finally:
+                self.record(name, time.perf_counter() - start)
+        return wrapper
+
+    def summary(self):
+        return {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+
+    def export(self, path=None):
+        path = path or self.export_path
+        with open(path + ".tmp", "w") as file:
+            json.dump({"exported_at": time.time(), "window": self.window, "timings": self.summary()}, file, indent=2)
+        os.replace(path + ".tmp", path)
+        return path
+
+
+profiler = Profiler.from_env()
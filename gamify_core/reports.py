@@ -0,0 +1,207 @@
+import argparse
+import bisect
+import concurrent.futures
+import datetime
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+
+from .stats import TIERS, get_tier_indices
+
+RENDER_VERSION = 1  # Bump when the report layout changes, so cached reports are rendered again
+TITLES = {"week": "Weekly Report", "month": "Monthly Report"}
+
+
+def period_key(kind, day):
+    # The rollup bucket key of the week or month containing `day`
+    if kind == "week":
+        iso_year, iso_week, _ = day.isocalendar()
+        return f"{iso_year}-W{iso_week:02d}"
+    return day.strftime("%Y-%m")
+
+
+def period_bounds(kind, key):
+    # (first day, day after the last)
+    if kind == "week":
+        year, week = key.split("-W")
+        first = datetime.date.fromisocalendar(int(year), int(week), 1)
+        return first, first + datetime.timedelta(days=7)
+    year, month = (int(part) for part in key.split("-"))
+    return datetime.date(year, month, 1), datetime.date(year + month // 12, month % 12 + 1, 1)
+
+
+def year_periods(kind, year, today=None):
+    # Every week (ISO year) or month of `year` that has started by `today`
+    today = today or datetime.date.today()
+    if kind == "week":
+        weeks = datetime.date(year, 12, 28).isocalendar()[1]
+        keys = [f"{year}-W{week:02d}" for week in range(1, weeks + 1)]
+    else:
+        keys = [f"{year}-{month:02d}" for month in range(1, 13)]
+    return [key for key in keys if period_bounds(kind, key)[0] <= today]
+
+
+class ReportBuilder:
+    # Gathers what a report shows from the loaded model: time in the period
+    # comes from the rollups, and lifetime totals at the end of the period are
+    # the current totals minus the days after it (found with a prefix sum over
+    # each activity's sorted days, so a year of reports costs one pass).
+    def __init__(self, model):
+        self.model = model
+        self.days = {}
+        for activity_id, buckets in model.tracker.rollups.days.items():
+            days = sorted(buckets)
+            running = [0]
+            for day in days:
+                running.append(running[-1] + buckets[day])
+            self.days[activity_id] = (days, running)
+
+    def total_at(self, activity, end):
+        # Lifetime seconds before the day `end`
+        days, running = self.days.get(activity.id, ([], [0]))
+        later = running[-1] - running[bisect.bisect_left(days, end.isoformat())]
+        return max(activity.total - later, 0)
+
+    def data(self, kind, key):
+        tracker = self.model.tracker
+        first, end = period_bounds(kind, key)
+        categories = []
+        for category in tracker.categories.values():
+            activities = []
+            for activity_id in category.activity_ids:
+                activity = tracker.activities[activity_id]
+                seconds = tracker.rollups.periods[kind].get(activity_id, {}).get(key, 0)
+                total = self.total_at(activity, end)
+                _, tier, color = TIERS[int(get_tier_indices(total))]
+                activities.append({
+                    "name": activity.display_name,
+                    "seconds": round(seconds, 3),
+                    "progress": total / activity.goal * 100 if activity.goal > 0 else 0,
+                    "tier": tier,
+                    "tier_color": color,
+                    "milestones": [m for m in self.model.milestones.ladder_for(activity) if total - seconds < m * 3600 <= total],
+                })
+            categories.append({"name": category.name.capitalize(), "activities": activities})
+        return {
+            "title": f"{TITLES[kind]} {key}",
+            "first_day": first.isoformat(),
+            "last_day": (end - datetime.timedelta(days=1)).isoformat(),
+            "categories": categories,
+        }
+
+
+def report_digest(report, fmt):
+    text = json.dumps([RENDER_VERSION, fmt, report], sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def render_report(report, path, fmt):
+    # Runs in a worker process
+    import matplotlib
+    matplotlib.use("Agg")
+    from .charts import build_report_figure
+
+    figure = build_report_figure(report)
+    figure.savefig(path + ".tmp", format=fmt, dpi=100)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+class ReportGenerator:
+    # Renders weekly and monthly PNG/PDF reports into `output_dir` with a pool
+    # of worker processes, so neither matplotlib nor the rendering runs on the
+    # Tk thread. index.json in the output directory remembers a digest of the
+    # data each report was rendered from; a period whose data hasn't changed
+    # since is skipped. Workers are spawned rather than forked, since the app
+    # has threads of its own.
+    def __init__(self, output_dir="reports", workers=None):
+        self.output_dir = output_dir
+        self.workers = workers
+        self.executor = None
+        self.index_path = os.path.join(output_dir, "index.json")
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r") as file:
+                self.index = json.load(file)
+
+    def start(self, model, kind, keys, formats=("png",)):
+        # Call on the model's thread. Returns (futures for the reports being
+        # rendered, number of reports already up to date).
+        os.makedirs(self.output_dir, exist_ok=True)
+        builder = ReportBuilder(model)
+        futures = []
+        up_to_date = 0
+        for key in keys:
+            report = builder.data(kind, key)
+            for fmt in formats:
+                name = f"{kind}-{key}.{fmt}"
+                path = os.path.join(self.output_dir, name)
+                digest = report_digest(report, fmt)
+                if self.index.get(name) == digest and os.path.exists(path):
+                    up_to_date += 1
+                    continue
+                if self.executor is None:
+                    self.executor = concurrent.futures.ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+                future = self.executor.submit(render_report, report, path, fmt)
+                future.report_name = name
+                future.digest = digest
+                futures.append(future)
+        return futures, up_to_date
+
+    def finish(self, futures):
+        # Call on the same thread once the futures are done: records the
+        # reports that rendered and returns the errors of those that didn't
+        errors = []
+        for future in futures:
+            try:
+                future.result()
+            except (OSError, ValueError, RuntimeError) as error:
+                errors.append(f"{future.report_name}: {error}")
+                continue
+            self.index[future.report_name] = future.digest
+        with open(self.index_path + ".tmp", "w") as file:
+            json.dump(self.index, file, indent=1)
+        os.replace(self.index_path + ".tmp", self.index_path)
+        return errors
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+def main():
+    from .model import GamifyModel
+    from .profiles import profile_path
+    from .settings import load_settings
+
+    parser = argparse.ArgumentParser(description="Render Gamify Your Life progress reports for a whole year (unchanged periods are skipped)")
+    parser.add_argument("--period", choices=["week", "month"], default="week")
+    parser.add_argument("--year", type=int, default=datetime.date.today().year)
+    parser.add_argument("--format", nargs="+", choices=["png", "pdf"], default=["png"])
+    parser.add_argument("--output", default=None, help="default: reports_dir from settings.json, in the profile's directory")
+    parser.add_argument("--workers", type=int, help="default: one per CPU")
+    args = parser.parse_args()
+
+    settings = load_settings()
+    settings["sync_dir"] = None  # Rendering reports must not send anything to the shared folder
+    model = GamifyModel(settings=settings)
+    model.load()
+    model.close()  # Nothing is written
+    generator = ReportGenerator(args.output or profile_path(model.settings, model.settings["reports_dir"]), args.workers)
+    started = time.perf_counter()
+    try:
+        futures, up_to_date = generator.start(model, args.period, year_periods(args.period, args.year), args.format)
+        concurrent.futures.wait(futures)
+        errors = generator.finish(futures)
+    finally:
+        generator.close()
+    print(f"Rendered {len(futures) - len(errors)} reports, {up_to_date} up to date, in {time.perf_counter() - started:.1f}s -> {generator.output_dir}")
+    for error in errors:
+        print(f"  {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import datetime
+
+
+def split_by_day(start, end):
+    # Yields (date, seconds) for each local calendar day the session touches
+    while start < end:
+        day = datetime.date.fromtimestamp(start)
+        next_midnight = datetime.datetime.combine(day + datetime.timedelta(days=1), datetime.time()).timestamp()
+        chunk_end = min(end, next_midnight)
+        yield day, chunk_end - start
+        start = chunk_end
+
+
+def add_to_day_buckets(buckets, start, end):
+    for day, seconds in split_by_day(start, end):
+        key = day.isoformat()
+        buckets[key] = buckets.get(key, 0) + seconds
+
+
+class Rollups:
+    # Pre-aggregated time per activity ID. Day buckets (persisted as "rollups")
+    # are the source of truth; week, month and year buckets are derived from
+    # them on load and then kept up to date alongside, so no view ever has to
+    # rescan sessions.
+    def __init__(self, days):
+        self.days = days
+        self.periods = {"week": {}, "month": {}, "year": {}}
+        for activity_id, buckets in days.items():
+            for day, seconds in buckets.items():
+                self.add_to_periods(activity_id, datetime.date.fromisoformat(day), seconds)
+
+    def add_to_periods(self, activity_id, day, seconds):
+        iso_year, iso_week, _ = day.isocalendar()
+        keys = {"week": f"{iso_year}-W{iso_week:02d}", "month": day.strftime("%Y-%m"), "year": str(day.year)}
+        for level, key in keys.items():
+            buckets = self.periods[level].setdefault(activity_id, {})
+            buckets[key] = buckets.get(key, 0) + seconds
+
+    def add_session(self, activity_id, start, end):
+        buckets = self.days.setdefault(activity_id, {})
+        for day, seconds in split_by_day(start, end):
+            key = day.isoformat()
+            buckets[key] = buckets.get(key, 0) + seconds
+            self.add_to_periods(activity_id, day, seconds)
+
+    def remove(self, activity_ids):
+        for levels in (self.days, *self.periods.values()):
+            for activity_id in activity_ids:
+                levels.pop(activity_id, None)
+
+    def series(self, level, activity_ids=None):
+        # Buckets summed over the given activities (all of them by default)
+        source = self.days if level == "day" else self.periods[level]
+        if activity_ids is None:
+            activity_ids = source.keys()
+        result = {}
+        for activity_id in activity_ids:
+            for key, seconds in source.get(activity_id, {}).items():
+                result[key] = result.get(key, 0) + seconds
+        return result
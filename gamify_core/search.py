@@ -0,0 +1,115 @@
+import bisect
+import heapq
+import math
+import re
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return [token.casefold() for token in TOKEN_PATTERN.findall(text)]
+
+
+class SearchIndex:
+    # In-memory inverted index for the search bar. Documents are keyed by
+    # (kind, key), e.g. ("task", 42), and carry a title to show. Every query
+    # token is matched as a prefix of the indexed tokens using a sorted
+    # vocabulary, so results update as the user types; a document has to match
+    # all query tokens. Adding and removing a document only touches its own
+    # tokens.
+    def __init__(self):
+        self.postings = {}  # token -> {doc: occurrences}
+        self.vocabulary = []  # Sorted tokens, for prefix ranges
+        self.docs = {}  # doc -> (title, tokens)
+        self.norms = {}  # doc -> 1 / sqrt(token count), so shorter documents rank first among equal matches
+
+    def add(self, doc, title, text=None):
+        if doc in self.docs:
+            self.remove(doc)
+        tokens = tokenize(text if text is not None else title)
+        self.docs[doc] = (title, tokens)
+        self.norms[doc] = 1 / math.sqrt(len(tokens) or 1)
+        for token in tokens:
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = {}
+                bisect.insort(self.vocabulary, token)
+            posting[doc] = posting.get(doc, 0) + 1
+
+    def remove(self, doc):
+        entry = self.docs.pop(doc, None)
+        if entry is None:
+            return
+        del self.norms[doc]
+        for token in set(entry[1]):
+            posting = self.postings[token]
+            del posting[doc]
+            if not posting:
+                del self.postings[token]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+
+    def remove_many(self, docs):
+        # Like remove() for each, but the vocabulary is rebuilt once at the end
+        # instead of shifting it for every token that disappears
+        emptied = False
+        for doc in docs:
+            entry = self.docs.pop(doc, None)
+            if entry is None:
+                continue
+            del self.norms[doc]
+            for token in set(entry[1]):
+                posting = self.postings[token]
+                del posting[doc]
+                if not posting:
+                    del self.postings[token]
+                    emptied = True
+        if emptied:
+            self.vocabulary = [token for token in self.vocabulary if token in self.postings]
+
+    def clear(self):
+        self.postings = {}
+        self.vocabulary = []
+        self.docs = {}
+        self.norms = {}
+
+    def prefix_tokens(self, prefix):
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = bisect.bisect_left(self.vocabulary, prefix + "\U0010ffff")
+        return self.vocabulary[start:end]
+
+    def term_scores(self, term):
+        doc_count = len(self.docs)
+        scores = None
+        for token in self.prefix_tokens(term):
+            posting = self.postings[token]
+            weight = math.log(1 + doc_count / len(posting)) * (2.0 if token == term else 1.0)
+            if scores is None:
+                scores = {doc: weight * occurrences for doc, occurrences in posting.items()}
+            else:
+                get = scores.get
+                for doc, occurrences in posting.items():
+                    scores[doc] = get(doc, 0.0) + weight * occurrences
+        return scores
+
+    def search(self, query, limit=20, kinds=None):
+        # Returns up to `limit` (doc, title) pairs, best first. Exact token
+        # matches count more than prefix matches and rarer tokens more than
+        # common ones.
+        terms = tokenize(query)
+        if not terms:
+            return []
+        per_term = []
+        for term in terms:
+            scores = self.term_scores(term)
+            if scores is None:
+                return []
+            per_term.append(scores)
+        per_term.sort(key=len)  # Intersect starting from the most selective term
+        candidates = per_term[0]
+        for scores in per_term[1:]:
+            candidates = {doc: score + scores[doc] for doc, score in candidates.items() if doc in scores}
+        if kinds is not None:
+            candidates = {doc: score for doc, score in candidates.items() if doc[0] in kinds}
+        norms = self.norms
+        ranked = heapq.nsmallest(limit, candidates, key=lambda doc: -candidates[doc] * norms[doc])
+        return [(doc, self.docs[doc][0]) for doc in ranked]
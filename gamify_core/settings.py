@@ -0,0 +1,19 @@
+import json
+import os
+
+
+def load_settings(path="settings.json"):
+    # control_socket (a path) or control_port turns on the local control API;
+    # charts is "canvas" (drawn with Tk) or "matplotlib" for the dashboard charts;
+    # reports_dir is where progress reports are saved; sync_dir is a shared
+    # folder to sync with other devices through (see gamify_core.sync);
+    # profile picks one of the profiles (see gamify_core.profiles) to start
+    # with, whose data is kept with the profile_storage backend
+    settings = {
+        "storage": "journal", "write_delay": 0.5, "control_socket": None, "control_port": None, "charts": "canvas",
+        "reports_dir": "reports", "sync_dir": None, "profile": None, "profile_storage": "sharded"
+    }
+    if os.path.exists(path):
+        with open(path, "r") as file:
+            settings.update(json.load(file))
+    return settings
@@ -0,0 +1,114 @@
+import json
+import os
+import time
+
+from .profiling import profiler
+
+SNAPSHOT_PATH = "dashboard_snapshot.png"
+
+
+def data_fingerprint(storage):
+    # Size and modification time of every file the data lives in, so any write
+    # to it (by the app, the transfer CLI or anything else) changes the result.
+    # Missing and empty files look the same: SQLite leaves an empty -wal file
+    # behind when it merely opens the database.
+    fingerprint = []
+    for path in storage.data_files():
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            stat = None
+        if stat is None or stat.st_size == 0:
+            fingerprint.append([path, None, None])
+        else:
+            fingerprint.append([path, stat.st_size, stat.st_mtime_ns])
+    return fingerprint
+
+
+def valid_snapshot(storage, appearance, path=SNAPSHOT_PATH):
+    # Returns `path` if the snapshot there was taken of the data as it is now,
+    # in the same appearance mode; otherwise removes it and returns None
+    try:
+        with open(path + ".json", "r") as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if meta.get("fingerprint") == data_fingerprint(storage) and meta.get("appearance") == appearance and os.path.exists(path):
+        return path
+    discard_snapshot(path)
+    return None
+
+
+def discard_snapshot(path=SNAPSHOT_PATH):
+    for file_path in (path + ".json", path):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+@profiler.profiled("snapshot.save")
+def save_snapshot(model, width, height, appearance, path=SNAPSHOT_PATH):
+    # Call once the storage is closed, so the fingerprint covers every write.
+    # The metadata goes last: a snapshot without it is never shown.
+    discard_snapshot(path)
+    render_dashboard(model, width, height, dark=appearance == "Dark").save(path + ".tmp", "PNG")
+    os.replace(path + ".tmp", path)
+    with open(path + ".json.tmp", "w") as file:
+        json.dump({"fingerprint": data_fingerprint(model.storage), "appearance": appearance, "taken": time.time()}, file)
+    os.replace(path + ".json.tmp", path + ".json")
+
+
+def render_dashboard(model, width, height, dark=False):
+    # A picture of the top of the dashboard (title and activity rows, laid out
+    # like the real widgets) to stand in for it while the app starts. It is
+    # taken on every exit, so it is drawn with PIL rather than matplotlib,
+    # which the canvas charts never import.
+    from PIL import Image, ImageDraw, ImageFont
+
+    if dark:
+        background, foreground, trough, fill = "#242424", "#dce4ee", "#4a4d50", "#1f6aa5"
+    else:
+        background, foreground, trough, fill = "#ebebeb", "#1a1a1a", "#939ba2", "#3b8ed0"
+    image = Image.new("RGB", (width, height), background)
+    draw = ImageDraw.Draw(image)
+    fonts = {}
+
+    def text(x, y, label, size, anchor="l"):
+        # x and y in pixels from the bottom left; size in points at 100 dpi
+        if size not in fonts:
+            fonts[size] = ImageFont.load_default(round(size * 100 / 72))
+        draw.text((x, height - y), label, fill=foreground, font=fonts[size], anchor=anchor + "m")
+
+    def bar(left, right, y, color):
+        draw.rectangle((left, height - y - 4, right, height - y + 4), fill=color)
+
+    tracker = model.tracker
+    text(width / 2, height - 25, "Gamify Your Life Dashboard", 18, "m")
+    y = height - 75
+    if not tracker.categories:
+        text(width / 2, y, "No categories available. Please add categories.", 14, "m")
+        return image
+
+    now = time.time()
+    bar_left, bar_right = 430, width - 210
+    for category in tracker.categories.values():
+        if y < 40:
+            break
+        text(width / 2, y, f"{category.name.capitalize()} Progress", 13, "m")
+        y -= 35
+        for activity_id in category.activity_ids:
+            if y < 15:
+                break
+            activity = tracker.activities[activity_id]
+            total_time = tracker.current_total(activity_id, now)
+            hours, rem = divmod(total_time, 3600)
+            minutes, seconds = divmod(rem, 60)
+            progress_percentage = (total_time / activity.goal) * 100 if activity.goal > 0 else 0
+            text(15, y, activity.name.capitalize(), 10)
+            text(140, y, f"{activity.display_name} Time: {int(hours)}h {int(minutes)}m {int(seconds)}s", 9)
+            if bar_right > bar_left:
+                bar(bar_left, bar_right, y, trough)
+                bar(bar_left, bar_left + (bar_right - bar_left) * min(progress_percentage / 100, 1), y, fill)
+            text(width - 200, y, f"{activity.display_name} Progress: {progress_percentage:.2f}%", 9)
+            y -= 32
+        y -= 10
+    return image
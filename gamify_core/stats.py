@@ -0,0 +1,78 @@
+import numpy as np
+
+
+TIERS = [
+    (0, "Noob", "red"),  # 0 hours
+    (360000, "Beginner", "blue"),  # 100 hours
+    (3600000, "Intermediate", "purple"),  # 1,000 hours
+    (36000000, "Pro", "orange"),  # 10,000 hours
+    (180000000, "Expert", "yellow"),  # 50,000 hours
+    (360000000, "Master", "green"),  # 100,000 hours
+]
+TIER_THRESHOLDS = np.array([threshold for threshold, _, _ in TIERS])
+
+
+def get_tier_indices(total_times):
+    return np.maximum(np.searchsorted(TIER_THRESHOLDS, total_times, side="right") - 1, 0)
+
+
+class StatsEngine:
+    # Columnar per-activity statistics: one array per metric with a row per
+    # activity ID. Single values are updated in place; adding or removing
+    # activities marks the engine stale so it is rebuilt on next use.
+    def __init__(self):
+        self.stale = True
+        self.keys = []
+        self.rows = {}
+        self.category_names = []
+        self.category_codes = np.zeros(0, dtype=np.intp)
+        self.totals = np.zeros(0)
+        self.sessions = np.zeros(0)
+        self.goals = np.zeros(0)
+
+    def rebuild(self, categories, activities):
+        self.keys = [activity_id for category in categories.values() for activity_id in category.activity_ids]
+        self.rows = {activity_id: row for row, activity_id in enumerate(self.keys)}
+        self.category_names = [category.name for category in categories.values()]
+        codes = {category_id: code for code, category_id in enumerate(categories)}
+        records = [activities[activity_id] for activity_id in self.keys]
+        self.category_codes = np.array([codes[activity.category_id] for activity in records], dtype=np.intp)
+        self.totals = np.array([activity.total for activity in records], dtype=float)
+        self.sessions = np.array([activity.sessions for activity in records], dtype=float)
+        self.goals = np.array([activity.goal for activity in records], dtype=float)
+        self.stale = False
+
+    def set_total(self, activity_id, total_time):
+        if not self.stale:
+            self.totals[self.rows[activity_id]] = total_time
+
+    def set_sessions(self, activity_id, sessions):
+        if not self.stale:
+            self.sessions[self.rows[activity_id]] = sessions
+
+    def set_goal(self, activity_id, goal_time):
+        if not self.stale:
+            self.goals[self.rows[activity_id]] = goal_time
+
+    def averages(self):
+        return np.divide(self.totals, self.sessions, out=np.zeros_like(self.totals), where=self.sessions > 0)
+
+    def goal_progress(self):
+        return np.divide(self.totals, self.goals, out=np.zeros_like(self.totals), where=self.goals > 0) * 100
+
+    def tier_indices(self):
+        return get_tier_indices(self.totals)
+
+    def category_sums(self, values):
+        return np.bincount(self.category_codes, weights=values, minlength=len(self.category_names))
+
+    def radar_values(self):
+        # Mean over categories of each category's hours, sessions, hours per session and goal progress
+        if not self.category_names:
+            return [0, 0, 0, 0]
+        hours = self.category_sums(self.totals) / 3600
+        sessions = self.category_sums(self.sessions)
+        goal_hours = self.category_sums(self.goals) / 3600
+        averages = np.divide(hours, sessions, out=np.zeros_like(hours), where=sessions > 0)
+        progress = np.divide(hours, goal_hours, out=np.zeros_like(hours), where=goal_hours > 0) * 100
+        return np.mean([hours, sessions, averages, progress], axis=1).tolist()
@@ -0,0 +1,84 @@
+import datetime
+
+from .rollups import split_by_day
+
+WINDOW = 30  # Days of history kept for the rolling averages and consistency
+
+
+def new_habit():
+    # `recent` holds [day ordinal, seconds] for the active days among the last
+    # WINDOW days up to `last_day`, oldest first
+    return {"last_day": None, "streak": 0, "longest": 0, "recent": []}
+
+
+def rebuild_habit(buckets):
+    # From an activity's day buckets ({"2024-01-31": seconds}); used for data
+    # from before streaks were tracked and for sessions added out of order
+    state = new_habit()
+    for day in sorted(buckets):
+        if buckets[day] > 0:
+            add_day(state, datetime.date.fromisoformat(day).toordinal(), buckets[day])
+    return state
+
+
+def add_day(state, ordinal, seconds):
+    # Only for days on or after last_day
+    last_day = state["last_day"]
+    recent = state["recent"]
+    if ordinal == last_day:
+        recent[-1][1] += seconds
+        return
+    state["streak"] = state["streak"] + 1 if last_day == ordinal - 1 else 1
+    state["longest"] = max(state["longest"], state["streak"])
+    state["last_day"] = ordinal
+    recent.append([ordinal, seconds])
+    while recent[0][0] <= ordinal - WINDOW:
+        del recent[0]
+
+
+def update_habits(habits, key, sessions, buckets):
+    # Folds finished (start, end) sessions into habits[key]. Sessions after the
+    # last active day are added in O(1) each; any that lands earlier (a backdated
+    # or imported session) rebuilds the state once from buckets(), which must
+    # already include the new sessions.
+    state = habits.get(key)
+    # Sorted by day, not by session: overlapping sessions can reach back
+    # before the end of an earlier one
+    days = sorted((day.toordinal(), seconds) for start, end in sessions for day, seconds in split_by_day(start, end))
+    if state is None or (state["last_day"] is not None and any(ordinal < state["last_day"] for ordinal, _ in days)):
+        habits[key] = rebuild_habit(buckets())
+        return
+    for ordinal, seconds in days:
+        add_day(state, ordinal, seconds)
+
+
+def habit_summary(state, today=None):
+    today = (today or datetime.date.today()).toordinal()
+    if state is None or state["last_day"] is None:
+        return {"streak": 0, "longest": 0, "avg_7": 0.0, "avg_30": 0.0, "consistency": 0.0}
+    last_7 = sum(seconds for ordinal, seconds in state["recent"] if today - 7 < ordinal <= today)
+    last_30 = [seconds for ordinal, seconds in state["recent"] if today - WINDOW < ordinal <= today]
+    return {
+        "streak": state["streak"] if state["last_day"] >= today - 1 else 0,  # Today may still come
+        "longest": state["longest"],
+        "avg_7": last_7 / 7,  # Seconds per day
+        "avg_30": sum(last_30) / WINDOW,
+        "consistency": len(last_30) / WINDOW * 100,  # Share of the last 30 days with any time
+    }
+
+
+class Habits:
+    # Streak and habit state per activity ID, kept up to date as sessions are
+    # recorded and persisted as "habits" so loading needs no recomputation.
+    def __init__(self, states):
+        self.states = states
+
+    def add_sessions(self, activity_id, sessions, buckets):
+        update_habits(self.states, activity_id, sessions, buckets)
+
+    def remove(self, activity_ids):
+        for activity_id in activity_ids:
+            self.states.pop(activity_id, None)
+
+    def summary(self, activity_id, today=None):
+        return habit_summary(self.states.get(activity_id), today)
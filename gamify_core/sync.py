@@ -0,0 +1,588 @@
+import argparse
+import json
+import os
+import sqlite3
+import time
+import uuid
+
+from .transfer import Importer, SessionIndex, check_session
+from .writer import BackgroundWriter
+
+
+def key(*parts):
+    return json.dumps(parts)
+
+
+def valid_sessions(rows):
+    # The [category, activity, start, end] rows of a "sessions" change that
+    # make sense; the others are dropped like corrupt lines
+    now = time.time()
+    sessions = []
+    for row in rows:
+        try:
+            category_name, activity_name, start, end = row
+            if not isinstance(category_name, str) or not isinstance(activity_name, str):
+                continue
+            start, end = float(start), float(end)
+            check_session(start, end, now)
+        except (TypeError, ValueError):
+            continue
+        sessions.append((category_name, activity_name, start, end))
+    return sessions
+
+
+def read_lines(path, offset=0):
+    # The complete lines after `offset` and the offset after the last of them;
+    # a line still being written (or copied in by a sync client) waits for the next read
+    if not os.path.exists(path):
+        return [], offset
+    with open(path, "rb") as file:
+        file.seek(offset)
+        chunk = file.read()
+    end = chunk.rfind(b"\n") + 1
+    deltas = []
+    for line in chunk[:end].splitlines():
+        try:
+            delta = json.loads(line)
+        except ValueError:
+            continue  # Corrupt; the lines around it are still good
+        if isinstance(delta, dict):
+            deltas.append(delta)
+    return deltas, offset + end
+
+
+class SyncState:
+    # What a device knows about the sync, in a small SQLite file next to the
+    # data, so that a sync only writes the rows it changes:
+    #  - offsets: how far each other device's file has been read
+    #  - uids: the uid of every task and goal, and its local ID
+    #  - stamps: when each "latest edit wins" field was last edited, and where
+    #  - deleted: what was deleted anywhere, so it doesn't come back
+    #  - parked: changes waiting for a task or goal that hasn't arrived yet
+    def __init__(self, path):
+        # Opened on the loader thread, then used on the Tk thread
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS offsets (device TEXT PRIMARY KEY, offset INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS uids (uid TEXT PRIMARY KEY, local_id INTEGER NOT NULL);
+            CREATE INDEX IF NOT EXISTS uids_local_id ON uids (local_id);
+            CREATE TABLE IF NOT EXISTS stamps (key TEXT PRIMARY KEY, t REAL NOT NULL, device TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS deleted (key TEXT PRIMARY KEY, t REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS parked (id INTEGER PRIMARY KEY, device TEXT NOT NULL, delta TEXT NOT NULL);
+        """)
+
+    def get(self, name, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row is not None else default
+
+    def set(self, name, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (name, json.dumps(value)))
+
+    def offset(self, device):
+        row = self.conn.execute("SELECT offset FROM offsets WHERE device = ?", (device,)).fetchone()
+        return row[0] if row is not None else 0
+
+    def set_offset(self, device, offset):
+        self.conn.execute("INSERT OR REPLACE INTO offsets VALUES (?, ?)", (device, offset))
+
+    def local_id(self, uid):
+        row = self.conn.execute("SELECT local_id FROM uids WHERE uid = ?", (uid,)).fetchone()
+        return row[0] if row is not None else None
+
+    def uid_of(self, local_id):
+        row = self.conn.execute("SELECT uid FROM uids WHERE local_id = ? ORDER BY rowid LIMIT 1", (local_id,)).fetchone()
+        return row[0] if row is not None else None
+
+    def add_uid(self, uid, local_id):
+        self.conn.execute("INSERT OR REPLACE INTO uids VALUES (?, ?)", (uid, local_id))
+
+    def newer(self, key, t, device):
+        # True (and remembered) if an edit at `t` on `device` is later than the last one of `key`
+        row = self.conn.execute("SELECT t, device FROM stamps WHERE key = ?", (key,)).fetchone()
+        if row is not None and (t, device) <= row:
+            return False
+        self.conn.execute("INSERT OR REPLACE INTO stamps VALUES (?, ?, ?)", (key, t, device))
+        return True
+
+    def is_deleted(self, key):
+        return self.conn.execute("SELECT 1 FROM deleted WHERE key = ?", (key,)).fetchone() is not None
+
+    def mark_deleted(self, key, t):
+        self.conn.execute("INSERT OR IGNORE INTO deleted VALUES (?, ?)", (key, t))
+
+    def parked(self):
+        # [(id, device, delta)]; they stay parked until unpark()
+        return [(row_id, device, json.loads(delta)) for row_id, device, delta in self.conn.execute("SELECT id, device, delta FROM parked ORDER BY id")]
+
+    def unpark(self, last_id):
+        self.conn.execute("DELETE FROM parked WHERE id <= ?", (last_id,))
+
+    def park(self, device, delta):
+        self.conn.execute("INSERT INTO parked (device, delta) VALUES (?, ?)", (device, json.dumps(delta)))
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+class FolderSync:
+    # Exchanges changes with the app on other devices through a shared folder
+    # (a synced directory or a USB drive). Each device appends its own changes
+    # to <folder>/<device>.ndjson and reads the other devices' files from where
+    # it stopped last time, so a sync costs time in proportion to what changed
+    # since the previous one, not to the history.
+    #
+    # Changes are recorded in terms every device understands: categories and
+    # activities by name (as transfer.py does), tasks and goals by the uid
+    # "<device>:<id>" they got on the device that created them, vision board
+    # items by image path and description. Merging:
+    #  - sessions from every device add up; ones already here are skipped
+    #  - completing is idempotent, and a deletion wins over concurrent edits
+    #  - goal hours, milestone ladders, goal progress and archiving: the
+    #    latest edit wins (by wall clock, ties broken by device)
+    # Until sync() is called, changes wait in a local outbox next to the data.
+    def __init__(self, model, folder, write_delay=0.5):
+        model.ensure_loaded()  # Changes from other devices can reach any area
+        self.model = model
+        self.folder = folder
+        data_dir = os.path.dirname(model.storage.path)
+        self.state = SyncState(os.path.join(data_dir, "sync_state.db"))
+        self.outbox_path = os.path.join(data_dir, "sync_outbox.ndjson")
+        self.device = self.state.get("device")
+        first_sync = self.device is None
+        if first_sync:
+            self.device = uuid.uuid4().hex[:12]
+            self.state.set("device", self.device)
+        outbox, _ = read_lines(self.outbox_path)
+        self.seq = max([self.state.get("pushed", 0)] + [delta["n"] for delta in outbox])
+        self.applying = False  # Changes that came from other devices aren't sent back
+        self.texts = None  # Text -> task or goal, while matching up a device's first sync
+        self.minted = False  # Set when a uid was given out that isn't committed yet
+
+        # Names and vision board keys as of the last recorded event, for the
+        # deletions: by the time those are recorded the items are gone
+        tracker = model.tracker
+        self.category_names = {category.id: category.name for category in tracker.categories.values()}
+        self.activity_names = {
+            activity.id: (self.category_names[activity.category_id], activity.name) for activity in tracker.activities.values()
+        }
+        self.vision_keys = [[item["image_path"], item["description"]] for item in model.vision_board.items]
+        self.writer = BackgroundWriter(self.write_outbox, write_delay)
+        if first_sync:
+            self.send_everything()
+        self.state.commit()
+
+    def uid(self, local_id):
+        # Tasks and goals made here get a random uid, not one built from their
+        # local ID, so a uid is never shared with an item deleted before
+        uid = self.state.uid_of(local_id)
+        if uid is None:
+            uid = f"{self.device}:{uuid.uuid4().hex}"
+            self.state.add_uid(uid, local_id)
+            self.minted = True
+        return uid
+
+    def local_id(self, uid):
+        return self.state.local_id(uid)
+
+    def send(self, delta, t=None):
+        self.seq += 1
+        self.writer.submit(dict(delta, n=self.seq, t=t if t is not None else time.time()))
+
+    def write_outbox(self, deltas):
+        # Runs on the writer thread
+        with open(self.outbox_path, "a") as file:
+            file.write("".join(json.dumps(delta, separators=(",", ":")) + "\n" for delta in deltas))
+            file.flush()
+            os.fsync(file.fileno())
+
+    def send_everything(self):
+        # The first time this device syncs, what it already has goes out as
+        # changes dated at the epoch, so any real edit elsewhere wins over them.
+        # Adds are marked "initial" so that a device holding a copy of the same
+        # data matches them up with its own items instead of duplicating them.
+        model = self.model
+        for category_name, activity_name in self.activity_names.values():
+            self.send({"op": "add_activity", "category": category_name, "activity": activity_name}, 0)
+        for category_id, category_name in self.category_names.items():
+            if not model.tracker.categories[category_id].activity_ids:
+                self.send({"op": "add_category", "category": category_name}, 0)
+        for activity in model.tracker.activities.values():
+            category_name, activity_name = self.activity_names[activity.id]
+            self.send({"op": "set_goal", "category": category_name, "activity": activity_name, "seconds": activity.goal}, 0)
+            if activity.ladder is not None:
+                self.send({"op": "set_ladder", "category": category_name, "activity": activity_name, "hours": activity.ladder}, 0)
+
+        # Without session history the sessions are made up from the day
+        # totals, the same way on every device; remembering them as imported
+        # keeps a copy of the same history from being counted twice
+        index = None if model.storage.session_history else SessionIndex(model.storage.path + ".imported")
+        sessions = []
+        for activity_id, start, end in model.iter_sessions():
+            sessions.append(list(self.activity_names[activity_id]) + [start, end])
+            if index is not None:
+                index.add(activity_id, start, end)
+            if len(sessions) == 10000:
+                self.send({"op": "sessions", "sessions": sessions}, 0)
+                sessions = []
+        if sessions:
+            self.send({"op": "sessions", "sessions": sessions}, 0)
+        if index is not None:
+            index.close()
+
+        for task in model.tasks.items:
+            uid = self.uid(task.id)
+            self.send({"op": "add_task", "uid": uid, "task": task.task, "initial": True}, 0)
+            if task.completed:
+                self.send({"op": "complete_tasks", "uids": [uid]}, 0)
+            if task.archived:
+                self.send({"op": "archive_tasks", "uids": [uid], "archived": True}, 0)
+        for goal in model.goals.items:
+            uid = self.uid(goal.id)
+            self.send({"op": "add_goal", "uid": uid, "goal": goal.goal, "initial": True}, 0)
+            if goal.progress:
+                self.send({"op": "set_progress", "uids": [uid], "progress": goal.progress}, 0)
+            if goal.archived:
+                self.send({"op": "archive_goals", "uids": [uid], "archived": True}, 0)
+        for item in model.vision_board.items:
+            self.send({"op": "add_vision_item", "image_path": item["image_path"], "description": item["description"]}, 0)
+            if item.get("archived", False):
+                self.send({"op": "archive_vision_items", "items": [[item["image_path"], item["description"]]], "archived": True}, 0)
+
+    def observe(self, event):
+        # Called by GamifyModel.record_event for every event it records
+        for sub_event in event["events"] if event["op"] == "batch" else [event]:
+            delta = self.portable(sub_event)
+            if delta is not None and not self.applying:
+                self.send(delta)
+        if self.minted and not self.applying:
+            # Before the adds that carry them can reach the outbox
+            self.state.commit()
+            self.minted = False
+
+    def portable(self, event):
+        # The change an event makes in the terms other devices understand, or
+        # None for the ones that aren't shared (starting a timer counts with
+        # the session it ends in; milestones are worked out on each device)
+        op = event["op"]
+        if op == "add_category":
+            self.category_names[event["id"]] = event["name"]
+            return {"op": "add_category", "category": event["name"]}
+        elif op == "delete_category":
+            name = self.category_names.pop(event["id"])
+            self.activity_names = {activity_id: names for activity_id, names in self.activity_names.items() if names[0] != name}
+            return {"op": "delete_category", "category": name}
+        elif op == "add_activity":
+            category_name, activity_name = self.activity_names[event["id"]] = (self.category_names[event["category"]], event["name"])
+            return {"op": "add_activity", "category": category_name, "activity": activity_name}
+        elif op == "delete_activity":
+            category_name, activity_name = self.activity_names.pop(event["id"])
+            return {"op": "delete_activity", "category": category_name, "activity": activity_name}
+        elif op == "set_goal":
+            category_name, activity_name = self.activity_names[event["activity"]]
+            return {"op": "set_goal", "category": category_name, "activity": activity_name, "seconds": event["seconds"]}
+        elif op == "set_milestone_ladder":
+            category_name, activity_name = self.activity_names[event["activity"]]
+            return {"op": "set_ladder", "category": category_name, "activity": activity_name, "hours": event["hours"]}
+        elif op == "stop":
+            return {"op": "sessions", "sessions": [list(self.activity_names[event["activity"]]) + [event["start"], event["end"]]]}
+        elif op == "import_sessions":
+            return {"op": "sessions", "sessions": [list(self.activity_names[activity_id]) + [start, end] for activity_id, start, end in event["sessions"]]}
+        elif op in ("add_task", "add_goal") and self.applying:
+            return None  # add_item maps the other device's uid to it
+        elif op == "add_task":
+            return {"op": "add_task", "uid": self.uid(event["id"]), "task": event["task"]}
+        elif op in ("complete_task", "delete_task"):
+            return {"op": op + "s", "uids": [self.uid(event["id"])]}
+        elif op in ("complete_tasks", "delete_tasks", "delete_goals"):
+            return {"op": op, "uids": [self.uid(item_id) for item_id in event["ids"]]}
+        elif op in ("archive_tasks", "archive_goals"):
+            return {"op": op, "uids": [self.uid(item_id) for item_id in event["ids"]], "archived": event["archived"]}
+        elif op == "add_goal":
+            return {"op": "add_goal", "uid": self.uid(event["id"]), "goal": event["goal"]}
+        elif op == "set_goal_progress":
+            return {"op": "set_progress", "uids": [self.uid(event["id"])], "progress": event["progress"]}
+        elif op == "complete_goals":
+            return {"op": "set_progress", "uids": [self.uid(goal_id) for goal_id in event["ids"]], "progress": 100}
+        elif op == "delete_goal":
+            return {"op": "delete_goals", "uids": [self.uid(event["id"])]}
+        elif op == "add_vision_item":
+            self.vision_keys.append([event["image_path"], event["description"]])
+            return {"op": "add_vision_item", "image_path": event["image_path"], "description": event["description"]}
+        elif op in ("delete_vision_item", "delete_vision_items"):
+            indices = set(event["indices"]) if op == "delete_vision_items" else {event["index"]}
+            items = [self.vision_keys[idx] for idx in sorted(indices)]
+            self.vision_keys = [item for idx, item in enumerate(self.vision_keys) if idx not in indices]
+            return {"op": "delete_vision_items", "items": items}
+        elif op == "archive_vision_items":
+            return {"op": op, "items": [self.vision_keys[idx] for idx in event["indices"]], "archived": event["archived"]}
+        return None
+
+    def sync(self):
+        # Returns {"sent", "received", "notifications"}; raises OSError if the folder can't be reached
+        sent = self.push()
+        received, notifications = self.pull()
+        return {"sent": sent, "received": received, "notifications": notifications}
+
+    def push(self):
+        # Appends what changed here since the last push to this device's file in the folder
+        self.writer.flush()
+        deltas = [delta for delta in read_lines(self.outbox_path)[0] if delta["n"] > self.state.get("pushed", 0)]
+        if not deltas:
+            return 0
+        os.makedirs(self.folder, exist_ok=True)
+        with open(os.path.join(self.folder, self.device + ".ndjson"), "a") as file:
+            file.write("".join(json.dumps(delta, separators=(",", ":")) + "\n" for delta in deltas))
+            file.flush()
+            os.fsync(file.fileno())
+        for delta in deltas:
+            self.note_local(delta)
+        # The outbox is emptied only once the state says what was pushed;
+        # after a crash in between, the sequence numbers skip what already went
+        self.state.set("pushed", deltas[-1]["n"])
+        self.state.commit()
+        with open(self.outbox_path, "w"):
+            pass
+        return len(deltas)
+
+    def note_local(self, delta):
+        # Edits made here take part in "latest edit wins" and "deletion wins"
+        # like everybody else's
+        op = delta["op"]
+        if op in ("set_goal", "set_ladder"):
+            self.state.newer(key(op, delta["category"], delta["activity"]), delta["t"], self.device)
+        elif op == "set_progress":
+            for uid in delta["uids"]:
+                self.state.newer(key("progress", uid), delta["t"], self.device)
+        elif op in ("archive_tasks", "archive_goals"):
+            for uid in delta["uids"]:
+                self.state.newer(key("archived", uid), delta["t"], self.device)
+        elif op == "delete_category":
+            self.state.mark_deleted(key(delta["category"]), delta["t"])
+        elif op == "delete_activity":
+            self.state.mark_deleted(key(delta["category"], delta["activity"]), delta["t"])
+        elif op in ("delete_tasks", "delete_goals"):
+            for uid in delta["uids"]:
+                self.state.mark_deleted(key(uid), delta["t"])
+
+    def pull(self):
+        # Applies what the other devices pushed since the last pull; returns
+        # (number of changes, milestone notifications)
+        incoming = []
+        offsets = {}
+        if os.path.isdir(self.folder):
+            for name in sorted(os.listdir(self.folder)):
+                device, extension = os.path.splitext(name)
+                if extension != ".ndjson" or device == self.device:
+                    continue
+                deltas, offset = read_lines(os.path.join(self.folder, name), self.state.offset(device))
+                if offset != self.state.offset(device):
+                    incoming += [(device, delta) for delta in deltas]
+                    offsets[device] = offset
+        parked = self.state.parked()
+        if not offsets and not parked:
+            return 0, []
+
+        sessions = []
+        self.applying = True
+        try:
+            # Changes to tasks and goals whose creation hasn't arrived yet (it
+            # may be in the file of a device that hasn't synced since) wait
+            # until it has
+            for device, delta in incoming + [(device, delta) for _, device, delta in parked]:
+                try:
+                    waiting = self.apply(device, delta, sessions)
+                except (KeyError, TypeError, ValueError, IndexError):
+                    continue  # Malformed; skipped like a corrupt line
+                if waiting is not None:
+                    self.state.park(device, waiting)
+            notifications = self.import_sessions(sessions)
+            self.model.storage.flush()  # On disk before the offsets say it was read
+        finally:
+            self.applying = False
+            self.texts = None
+        # Only now: if applying failed, the same changes are read again next
+        # time (applying them twice is harmless)
+        if parked:
+            self.state.unpark(parked[-1][0])
+        for device, offset in offsets.items():
+            self.state.set_offset(device, offset)
+        self.state.commit()
+        return len(incoming), notifications
+
+    def find_activity(self, category_name, activity_name, create):
+        # The activity by name, created if `create` unless it was deleted somewhere
+        tracker = self.model.tracker
+        category = tracker.find_category(category_name)
+        if category is None:
+            if not create or self.state.is_deleted(key(category_name)):
+                return None
+            category = self.model.add_category(category_name)
+        for activity_id in category.activity_ids:
+            if tracker.activities[activity_id].name == activity_name:
+                return tracker.activities[activity_id]
+        if not create or self.state.is_deleted(key(category_name, activity_name)):
+            return None
+        return self.model.add_activity(category.id, activity_name)
+
+    def resolve(self, uids, items):
+        # (local IDs of the items that are here, uids that haven't arrived)
+        present = []
+        waiting = []
+        for uid in uids:
+            local_id = self.local_id(uid)
+            if local_id is not None:
+                if local_id in items:
+                    present.append((uid, local_id))
+            elif not self.state.is_deleted(key(uid)):
+                waiting.append(uid)
+        return present, waiting
+
+    def add_item(self, uid, kind, text, initial):
+        # Adds a task or goal from another device; `initial` ones match an
+        # item with the same text that is already here
+        if self.local_id(uid) is not None or self.state.is_deleted(key(uid)):
+            return
+        model = self.model
+        match = None
+        if initial:
+            if self.texts is None:
+                self.texts = {}
+                for item in model.tasks.items:
+                    self.texts.setdefault(("task", item.task), item)
+                for item in model.goals.items:
+                    self.texts.setdefault(("goal", item.goal), item)
+            match = self.texts.get((kind, text))
+        if match is not None:
+            local_id = match.id
+        elif kind == "task":
+            local_id = model.tasks.items[model.add_task(text)].id
+        else:
+            local_id = model.goals.items[model.add_goal(text)].id
+        self.state.add_uid(uid, local_id)
+
+    def apply(self, device, delta, sessions):
+        # Applies one change from `device`; returns the part of it that has to
+        # wait for tasks or goals that haven't arrived, or None
+        model = self.model
+        op = delta["op"]
+        if op == "sessions":
+            sessions.extend(valid_sessions(delta["sessions"]))
+        elif op == "add_category":
+            if model.tracker.find_category(delta["category"]) is None and not self.state.is_deleted(key(delta["category"])):
+                model.add_category(delta["category"])
+        elif op == "delete_category":
+            self.state.mark_deleted(key(delta["category"]), delta["t"])
+            category = model.tracker.find_category(delta["category"])
+            if category is not None:
+                model.delete_category(category.id)
+        elif op == "add_activity":
+            self.find_activity(delta["category"], delta["activity"], create=True)
+        elif op == "delete_activity":
+            self.state.mark_deleted(key(delta["category"], delta["activity"]), delta["t"])
+            activity = self.find_activity(delta["category"], delta["activity"], create=False)
+            if activity is not None:
+                model.delete_activity(activity.id)
+        elif op in ("set_goal", "set_ladder"):
+            if self.state.newer(key(op, delta["category"], delta["activity"]), delta["t"], device):
+                activity = self.find_activity(delta["category"], delta["activity"], create=True)
+                if activity is None:
+                    pass
+                elif op == "set_goal":
+                    model.set_goal(activity.id, delta["seconds"] / 3600)
+                else:
+                    model.set_milestone_ladder(activity.id, delta["hours"])
+        elif op == "add_task":
+            self.add_item(delta["uid"], "task", delta["task"], delta.get("initial", False))
+        elif op == "add_goal":
+            self.add_item(delta["uid"], "goal", delta["goal"], delta.get("initial", False))
+        elif op in ("delete_tasks", "delete_goals"):
+            items = model.tasks.by_id if op == "delete_tasks" else model.goals.by_id
+            present, _ = self.resolve(delta["uids"], items)
+            for uid in delta["uids"]:
+                self.state.mark_deleted(key(uid), delta["t"])
+            local_ids = sorted({local_id for _, local_id in present})
+            (model.delete_tasks if op == "delete_tasks" else model.delete_goals)(local_ids)
+        elif op in ("complete_tasks", "archive_tasks", "archive_goals", "set_progress"):
+            items = model.tasks.by_id if op in ("complete_tasks", "archive_tasks") else model.goals.by_id
+            present, waiting = self.resolve(delta["uids"], items)
+            if op == "complete_tasks":
+                model.complete_tasks({local_id for _, local_id in present if not items[local_id].completed})
+            elif op == "set_progress":
+                for uid, local_id in present:
+                    if self.state.newer(key("progress", uid), delta["t"], device):
+                        model.set_goal_progress(local_id, delta["progress"])
+            else:
+                local_ids = {local_id for uid, local_id in present if self.state.newer(key("archived", uid), delta["t"], device)}
+                (model.archive_tasks if op == "archive_tasks" else model.archive_goals)(local_ids, delta["archived"])
+            if waiting:
+                return dict(delta, uids=waiting)
+        elif op == "add_vision_item":
+            if [delta["image_path"], delta["description"]] not in self.vision_keys:
+                model.add_vision_item(delta["image_path"], delta["description"])
+        elif op == "delete_vision_items":
+            indices = set()
+            for item in delta["items"]:
+                idx = next((idx for idx, other in enumerate(self.vision_keys) if other == item and idx not in indices), None)
+                if idx is not None:
+                    indices.add(idx)
+            model.delete_vision_items(sorted(indices))
+        elif op == "archive_vision_items":
+            model.archive_vision_items([idx for idx, item in enumerate(self.vision_keys) if item in delta["items"]], delta["archived"])
+        return None
+
+    def import_sessions(self, sessions):
+        # Sessions go through the importer, which creates activities by name and
+        # skips ones that are already here; none are added to activities that
+        # were deleted (unless they have been added again since)
+        if not sessions:
+            return []
+        tracker = self.model.tracker
+        categories = {category.name for category in tracker.categories.values()}
+        present = set(self.activity_names.values())
+        records = []
+        for category_name, activity_name, start, end in sessions:
+            if (category_name, activity_name) not in present:
+                if category_name not in categories and self.state.is_deleted(key(category_name)):
+                    continue
+                if self.state.is_deleted(key(category_name, activity_name)):
+                    continue
+            records.append((category_name, activity_name, start, end))
+        return Importer(self.model).run(records)["notifications"]
+
+    def close(self):
+        self.writer.close()
+        self.state.close()
+
+
+def main():
+    from .model import GamifyModel
+    from .settings import load_settings
+
+    parser = argparse.ArgumentParser(description="Sync Gamify Your Life with other devices through a shared folder. Close the app first.")
+    parser.add_argument("--folder", help="default: sync_dir from settings.json")
+    args = parser.parse_args()
+
+    settings = load_settings()
+    if args.folder:
+        settings["sync_dir"] = args.folder
+    if not settings.get("sync_dir"):
+        parser.error("set sync_dir in settings.json or pass --folder")
+    model = GamifyModel(settings=settings)
+    model.load()
+    try:
+        started = time.perf_counter()
+        result = model.sync.sync()
+        print(f"Sent {result['sent']:,} changes, received {result['received']:,} in {time.perf_counter() - started:.2f}s")
+        for title, message in result["notifications"]:
+            print(f"{title}: {message}")
+    finally:
+        model.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+from .entities import Task
+
+
+class TaskList:
+    def __init__(self):
+        self.items = []
+        self.by_id = {}
+
+    def load(self, data):
+        self.items = [Task(int(key), task["task"], task["completed"], task.get("archived", False)) for key, task in data.get("tasks", {}).items()]
+        self.by_id = {task.id: task for task in self.items}
+
+    def index(self, task_id):
+        return self.items.index(self.by_id[task_id])
+
+    def add(self, task_id, task):
+        self.by_id[task_id] = Task(task_id, task)
+        self.items.append(self.by_id[task_id])
+        return len(self.items) - 1
+
+    def complete(self, task_id):
+        self.by_id[task_id].completed = True
+        return self.index(task_id)
+
+    def delete(self, task_id):
+        idx = self.index(task_id)
+        del self.items[idx]
+        del self.by_id[task_id]
+        return idx
+
+    def complete_many(self, task_ids):
+        for task_id in task_ids:
+            self.by_id[task_id].completed = True
+
+    def set_archived(self, task_ids, archived):
+        for task_id in task_ids:
+            self.by_id[task_id].archived = archived
+
+    def delete_many(self, task_ids):
+        # One pass over the list however many go
+        task_ids = set(task_ids)
+        self.items[:] = [task for task in self.items if task.id not in task_ids]
+        for task_id in task_ids:
+            del self.by_id[task_id]
@@ -0,0 +1,135 @@
+import time
+
+from .entities import Activity, Category
+from .rollups import Rollups
+from .stats import StatsEngine
+from .streaks import Habits, rebuild_habit
+
+
+class ActivityTracker:
+    # Categories, activities and their timers, keyed by stable integer IDs.
+    # Totals are kept in seconds. IDs are handed out by the caller so that the
+    # recorded events can carry them.
+    def __init__(self):
+        self.categories = {}
+        self.activities = {}
+        self.running = set()
+        self.stats = StatsEngine()
+        self.rollups = Rollups({})
+        self.habits = Habits({})
+
+    def load(self, data):
+        self.categories = {}
+        for key, category in data.get("categories", {}).items():
+            self.categories[int(key)] = Category(int(key), category["name"])
+        self.activities = {}
+        for key, activity in data.get("activities", {}).items():
+            activity = Activity.from_data(int(key), activity)
+            self.activities[activity.id] = activity
+            self.categories[activity.category_id].activity_ids.append(activity.id)
+        self.rollups = Rollups({int(key): buckets for key, buckets in data.get("rollups", {}).items()})
+        self.habits = Habits({int(key): state for key, state in data.get("habits", {}).items()})
+        for activity_id, buckets in self.rollups.days.items():
+            if activity_id not in self.habits.states:
+                # Saved before streaks were tracked; the next save persists it
+                self.habits.states[activity_id] = rebuild_habit(buckets)
+        self.running = set()
+        self.stats.stale = True
+
+    def find_category(self, name):
+        for category in self.categories.values():
+            if category.name == name:
+                return category
+        return None
+
+    def category_activities(self, category_id):
+        return [self.activities[activity_id] for activity_id in self.categories[category_id].activity_ids]
+
+    def add_category(self, category_id, name):
+        if not name or self.find_category(name) is not None:
+            return None
+        category = self.categories[category_id] = Category(category_id, name)
+        self.stats.stale = True
+        return category
+
+    def delete_category(self, category_id):
+        category = self.categories.pop(category_id, None)
+        if category is None:
+            return False
+        for activity_id in category.activity_ids:
+            del self.activities[activity_id]
+            self.running.discard(activity_id)
+        self.rollups.remove(category.activity_ids)
+        self.habits.remove(category.activity_ids)
+        self.stats.stale = True
+        return True
+
+    def add_activity(self, activity_id, category_id, name):
+        category = self.categories[category_id]
+        if not name or any(self.activities[other].name == name for other in category.activity_ids):
+            return None
+        activity = self.activities[activity_id] = Activity(activity_id, category_id, name)
+        category.activity_ids.append(activity_id)
+        self.stats.stale = True
+        return activity
+
+    def delete_activity(self, activity_id):
+        activity = self.activities.pop(activity_id, None)
+        if activity is None:
+            return False
+        self.categories[activity.category_id].activity_ids.remove(activity_id)
+        self.rollups.remove([activity_id])
+        self.habits.remove([activity_id])
+        self.stats.stale = True
+        self.running.discard(activity_id)
+        return True
+
+    def set_goal(self, activity_id, goal_time):
+        self.activities[activity_id].goal = goal_time
+        self.stats.set_goal(activity_id, goal_time)
+
+    def start(self, activity_id):
+        activity = self.activities[activity_id]
+        if activity.start_time is not None:
+            return False  # Already running
+        activity.start_time = time.time()
+        activity.sessions += 1
+        self.stats.set_sessions(activity_id, activity.sessions)
+        self.running.add(activity_id)
+        return True
+
+    def stop(self, activity_id):
+        # Returns the (start, end) of the finished session, or None if it wasn't running
+        activity = self.activities[activity_id]
+        start_time = activity.start_time
+        if start_time is None:
+            return None
+        end_time = time.time()
+        activity.total += end_time - start_time
+        self.stats.set_total(activity_id, activity.total)
+        self.rollups.add_session(activity_id, start_time, end_time)
+        self.habits.add_sessions(activity_id, [(start_time, end_time)], lambda: self.rollups.days[activity_id])
+        activity.start_time = None
+        self.running.discard(activity_id)
+        return start_time, end_time
+
+    def add_sessions(self, sessions):
+        # Finished (activity_id, start, end) sessions from elsewhere (e.g. an
+        # import); each counts like a start and stop
+        by_activity = {}
+        for activity_id, start_time, end_time in sessions:
+            activity = self.activities[activity_id]
+            activity.sessions += 1
+            activity.total += end_time - start_time
+            self.stats.set_sessions(activity_id, activity.sessions)
+            self.stats.set_total(activity_id, activity.total)
+            self.rollups.add_session(activity_id, start_time, end_time)
+            by_activity.setdefault(activity_id, []).append((start_time, end_time))
+        for activity_id, times in by_activity.items():
+            self.habits.add_sessions(activity_id, times, lambda: self.rollups.days[activity_id])
+
+    def current_total(self, activity_id, now=None):
+        activity = self.activities[activity_id]
+        if activity.start_time is None:
+            return activity.total
+        return activity.total + (now if now is not None else time.time()) - activity.start_time
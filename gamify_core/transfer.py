@@ -0,0 +1,288 @@
+import argparse
+import csv
+import datetime
+import json
+import math
+import os
+import sqlite3
+import sys
+import time
+
+FIELDS = ("category", "activity", "start", "end")
+FUTURE_MARGIN = 24 * 3600  # Another machine's clock may be ahead of this one
+
+
+def detect_format(path):
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def read_records(file, fmt):
+    # Yields (line number, record dict) one at a time
+    if fmt == "csv":
+        reader = csv.DictReader(file)
+        for record in reader:
+            yield reader.line_num, record
+    else:
+        for line_no, line in enumerate(file, 1):
+            line = line.strip()
+            if line:
+                try:
+                    yield line_no, json.loads(line)
+                except ValueError:
+                    yield line_no, None
+
+
+def parse_time(value):
+    # Epoch seconds or ISO 8601; times without an offset are local
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def check_session(start, end, now):
+    # Raises ValueError unless start..end (epoch seconds) is a finished session
+    if not (math.isfinite(start) and math.isfinite(end)):
+        raise ValueError("times must be finite")
+    if not start < end:
+        raise ValueError("session ends before it starts")
+    if end > now + FUTURE_MARGIN:
+        raise ValueError("session ends in the future")
+
+
+def validate(records, errors, max_errors=20):
+    # Yields (category, activity, start, end) for the records that make sense;
+    # keeps the first `max_errors` problems in `errors` and counts the rest.
+    now = time.time()
+    for line_no, record in records:
+        try:
+            if not isinstance(record, dict):
+                raise ValueError("not a record")
+            missing = [field for field in FIELDS if record.get(field) is None]
+            if missing:
+                raise ValueError(f"missing {', '.join(missing)}")
+            category = str(record["category"]).strip()
+            activity = str(record["activity"]).strip()
+            start = parse_time(record["start"])
+            end = parse_time(record["end"])
+            if not category or not activity:
+                raise ValueError("empty category or activity")
+            check_session(start, end, now)
+        except (TypeError, ValueError) as error:
+            errors["count"] += 1
+            if len(errors["samples"]) < max_errors:
+                errors["samples"].append(f"line {line_no}: {error}")
+            continue
+        yield category, activity, start, end
+
+
+class SessionIndex:
+    # Keys of sessions that were imported before, kept in a small SQLite file
+    # so de-duplicating tens of millions of records doesn't hold them in
+    # memory, and importing the same file twice adds nothing the second time.
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS imported (
+                activity_id INTEGER NOT NULL,
+                start REAL NOT NULL,
+                end REAL NOT NULL,
+                PRIMARY KEY (activity_id, start, end)
+            ) WITHOUT ROWID
+        """)
+
+    def add(self, activity_id, start, end):
+        # True if the session wasn't seen before
+        return self.conn.execute("INSERT OR IGNORE INTO imported VALUES (?, ?, ?)", (activity_id, start, end)).rowcount == 1
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+class Importer:
+    # Streams session records into a loaded GamifyModel: categories and
+    # activities are created by name as they appear, duplicates are skipped
+    # and sessions are committed `batch_size` at a time, so memory stays flat
+    # however long the file is. Duplicates are found in the database itself
+    # for backends with session history and in a SessionIndex otherwise.
+    def __init__(self, model, batch_size=10000, index_path=None, progress=None):
+        self.model = model
+        self.batch_size = batch_size
+        self.progress = progress
+        self.ids = {}
+        self.index = None
+        if not model.storage.session_history:
+            self.index = SessionIndex(index_path or model.storage.path + ".imported")
+        self.stats = {"read": 0, "imported": 0, "duplicates": 0, "invalid": 0, "errors": [], "seconds": 0.0}
+
+    def activity_id(self, category_name, activity_name):
+        key = (category_name, activity_name)
+        activity_id = self.ids.get(key)
+        if activity_id is None:
+            tracker = self.model.tracker
+            category = tracker.find_category(category_name) or self.model.add_category(category_name)
+            activity = next((a for a in tracker.category_activities(category.id) if a.name == activity_name), None)
+            if activity is None:
+                activity = self.model.add_activity(category.id, activity_name)
+            activity_id = self.ids[key] = activity.id
+        return activity_id
+
+    def is_new(self, batch_keys, activity_id, start, end):
+        key = (activity_id, start, end)
+        if key in batch_keys:
+            return False
+        batch_keys.add(key)
+        if self.index is not None:
+            return self.index.add(activity_id, start, end)
+        return not self.model.storage.has_session(activity_id, start, end)
+
+    def run(self, records):
+        # `records` yields (category, activity, start, end); returns the stats
+        started = time.perf_counter()
+        touched = set()
+        batch = []
+        batch_keys = set()
+        try:
+            for category_name, activity_name, start, end in records:
+                self.stats["read"] += 1
+                activity_id = self.activity_id(category_name, activity_name)
+                if not self.is_new(batch_keys, activity_id, start, end):
+                    self.stats["duplicates"] += 1
+                    continue
+                batch.append((activity_id, start, end))
+                touched.add(activity_id)
+                if len(batch) >= self.batch_size:
+                    self.commit(batch, started)
+                    batch = []
+                    batch_keys = set()
+            if batch:
+                self.commit(batch, started)
+        except BaseException:
+            # The batch that failed must not count as imported
+            if self.index is not None:
+                self.index.rollback()
+            raise
+        finally:
+            # Otherwise the index stays locked for the rest of the process
+            if self.index is not None:
+                self.index.close()
+        self.stats["notifications"] = self.model.check_milestones(touched)
+        self.stats["seconds"] = time.perf_counter() - started
+        return self.stats
+
+    def commit(self, batch, started):
+        self.model.import_sessions(batch)
+        if self.index is not None:
+            # The batch must be on disk before it is remembered as imported
+            self.model.storage.flush()
+            self.index.commit()
+        self.stats["imported"] += len(batch)
+        if self.progress is not None:
+            self.progress(self.stats, time.perf_counter() - started)
+
+
+def import_file(model, path, fmt=None, batch_size=10000, progress=None):
+    fmt = fmt or detect_format(path)
+    errors = {"count": 0, "samples": []}
+    importer = Importer(model, batch_size, progress=progress)
+    with open(path, newline="" if fmt == "csv" else None, encoding="utf-8") as file:
+        stats = importer.run(validate(read_records(file, fmt), errors))
+    stats["read"] += errors["count"]
+    stats["invalid"] = errors["count"]
+    stats["errors"] = errors["samples"]
+    return stats
+
+
+def export_file(model, path, fmt=None, iso=False):
+    # Streams every session to `path`; returns the number of records written
+    fmt = fmt or detect_format(path)
+    names = {}
+    for activity in model.tracker.activities.values():
+        names[activity.id] = (model.tracker.categories[activity.category_id].name, activity.name)
+    # Without session history the sessions are made up from the day totals;
+    # remembering them as imported keeps the file from being counted twice
+    # when it is imported back
+    index = None if model.storage.session_history else SessionIndex(model.storage.path + ".imported")
+    count = 0
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", newline="" if fmt == "csv" else None, encoding="utf-8") as file:
+            writer = csv.writer(file) if fmt == "csv" else None
+            if writer is not None:
+                writer.writerow(FIELDS)
+            for activity_id, start, end in model.iter_sessions():
+                if index is not None:
+                    index.add(activity_id, start, end)
+                category, activity = names[activity_id]
+                if iso:
+                    start = datetime.datetime.fromtimestamp(start).astimezone().isoformat()
+                    end = datetime.datetime.fromtimestamp(end).astimezone().isoformat()
+                if writer is not None:
+                    writer.writerow((category, activity, start, end))
+                else:
+                    file.write(json.dumps({"category": category, "activity": activity, "start": start, "end": end}) + "\n")
+                count += 1
+        os.replace(tmp_path, path)
+    finally:
+        # The keys stand for data that is already here, so they are kept
+        # even if the export fails
+        if index is not None:
+            index.close()
+    return count
+
+
+def print_progress(stats, elapsed):
+    rate = stats["read"] / elapsed if elapsed > 0 else 0
+    print(f"\r{stats['read']:,} read, {stats['imported']:,} imported, {stats['duplicates']:,} duplicates ({rate:,.0f} records/s)", end="", file=sys.stderr)
+
+
+def main():
+    from .model import GamifyModel
+
+    parser = argparse.ArgumentParser(
+        description="Import or export Gamify Your Life session history as CSV or NDJSON "
+                    "(columns/keys: category, activity, start, end). Close the app first."
+    )
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--iso", action="store_true", help="export times as ISO 8601 instead of epoch seconds")
+    args = parser.parse_args()
+
+    model = GamifyModel()
+    model.load()
+    try:
+        if args.command == "import":
+            stats = import_file(model, args.path, args.format, args.batch_size, print_progress)
+            print(file=sys.stderr)
+            rate = stats["read"] / stats["seconds"] if stats["seconds"] > 0 else 0
+            print(
+                f"Imported {stats['imported']:,} of {stats['read']:,} records in {stats['seconds']:.1f}s ({rate:,.0f} records/s); "
+                f"{stats['duplicates']:,} duplicates, {stats['invalid']:,} invalid"
+            )
+            for error in stats["errors"]:
+                print(f"  {error}")
+            for title, message in stats["notifications"]:
+                print(f"{title}: {message}")
+        else:
+            started = time.perf_counter()
+            count = export_file(model, args.path, args.format, args.iso)
+            print(f"Exported {count:,} records in {time.perf_counter() - started:.1f}s")
+    finally:
+        model.close()
+
+
+if __name__ == "__main__":
+    main()
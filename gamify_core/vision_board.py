@@ -0,0 +1,21 @@
+class VisionBoard:
+    def __init__(self):
+        self.items = []
+
+    def load(self, data):
+        self.items = data.get("vision_board", [])
+
+    def add(self, image_path, description):
+        self.items.append({"image_path": image_path, "description": description})
+        return len(self.items) - 1
+
+    def delete(self, idx):
+        del self.items[idx]
+
+    def set_archived(self, indices, archived):
+        for idx in indices:
+            self.items[idx]["archived"] = archived
+
+    def delete_many(self, indices):
+        indices = set(indices)
+        self.items[:] = [item for idx, item in enumerate(self.items) if idx not in indices]
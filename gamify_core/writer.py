@@ -0,0 +1,85 @@
+import threading
+import time
+
+
+class BackgroundWriter:
+    # Hands everything passed to submit() to write(batch) on a worker thread.
+    # Submissions are coalesced: a batch is written once `delay` seconds pass
+    # without a new one, or at the latest `max_delay` seconds after the first
+    # item in it, so a burst of clicks costs one write. flush() blocks until
+    # everything submitted so far has been written. A failed write is raised
+    # on the caller's thread by the next submit() or flush(), whichever comes
+    # first, so it isn't left unnoticed while more is queued behind it.
+    def __init__(self, write, delay=0.5, max_delay=5.0):
+        self.write = write
+        self.delay = delay
+        self.max_delay = max_delay
+        self.pending = []
+        self.first_submit = None
+        self.last_submit = None
+        self.submitted = 0
+        self.written = 0
+        self.flush_target = 0
+        self.error = None
+        self.closed = False
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, item):
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("BackgroundWriter is closed")
+            now = time.monotonic()
+            if not self.pending:
+                self.first_submit = now
+            self.last_submit = now
+            self.pending.append(item)
+            self.submitted += 1
+            self.condition.notify_all()
+            # The item stays queued; it is written if the disk comes back
+            error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    return  # Closed with nothing left to write
+                # Wait out the debounce window unless a flush is waiting
+                while not self.closed and self.flush_target <= self.written:
+                    now = time.monotonic()
+                    due = min(self.last_submit + self.delay, self.first_submit + self.max_delay)
+                    if now >= due:
+                        break
+                    self.condition.wait(due - now)
+                batch = self.pending
+                self.pending = []
+            try:
+                self.write(batch)
+            except Exception as error:
+                # Kept for the next submit() or flush() to raise on the caller's thread
+                self.error = error
+            with self.condition:
+                self.written += len(batch)
+                self.condition.notify_all()
+
+    def flush(self):
+        with self.condition:
+            self.flush_target = self.submitted
+            self.condition.notify_all()
+            while self.written < self.flush_target:
+                self.condition.wait()
+            error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def close(self):
+        self.flush()
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()